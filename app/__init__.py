@@ -2,7 +2,14 @@ from flask import Flask
 from flask_jwt_extended import JWTManager
 from app.config import Config
 from app.extensions import db, migrate, mail
+from app.utils.rate_store import rate_store
+from app.services.fx_history_service import FxHistoryService
+from app.services.email_outbox_service import email_sender
+from app.services.job_service import job_runner
+from app.utils.email_templates import email_templates
+from app.utils.query_counter import statement_monitor
 from app.swagger import swagger_bp
+from app.commands import accounts_cli, ledger_cli, idempotency_cli, keys_cli, email_cli, jobs_cli, notifications_cli, transactions_cli, queries_cli
 
 # import Blueprint
 from app.routes.base_route import base_bp
@@ -20,6 +27,7 @@ from app.routes.invoice_payments import invoice_payments_bp
 from app.routes.notifications import notifications_bp
 from app.routes.payment_redirects import payment_redirects_bp
 from app.routes.admin_notifications import admin_bp
+from app.routes.jobs import jobs_bp
 
 from app import models
 
@@ -31,8 +39,24 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     mail.init_app(app)
+    rate_store.init_app(app)
+    FxHistoryService.init_app(app, rate_store)
+    email_sender.init_app(app)
+    job_runner.init_app(app)
+    email_templates.init_app(app)
+    statement_monitor.init_app(app)
     JWTManager(app)
 
+    # CLI commands
+    app.cli.add_command(accounts_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(idempotency_cli)
+    app.cli.add_command(keys_cli)
+    app.cli.add_command(email_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(transactions_cli)
+    app.cli.add_command(queries_cli)
 
     # Register Blueprint
     app.register_blueprint(base_bp)
@@ -50,6 +74,7 @@ def create_app():
     app.register_blueprint(invoice_payments_bp, url_prefix="/api")
     app.register_blueprint(notifications_bp, url_prefix="/api/notifications")
     app.register_blueprint(admin_bp, url_prefix="/api")
+    app.register_blueprint(jobs_bp, url_prefix="/api")
     app.register_blueprint(payment_redirects_bp)
 
     return app
@@ -104,6 +104,36 @@ virtual_card_create_model = api.model('VirtualCardCreate', {
     'spending_limit': fields.Float(description='Spending limit', example=1000.00)
 })
 
+bulk_card_item_model = api.model('BulkCardItem', {
+    'account_id': fields.String(required=True, description='Account the card draws from (must be yours)'),
+    'card_holder': fields.String(description="Name printed on the card (defaults to your name)", example='Ada Obi'),
+    'card_type': fields.String(description='Card type', example='debit'),
+    'card_kind': fields.String(description='Card kind', example='virtual'),
+    'spending_limit': fields.Float(description='Spending limit', example=500.00)
+})
+
+bulk_card_issuance_model = api.model('BulkCardIssuance', {
+    'cards': fields.List(fields.Nested(bulk_card_item_model), required=True, description='Cards to issue')
+})
+
+# Background Job Models
+job_model = api.model('Job', {
+    'id': fields.String(description='Job ID'),
+    'job_type': fields.String(description='Job type', example='card_issuance'),
+    'status': fields.String(description='queued, running, completed, failed or cancelled'),
+    'total': fields.Integer(description='Items to process'),
+    'processed': fields.Integer(description='Items processed so far'),
+    'succeeded': fields.Integer(description='Items that succeeded'),
+    'failed': fields.Integer(description='Items that failed'),
+    'progress': fields.Float(description='processed / total'),
+    'result': fields.Raw(description='Job output once completed'),
+    'error': fields.String(description='Error message if the job failed'),
+    'cancel_requested': fields.Boolean(description='Cancellation was requested; a running job stops after its current chunk'),
+    'created_at': fields.String(description='Creation timestamp'),
+    'started_at': fields.String(description='Start timestamp'),
+    'finished_at': fields.String(description='Completion timestamp')
+})
+
 # Card Payment Models
 card_fund_wallet_model = api.model('CardFundWallet', {
     'amount': fields.Float(required=True, description='Amount to fund', example=100.00),
@@ -159,6 +189,11 @@ transfer_model = api.model('Transfer', {
     'description': fields.String(description='Transfer description', example='Internal transfer between accounts')
 })
 
+bulk_transfer_model = api.model('BulkTransfer', {
+    'transfers': fields.List(fields.Nested(transfer_model), required=True, description='Transfers to settle, applied in order'),
+    'atomic': fields.Boolean(description='Reject the whole batch if any transfer fails', default=False)
+})
+
 transfer_response = api.model('TransferResponse', {
     'status': fields.Integer(description='HTTP status code', example=201),
     'message': fields.String(description='Response message', example='Transfer initiated successfully'),
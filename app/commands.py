@@ -0,0 +1,232 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models.account_model import Account
+from app.models.virtual_cards_model import VirtualCard
+from app.services.ledger_service import LedgerService
+from app.services.idempotency_service import IdempotencyService
+from app.services.email_outbox_service import EmailOutboxService, email_sender
+from app.services.job_service import JobService, job_runner
+from app.services.notification_counter_service import NotificationCounterService
+from app.services.transaction_search_service import TransactionSearchService
+from app.services.query_plan_service import QueryPlanService
+from app.utils.generators import AccountNumberGenerator
+from app.utils.keyring import keyring, reencrypt_table
+
+accounts_cli = AppGroup('accounts', help='Account maintenance commands.')
+
+
+@accounts_cli.command('rehash')
+@click.option('--batch-size', default=500, show_default=True, help='Rows to update per commit.')
+def rehash_account_numbers(batch_size):
+    """
+    Recompute account_number_hash with the current ACCOUNT_NUMBER_HASH_KEY.
+
+    Backfills rows still on the legacy unkeyed hash and finishes a key rotation
+    (move the old key to ACCOUNT_NUMBER_HASH_PREVIOUS_KEYS, run this, then drop it).
+    """
+    updated = 0
+    last_id = None
+
+    while True:
+        query = Account.query.order_by(Account.id)
+        if last_id is not None:
+            query = query.filter(Account.id > last_id)
+        accounts = query.limit(batch_size).all()
+        if not accounts:
+            break
+
+        for account in accounts:
+            account_number = account.get_account_number()
+            new_hash = AccountNumberGenerator.generate_hash(account_number)
+            if account.account_number_hash != new_hash:
+                account.account_number_hash = new_hash
+                updated += 1
+
+        last_id = accounts[-1].id
+        db.session.commit()
+
+    click.echo(f"Rehashed {updated} account number(s)")
+
+
+@accounts_cli.command('backfill-last4')
+@click.option('--batch-size', default=500, show_default=True, help='Rows to update per commit.')
+def backfill_account_last4(batch_size):
+    """Populate last4 for accounts created before the column existed."""
+    updated = 0
+    last_id = None
+
+    while True:
+        query = Account.query.filter(Account.last4.is_(None)).order_by(Account.id)
+        if last_id is not None:
+            query = query.filter(Account.id > last_id)
+        accounts = query.limit(batch_size).all()
+        if not accounts:
+            break
+
+        numbers = Account.decrypt_account_numbers(accounts)
+        for account in accounts:
+            account_number = numbers.get(account.id)
+            if account_number:
+                account.last4 = account_number[-4:]
+                updated += 1
+
+        last_id = accounts[-1].id
+        db.session.commit()
+
+    click.echo(f"Backfilled last4 for {updated} account(s)")
+
+
+ledger_cli = AppGroup('ledger', help='Ledger maintenance commands.')
+
+
+@ledger_cli.command('snapshot')
+@click.option('--batch-size', default=500, show_default=True, help='Accounts to checkpoint per commit.')
+def snapshot_ledger(batch_size):
+    """Write a balance checkpoint for every account (run periodically, e.g. nightly)."""
+    created = LedgerService.snapshot_accounts(batch_size=batch_size)
+    click.echo(f"Created {created} ledger snapshot(s)")
+
+
+idempotency_cli = AppGroup('idempotency', help='Idempotency-Key store maintenance commands.')
+
+
+@idempotency_cli.command('purge')
+def purge_idempotency_keys():
+    """Delete stored Idempotency-Key responses past IDEMPOTENCY_KEY_TTL_HOURS (run periodically)."""
+    purged = IdempotencyService.purge_expired()
+    click.echo(f"Purged {purged} expired idempotency key(s)")
+
+
+keys_cli = AppGroup('keys', help='Encryption key management commands.')
+
+# Encrypted columns per model, by database column name
+ENCRYPTED_COLUMNS = {
+    'account': (Account, ['account_number']),
+    'card': (VirtualCard, ['card_number', 'cvv', 'pin']),
+}
+
+
+@keys_cli.command('rotate')
+def rotate_data_key():
+    """Create a new data key and make it primary; new writes use it immediately, old rows are read lazily."""
+    key_id = keyring.create_data_key()
+    click.echo(f"Created data key {key_id}; run `flask keys reencrypt` to migrate existing rows")
+
+
+@keys_cli.command('rewrap')
+def rewrap_data_keys():
+    """Re-wrap all data keys with the first ENCRYPTION_MASTER_KEYS entry (master key rotation)."""
+    rewrapped = keyring.rewrap_data_keys()
+    click.echo(f"Re-wrapped {rewrapped} data key(s)")
+
+
+@keys_cli.command('reencrypt')
+@click.option('--model', 'models', type=click.Choice(sorted(ENCRYPTED_COLUMNS)), multiple=True,
+              help='Model to re-encrypt (repeatable); defaults to all.')
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows per worker task and per commit.')
+@click.option('--workers', default=None, type=int, help='Worker processes (default: CPU count, 0 runs inline).')
+def reencrypt_data(models, chunk_size, workers):
+    """Re-encrypt stored secrets under the primary data key (after `flask keys rotate` or from the legacy key)."""
+    for name in models or sorted(ENCRYPTED_COLUMNS):
+        model, columns = ENCRYPTED_COLUMNS[name]
+        written = reencrypt_table(model.__table__, columns, chunk_size=chunk_size, workers=workers)
+        click.echo(f"Re-encrypted {written} {name} row(s)")
+
+
+email_cli = AppGroup('email', help='Email outbox commands.')
+
+
+@email_cli.command('drain')
+def drain_email_outbox():
+    """Deliver every due email in the outbox now (e.g. from cron when EMAIL_OUTBOX_BACKGROUND is off)."""
+    delivered = email_sender.drain()
+    click.echo(f"Delivered {delivered} email(s)")
+
+
+@email_cli.command('stats')
+def email_outbox_stats():
+    """Show outbox queue depth by status and the age of the oldest due email."""
+    stats = EmailOutboxService.get_stats()
+    for status, count in stats['queue'].items():
+        click.echo(f"{status}: {count}")
+    click.echo(f"oldest due: {stats['oldest_due_seconds']}s")
+
+
+@email_cli.command('purge')
+@click.option('--days', default=7, show_default=True, help='Keep sent emails this many days.')
+def purge_sent_emails(days):
+    """Delete delivered emails older than --days."""
+    purged = EmailOutboxService.purge_sent(days=days)
+    click.echo(f"Purged {purged} sent email(s)")
+
+
+jobs_cli = AppGroup('jobs', help='Background job commands.')
+
+
+@jobs_cli.command('work')
+@click.option('--threads', default=1, show_default=True, help='Jobs run concurrently by this process.')
+@click.option('--once', is_flag=True, help='Exit once the queue is empty instead of waiting for new jobs.')
+def work_jobs(threads, once):
+    """Run queued jobs in this process (use with JOB_WORKERS=0 on the web processes)."""
+    app = current_app._get_current_object()
+    if once:
+        job_runner.work(app, once=True)
+        return
+
+    job_runner.start(app, threads)
+    click.echo(f"Job worker running with {threads} thread(s); Ctrl-C to stop")
+    try:
+        job_runner.join()
+    except KeyboardInterrupt:
+        job_runner.stop()
+
+
+@jobs_cli.command('list')
+@click.option('--status', default=None, help='Only jobs with this status.')
+@click.option('--limit', default=20, show_default=True)
+def list_jobs(status, limit):
+    """Show the most recent jobs and their progress."""
+    for job in JobService.list_jobs(status=status, limit=limit):
+        click.echo(f"{job.id}  {job.job_type:<26} {job.status:<10} {job.processed}/{job.total}")
+
+
+notifications_cli = AppGroup('notifications', help='Notification maintenance commands.')
+
+
+@notifications_cli.command('repair-counters')
+@click.option('--batch-size', default=1000, show_default=True, help='Users recomputed per transaction.')
+def repair_notification_counters(batch_size):
+    """Rebuild the per-user notification counters from the notification table."""
+    result = NotificationCounterService.rebuild(chunk_size=batch_size)
+    click.echo(f"Rebuilt {result['counters']} counter(s) for {result['users']} user(s)")
+
+
+transactions_cli = AppGroup('transactions', help='Transaction maintenance commands.')
+
+
+@transactions_cli.command('reindex-search')
+@click.option('--batch-size', default=1000, show_default=True, help='Transactions indexed per batch.')
+def reindex_transaction_search(batch_size):
+    """Rebuild the SQLite transaction search table (PostgreSQL keeps its tsvector column current itself)."""
+    indexed = TransactionSearchService.reindex(batch_size=batch_size)
+    click.echo(f"Indexed {indexed} transaction(s)")
+
+
+queries_cli = AppGroup('queries', help='Query plan checks.')
+
+
+@queries_cli.command('check-plans')
+@click.option('--verbose', is_flag=True, help='Print every plan, not only failing ones.')
+def check_query_plans(verbose):
+    """Fail if a hot query shape is no longer served by its index."""
+    results = QueryPlanService.check()
+    for result in results:
+        click.echo(f"{'ok' if result['uses_index'] else 'MISSING'}  {result['name']} ({result['index']})")
+        if verbose or not result['uses_index']:
+            for line in result['plan']:
+                click.echo(f"    {line}")
+    missing = sum(1 for result in results if not result['uses_index'])
+    if missing:
+        raise click.ClickException(f"{missing} query shape(s) not using their index")
@@ -43,12 +43,93 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_USERNAME')
     MAIL_SUPPRESS_SEND = os.environ.get('MAIL_SUPPRESS_SEND', 'false').lower() in ['true', 'on', '1']
+    # Messages sent over one SMTP connection before reconnecting (Flask-Mail)
+    MAIL_MAX_EMAILS = int(os.environ.get('MAIL_MAX_EMAILS') or 100)
+
+    # Email outbox: requests queue emails, a background sender delivers them in batches
+    EMAIL_OUTBOX_BACKGROUND = os.environ.get('EMAIL_OUTBOX_BACKGROUND', 'true').lower() in ['true', 'on', '1']
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE') or 100)
+    EMAIL_OUTBOX_POLL_SECONDS = int(os.environ.get('EMAIL_OUTBOX_POLL_SECONDS') or 5)
+    EMAIL_OUTBOX_LOCK_SECONDS = int(os.environ.get('EMAIL_OUTBOX_LOCK_SECONDS') or 300)
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS') or 8)
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_BASE_SECONDS') or 30)
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_MAX_SECONDS') or 3600)
     
     # Application settings
     ITEMS_PER_PAGE = 20
+
+    # Maximum number of transfers accepted in one /wallets/transfers/bulk request
+    BULK_TRANSFER_MAX_ITEMS = int(os.environ.get('BULK_TRANSFER_MAX_ITEMS') or 5000)
+
+    # Bulk card issuance: cards accepted per /cards/bulk request, and cards inserted per chunk
+    BULK_CARD_ISSUANCE_MAX_ITEMS = int(os.environ.get('BULK_CARD_ISSUANCE_MAX_ITEMS') or 10000)
+    BULK_CARD_ISSUANCE_CHUNK_SIZE = int(os.environ.get('BULK_CARD_ISSUANCE_CHUNK_SIZE') or 1000)
+
+    # Users processed (and committed) per page of a notification broadcast
+    BROADCAST_CHUNK_SIZE = int(os.environ.get('BROADCAST_CHUNK_SIZE') or 1000)
+
+    # Run background jobs synchronously in the enqueueing request (tests / debugging)
+    JOBS_RUN_INLINE = os.environ.get('JOBS_RUN_INLINE', 'false').lower() in ['true', 'on', '1']
+    # Job worker threads per web process (0: only dedicated `flask jobs work` processes run jobs),
+    # how often idle workers poll the queue, and how long a running job may go without a heartbeat
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 2)
+    JOB_POLL_SECONDS = int(os.environ.get('JOB_POLL_SECONDS') or 5)
+    JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS') or 900)
+
+    # Per-process cache of notification preferences: seconds an entry is trusted
+    # (0 disables; other processes see updates once it expires), and users held
+    NOTIFICATION_SETTINGS_CACHE_SECONDS = int(os.environ.get('NOTIFICATION_SETTINGS_CACHE_SECONDS') or 60)
+    NOTIFICATION_SETTINGS_CACHE_SIZE = int(os.environ.get('NOTIFICATION_SETTINGS_CACHE_SIZE') or 10000)
+
+    # Old notifications deleted (and committed) per batch by the cleanup job
+    NOTIFICATION_CLEANUP_CHUNK_SIZE = int(os.environ.get('NOTIFICATION_CLEANUP_CHUNK_SIZE') or 5000)
+
+    # Statement rows fetched per keyset batch while streaming an account export
+    STATEMENT_EXPORT_BATCH_SIZE = int(os.environ.get('STATEMENT_EXPORT_BATCH_SIZE') or 1000)
+
+    # Log requests that run more SQL statements than this (0 disables); catches lazy loads in list endpoints
+    SQL_STATEMENT_WARN_THRESHOLD = int(os.environ.get('SQL_STATEMENT_WARN_THRESHOLD') or 0)
+
+    # Idempotency-Key store: how long responses are replayable, and the lifetime of an
+    # in-flight lock, which its request renews while running (a retry takes it over only
+    # once the holder stopped renewing, i.e. died)
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS') or 24)
+    IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS') or 30)
+
+    # FX rate store: one provider fetch against FX_RATE_FETCH_BASE feeds the cross-rate matrix.
+    # 'file' shares the snapshot between worker processes via FX_RATE_STORE_PATH; 'memory' keeps it
+    # per process; any other value is imported as a backend class ('package.module:Class').
+    FX_RATE_STORE_BACKEND = os.environ.get('FX_RATE_STORE_BACKEND') or 'file'
+    FX_RATE_STORE_PATH = os.environ.get('FX_RATE_STORE_PATH')
+    FX_PROVIDER_URL = os.environ.get('FX_PROVIDER_URL') or 'https://open.er-api.com/v6/latest/{base}'
+    FX_RATE_FETCH_BASE = os.environ.get('FX_RATE_FETCH_BASE') or 'USD'
+    FX_RATE_TTL_SECONDS = int(os.environ.get('FX_RATE_TTL_SECONDS') or 6 * 3600)
+    FX_RATE_REFRESH_AHEAD_SECONDS = int(os.environ.get('FX_RATE_REFRESH_AHEAD_SECONDS') or 30 * 60)
+    FX_RATE_MAX_STALE_SECONDS = int(os.environ.get('FX_RATE_MAX_STALE_SECONDS') or 24 * 3600)
+    FX_RATE_BACKGROUND_REFRESH = os.environ.get('FX_RATE_BACKGROUND_REFRESH', 'true').lower() in ['true', 'on', '1']
+
+    # Per-user GET /balances summaries are cached this long (and dropped on any balance change), for at most this many users
+    BALANCE_SUMMARY_CACHE_SECONDS = int(os.environ.get('BALANCE_SUMMARY_CACHE_SECONDS') or 30)
+    BALANCE_SUMMARY_CACHE_SIZE = int(os.environ.get('BALANCE_SUMMARY_CACHE_SIZE') or 10000)
+
+    # Ledger settings: write a balance checkpoint every N postings per account
+    LEDGER_SNAPSHOT_INTERVAL = int(os.environ.get('LEDGER_SNAPSHOT_INTERVAL') or 500)
     
     # Encryption settings
+    # Legacy single Fernet key: still decrypts rows written before the key ring, and seeds a
+    # derived master key when ENCRYPTION_MASTER_KEYS is not set
     ACCOUNT_ENCRYPTION_KEY = os.environ.get('ACCOUNT_ENCRYPTION_KEY') or 'dev-encryption-key-change-in-production'
+    # Master keys wrapping the data keys, "id:fernet-key" comma-separated, current key first
+    ENCRYPTION_MASTER_KEYS = os.environ.get('ENCRYPTION_MASTER_KEYS', '')
+    # How often each process re-reads the data keys (picks up rotations made elsewhere)
+    KEYRING_REFRESH_SECONDS = int(os.environ.get('KEYRING_REFRESH_SECONDS') or 300)
+
+    # Blind-index (HMAC) key for account number lookups; keep it separate from the encryption key
+    ACCOUNT_NUMBER_HASH_KEY = os.environ.get('ACCOUNT_NUMBER_HASH_KEY') or 'dev-account-hash-key-change-in-production'
+    # Comma-separated retired hash keys, still accepted for lookups until `flask accounts rehash` has run
+    ACCOUNT_NUMBER_HASH_PREVIOUS_KEYS = [
+        key for key in os.environ.get('ACCOUNT_NUMBER_HASH_PREVIOUS_KEYS', '').split(',') if key
+    ]
     
 class DevelopmentConfig(Config):
     """Development configuration."""
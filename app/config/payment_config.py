@@ -22,6 +22,13 @@ class PaymentConfig:
     
     # Supported currencies
     SUPPORTED_CURRENCIES = ['USD', 'EUR', 'GBP', 'NGN', 'CAD', 'AUD']
+
+    # ISO 4217 minor-unit exponents (digits after the decimal point) used for integer ledger storage
+    CURRENCY_EXPONENTS = {
+        **{currency: 2 for currency in SUPPORTED_CURRENCIES},
+        'JPY': 0,
+    }
+    DEFAULT_CURRENCY_EXPONENT = 2
     
     # Payment limits
     MIN_PAYMENT_AMOUNT = {
@@ -64,6 +71,11 @@ class PaymentConfig:
         """Check if currency is supported for payouts"""
         return currency.upper() in cls.PAYOUT_CURRENCIES
     
+    @classmethod
+    def get_currency_exponent(cls, currency):
+        """Get the number of minor-unit digits for a currency (2 for cents/kobo)"""
+        return cls.CURRENCY_EXPONENTS.get((currency or '').upper(), cls.DEFAULT_CURRENCY_EXPONENT)
+    
     @classmethod
     def get_min_amount(cls, currency, operation='payment'):
         """Get minimum amount for currency and operation"""
@@ -70,6 +70,61 @@ class AccountResource(Resource):
         pass
 
 
+@accounts_ns.route('/accounts/<string:account_id>/ledger')
+class AccountLedger(Resource):
+    @accounts_ns.doc('get_account_ledger', security='Bearer')
+    @accounts_ns.param('start_date', 'ISO 8601 start of the statement period (defaults to 30 days before end_date)')
+    @accounts_ns.param('end_date', 'ISO 8601 end of the statement period / balance as-of time (defaults to now)')
+    @accounts_ns.param('limit', 'Maximum number of postings to return (default 500, max 1000)')
+    @accounts_ns.marshal_with(success_model, code=200, description='Account ledger retrieved successfully')
+    @accounts_ns.response(400, 'Invalid date', error_model)
+    @accounts_ns.response(401, 'Unauthorized', error_model)
+    @accounts_ns.response(404, 'Account not found', error_model)
+    @accounts_ns.response(500, 'Internal server error', error_model)
+    @jwt_required()
+    def get(self, account_id):
+        """Retrieve journal postings with running, opening and closing balances for an account."""
+        pass
+
+
+@accounts_ns.route('/accounts/<string:account_id>/transactions')
+class AccountTransactions(Resource):
+    @accounts_ns.doc('get_account_transactions', security='Bearer')
+    @accounts_ns.param('cursor', 'Keyset pagination cursor (omit for the first page, then next_cursor)', required=False)
+    @accounts_ns.param('size', 'Items per page (default 20, max 100)', type='int', required=False)
+    @accounts_ns.param('sort_order', 'desc (default, newest first) or asc', type='string', required=False)
+    @accounts_ns.param('include_total', 'Also return the total count (costs a COUNT query)', type='boolean', required=False)
+    @accounts_ns.param('start_date', 'ISO 8601 lower bound on the transaction time', type='string', required=False)
+    @accounts_ns.param('end_date', 'ISO 8601 upper bound on the transaction time', type='string', required=False)
+    @accounts_ns.param('direction', 'Only debits or credits of this account (debit | credit)', type='string', required=False)
+    @accounts_ns.marshal_with(success_model, code=200, description='Account transactions retrieved successfully')
+    @accounts_ns.response(400, 'Invalid filter or cursor', error_model)
+    @accounts_ns.response(401, 'Unauthorized', error_model)
+    @accounts_ns.response(404, 'Account not found', error_model)
+    @accounts_ns.response(500, 'Internal server error', error_model)
+    @jwt_required()
+    def get(self, account_id):
+        """Page through the transactions that debit or credit an account."""
+        pass
+
+
+@accounts_ns.route('/accounts/<string:account_id>/transactions/export')
+class AccountTransactionsExport(Resource):
+    @accounts_ns.doc('export_account_transactions', security='Bearer')
+    @accounts_ns.param('format', 'csv (default) or ndjson', type='string', required=False)
+    @accounts_ns.param('start_date', 'ISO 8601 lower bound on the transaction time', type='string', required=False)
+    @accounts_ns.param('end_date', 'ISO 8601 upper bound on the transaction time', type='string', required=False)
+    @accounts_ns.param('direction', 'Only debits or credits of this account (debit | credit)', type='string', required=False)
+    @accounts_ns.response(200, 'Statement streamed as text/csv or application/x-ndjson, oldest first')
+    @accounts_ns.response(400, 'Invalid filter or format', error_model)
+    @accounts_ns.response(401, 'Unauthorized', error_model)
+    @accounts_ns.response(404, 'Account not found', error_model)
+    @jwt_required()
+    def get(self, account_id):
+        """Stream an account statement for any date range."""
+        pass
+
+
 @accounts_ns.route('/balances')
 class AccountBalances(Resource):
     @accounts_ns.doc('get_balances', security='Bearer')
@@ -13,14 +13,15 @@ from app.api_docs import (
 class AdminBroadcastNotification(Resource):
     @admin_notifications_ns.doc('broadcast_notification', security='Bearer')
     @admin_notifications_ns.expect(broadcast_notification_model)
-    @admin_notifications_ns.marshal_with(success_model, code=201)
+    @admin_notifications_ns.marshal_with(success_model, code=202)
     @admin_notifications_ns.response(401, 'Unauthorized', error_model)
     @admin_notifications_ns.response(403, 'Admin access required', error_model)
     @admin_notifications_ns.response(500, 'Failed to broadcast notification', error_model)
     @jwt_required()
     def post(self):
         """
-        Broadcast a notification to a targeted audience. Admin role required.
+        Queue a broadcast of a notification to a targeted audience. Admin role required.
+        Returns 202 with the background job; poll /api/jobs/{job_id} for progress.
         """
         pass  # Implementation handled by `app/routes/admin_notifications.py`
 
@@ -29,7 +30,7 @@ class AdminBroadcastNotification(Resource):
 class AdminBulkNotifications(Resource):
     @admin_notifications_ns.doc('bulk_create_notifications', security='Bearer')
     @admin_notifications_ns.expect(bulk_notification_request_model)
-    @admin_notifications_ns.marshal_with(success_model, code=201)
+    @admin_notifications_ns.marshal_with(success_model, code=202)
     @admin_notifications_ns.response(400, 'Invalid request payload', error_model)
     @admin_notifications_ns.response(401, 'Unauthorized', error_model)
     @admin_notifications_ns.response(403, 'Admin access required', error_model)
@@ -37,7 +38,8 @@ class AdminBulkNotifications(Resource):
     @jwt_required()
     def post(self):
         """
-        Create notifications in bulk for specific users. Admin role required.
+        Queue notifications for specific users. Admin role required.
+        Returns 202 with the background job; poll /api/jobs/{job_id} for progress.
         """
         pass
 
@@ -46,14 +48,31 @@ class AdminBulkNotifications(Resource):
 class AdminCleanupNotifications(Resource):
     @admin_notifications_ns.doc('cleanup_notifications', security='Bearer')
     @admin_notifications_ns.param('days', 'Number of days to keep notifications (default: 90)', type='int')
-    @admin_notifications_ns.marshal_with(success_model, code=200)
+    @admin_notifications_ns.marshal_with(success_model, code=202)
     @admin_notifications_ns.response(401, 'Unauthorized', error_model)
     @admin_notifications_ns.response(403, 'Admin access required', error_model)
     @admin_notifications_ns.response(500, 'Failed to cleanup notifications', error_model)
     @jwt_required()
     def delete(self):
         """
-        Delete notifications older than the specified number of days. Admin role required.
+        Queue deletion of notifications older than the specified number of days. Admin role required.
+        Returns 202 with the background job; poll /api/jobs/{job_id} for progress.
+        """
+        pass
+
+
+@admin_notifications_ns.route('/notifications/counters/repair')
+class AdminRepairNotificationCounters(Resource):
+    @admin_notifications_ns.doc('repair_notification_counters', security='Bearer')
+    @admin_notifications_ns.marshal_with(success_model, code=202)
+    @admin_notifications_ns.response(401, 'Unauthorized', error_model)
+    @admin_notifications_ns.response(403, 'Admin access required', error_model)
+    @admin_notifications_ns.response(500, 'Failed to queue notification counter repair', error_model)
+    @jwt_required()
+    def post(self):
+        """
+        Queue a rebuild of every user's notification counters from the notifications. Admin role required.
+        Returns 202 with the background job; poll /api/jobs/{job_id} for progress.
         """
         pass
 
@@ -72,3 +91,18 @@ class AdminNotificationStats(Resource):
         Retrieve global notification statistics. Admin role required.
         """
         pass
+
+
+@admin_notifications_ns.route('/email/outbox/stats')
+class AdminEmailOutboxStats(Resource):
+    @admin_notifications_ns.doc('get_email_outbox_stats', security='Bearer')
+    @admin_notifications_ns.marshal_with(success_model, code=200)
+    @admin_notifications_ns.response(401, 'Unauthorized', error_model)
+    @admin_notifications_ns.response(403, 'Admin access required', error_model)
+    @admin_notifications_ns.response(500, 'Failed to retrieve email outbox statistics', error_model)
+    @jwt_required()
+    def get(self):
+        """
+        Retrieve email outbox queue depth by status, the age of the oldest due email and this worker's sender metrics. Admin role required.
+        """
+        pass
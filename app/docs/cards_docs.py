@@ -2,7 +2,7 @@ from flask_restx import Resource, fields
 from flask import request
 from app.swagger import cards_ns, api
 from app.api_docs import (virtual_card_model, virtual_card_create_model, card_fund_wallet_model,
-                         success_model, error_model)
+                         bulk_card_issuance_model, success_model, error_model)
 
 @cards_ns.route('/card')
 class VirtualCardCreate(Resource):
@@ -22,9 +22,30 @@ class VirtualCardCreate(Resource):
         """
         pass  # Implementation handled by actual card.py route
 
+@cards_ns.route('/cards/bulk')
+class VirtualCardBulkCreate(Resource):
+    @cards_ns.doc('bulk_create_virtual_cards', security='Bearer')
+    @cards_ns.expect(bulk_card_issuance_model)
+    @cards_ns.marshal_with(success_model, code=202)
+    @cards_ns.response(400, 'Invalid data, per-card errors keyed by index', error_model)
+    @cards_ns.response(401, 'Unauthorized', error_model)
+    @cards_ns.response(404, 'User not found', error_model)
+    @cards_ns.response(500, 'Internal server error', error_model)
+    def post(self):
+        """
+        Issue cards in bulk
+
+        Issue cards for a whole team in one request. Every card is validated up front,
+        then issued by a background job in chunks; the response carries the job, whose
+        progress is available at /jobs/{job_id}. Supports an Idempotency-Key header.
+        """
+        pass  # Implementation handled by actual card.py route
+
 @cards_ns.route('/cards')
 class VirtualCardsList(Resource):
     @cards_ns.doc('get_virtual_cards', security='Bearer')
+    @cards_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @cards_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @cards_ns.marshal_list_with(virtual_card_model, code=200)
     @cards_ns.response(401, 'Unauthorized', error_model)
     @cards_ns.response(500, 'Internal server error', error_model)
@@ -121,6 +142,8 @@ class CardFundWallet(Resource):
 @cards_ns.route('/cards/<string:card_id>/transactions')
 class CardTransactions(Resource):
     @cards_ns.doc('get_card_transactions', security='Bearer')
+    @cards_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @cards_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @cards_ns.param('page', 'Page number (default: 1)', type='int', required=False)
     @cards_ns.param('per_page', 'Items per page (default: 10)', type='int', required=False)
     @cards_ns.marshal_with(success_model, code=200)
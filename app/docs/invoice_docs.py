@@ -56,6 +56,8 @@ invoice_update_model = api.model('InvoiceUpdate', {
 @invoices_ns.route('')
 class InvoiceList(Resource):
     @invoices_ns.doc('get_invoices', security='Bearer')
+    @invoices_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @invoices_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @invoices_ns.param('page', 'Page number (default: 1)', type='int', required=False)
     @invoices_ns.param('size', 'Items per page (default: 10)', type='int', required=False)
     @invoices_ns.param('search', 'Search term for filtering invoices', required=False)
@@ -0,0 +1,53 @@
+from flask_restx import Resource
+from flask_jwt_extended import jwt_required
+from app.swagger import jobs_ns
+from app.api_docs import success_model, error_model
+
+
+@jobs_ns.route('')
+class JobList(Resource):
+    @jobs_ns.doc('list_jobs', security='Bearer')
+    @jobs_ns.param('status', 'Filter by status (queued, running, completed, failed, cancelled)')
+    @jobs_ns.param('job_type', 'Filter by job type')
+    @jobs_ns.param('limit', 'Maximum jobs returned (default: 20, max: 100)', type='int')
+    @jobs_ns.marshal_with(success_model, code=200)
+    @jobs_ns.response(401, 'Unauthorized', error_model)
+    @jobs_ns.response(500, 'Failed to list jobs', error_model)
+    @jwt_required()
+    def get(self):
+        """
+        List your most recent background jobs, newest first (admins see every job).
+        """
+        pass
+
+
+@jobs_ns.route('/<string:job_id>')
+class JobDetail(Resource):
+    @jobs_ns.doc('get_job', security='Bearer')
+    @jobs_ns.marshal_with(success_model, code=200)
+    @jobs_ns.response(401, 'Unauthorized', error_model)
+    @jobs_ns.response(404, 'Job not found', error_model)
+    @jobs_ns.response(500, 'Failed to get job', error_model)
+    @jwt_required()
+    def get(self, job_id):
+        """
+        Retrieve the status and progress of a background job you started (admins can see any job).
+        """
+        pass
+
+
+@jobs_ns.route('/<string:job_id>/cancel')
+class JobCancel(Resource):
+    @jobs_ns.doc('cancel_job', security='Bearer')
+    @jobs_ns.marshal_with(success_model, code=202)
+    @jobs_ns.response(401, 'Unauthorized', error_model)
+    @jobs_ns.response(404, 'Job not found', error_model)
+    @jobs_ns.response(409, 'Job already finished', error_model)
+    @jobs_ns.response(500, 'Failed to cancel job', error_model)
+    @jwt_required()
+    def post(self, job_id):
+        """
+        Cancel a job. A queued job is cancelled immediately; a running job stops after the
+        chunk it is processing, keeping the work already committed.
+        """
+        pass
@@ -23,7 +23,8 @@ class NotificationCount(Resource):
     @jwt_required()
     def get(self):
         """
-        Get notification counts for the authenticated user.
+        Get notification counts for the authenticated user: total, unread, and per category
+        totals (categories) and unread counts (unread_categories), read from per-user counters.
         """
         pass  # Implementation handled by `app/routes/notifications.py`
 
@@ -31,6 +32,8 @@ class NotificationCount(Resource):
 @notifications_ns.route('')
 class NotificationList(Resource):
     @notifications_ns.doc('list_notifications', security='Bearer')
+    @notifications_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @notifications_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @notifications_ns.param('page', 'Page number (default: 1)', type='int')
     @notifications_ns.param('limit', 'Items per page (default: 20, max: 100)', type='int')
     @notifications_ns.param('category', 'Filter notifications by category')
@@ -6,12 +6,15 @@ from app.api_docs import transaction_model, success_with_pagination, error_model
 @transactions_ns.route('/transactions')
 class TransactionsList(Resource):
     @transactions_ns.doc('get_transactions', security='Bearer')
+    @transactions_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @transactions_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @transactions_ns.param('page', 'Page number (default: 1)', type='int', required=False)
     @transactions_ns.param('per_page', 'Items per page (default: 10)', type='int', required=False)
     @transactions_ns.param('txn_type', 'Filter by transaction type', type='string', required=False)
     @transactions_ns.param('status', 'Filter by transaction status', type='string', required=False)
     @transactions_ns.param('start_date', 'Filter transactions from date (YYYY-MM-DD)', type='string', required=False)
     @transactions_ns.param('end_date', 'Filter transactions to date (YYYY-MM-DD)', type='string', required=False)
+    @transactions_ns.param('search', 'Words prefix-match description, type, status and currency; amounts as 100-200, >50, <=20 or 100', type='string', required=False)
     @transactions_ns.marshal_with(success_with_pagination, code=200)
     @transactions_ns.response(401, 'Unauthorized', error_model)
     @transactions_ns.response(500, 'Internal server error', error_model)
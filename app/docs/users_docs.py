@@ -68,6 +68,8 @@ class UserDetail(Resource):
 @users_ns.route('/user/<string:id>/beneficiaries')
 class UserBeneficiaries(Resource):
     @users_ns.doc('get_beneficiaries', security='Bearer')
+    @users_ns.param('cursor', 'Keyset pagination cursor (empty for the first page, then next_cursor); replaces page', required=False)
+    @users_ns.param('include_total', 'With cursor: also return the total count (costs a COUNT query)', type='boolean', required=False)
     @users_ns.param('page', 'Page number (default: 0)', type='int', required=False)
     @users_ns.param('size', 'Items per page (default: 10)', type='int', required=False)
     @users_ns.param('search', 'Search term for beneficiary name, bank name, or account number', type='string', required=False)
@@ -1,7 +1,7 @@
 from flask_restx import Resource
 from flask import request
 from app.swagger import wallets_ns
-from app.api_docs import transfer_model, transfer_response, withdrawal_model, success_model, error_model
+from app.api_docs import transfer_model, transfer_response, bulk_transfer_model, withdrawal_model, success_model, error_model
 
 @wallets_ns.route('/wallets/transfer')
 class WalletTransfer(Resource):
@@ -26,6 +26,25 @@ class WalletTransfer(Resource):
         """
         pass  # Implementation handled by actual wallet.py route
 
+@wallets_ns.route('/wallets/transfers/bulk')
+class WalletBulkTransfer(Resource):
+    @wallets_ns.doc('wallet_bulk_transfer')
+    @wallets_ns.expect(bulk_transfer_model)
+    @wallets_ns.marshal_with(transfer_response, code=201)
+    @wallets_ns.response(400, 'Invalid batch or no transfer could be processed', error_model)
+    @wallets_ns.response(401, 'Unauthorized', error_model)
+    def post(self):
+        """
+        Create many transfers at once
+
+        Settles a batch of transfers (e.g. payroll) in a single database transaction.
+        Each item takes the same fields as a single transfer; supported types are
+        **internal**, **customer** and **external**. Items are applied in order and
+        the response lists a result per item (completed, pending, failed or rejected).
+        Set `atomic` to reject the whole batch if any item fails.
+        """
+        pass  # Implementation handled by actual wallet.py route
+
 @wallets_ns.route('/wallets/withdraw')
 class WalletWithdraw(Resource):
     @wallets_ns.doc('wallet_withdraw')
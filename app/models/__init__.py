@@ -8,5 +8,11 @@ from .payout_model import Payout
 from .transactions_model import Transaction, TransactionView
 from .two_factor_auth_model import TwoFactorAuth, TwoFactorAttempt
 from .invoice_model import Invoice
-from .notification_model import Notification, NotificationSettings
+from .notification_model import Notification, NotificationSettings, NotificationCounter
+from .ledger_model import LedgerEntry, LedgerSnapshot
+from .idempotency_model import IdempotencyKey
+from .fx_rate_model import FxRateHistory
+from .encryption_key_model import EncryptionKey
+from .job_model import Job
+from .outbound_email_model import OutboundEmail
 # from app.models.payment_methods_model import PaymentMethod  # Removed
\ No newline at end of file
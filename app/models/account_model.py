@@ -1,25 +1,27 @@
-from sqlite3 import IntegrityError
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.utils.generators import AccountNumberGenerator
+from app.utils.money import to_minor_units, from_minor_units
 from app.utils.guid_utils import GUID
+from app.utils.db_utils import is_unique_violation
+from app.utils.crypto import decrypt, decrypt_many, rotate_stale
+from app.utils.keyring import keyring
 import uuid
-from cryptography.fernet import Fernet
-from app.config import Config
 from app.models.virtual_cards_model import VirtualCard
 
-# Access config values safely
-ACCOUNT_ENCRYPTION_KEY = Config.ACCOUNT_ENCRYPTION_KEY
-
 class Account(db.Model):
     id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(GUID(), db.ForeignKey('user.id'), nullable=False)
     user = db.relationship('User', back_populates='accounts')
     balance = db.Column(db.Float, nullable=False, default=0.0)
+    balance_minor = db.Column(db.BigInteger, nullable=False, default=0)  # balance in integer minor units (cents/kobo)
+    ledger_sequence = db.Column(db.BigInteger, nullable=False, default=0)  # number of the last ledger posting
     currency = db.Column(db.String(3), nullable=False)
     currency_code = db.Column(db.String(3), nullable=False)
     account_holder = db.Column(db.String(180), nullable=False)
     account_number = db.Column(db.LargeBinary, nullable=False)
     account_number_hash = db.Column(db.String(64), unique=True, nullable=False)
+    last4 = db.Column(db.String(4), nullable=True)  # non-secret, for masked display without decrypting
     routing_number = db.Column(db.String(80), nullable=True)
     bank_name = db.Column(db.String(255), nullable=False)
     accountType = db.Column(db.String(50), nullable=True)
@@ -34,69 +36,111 @@ class Account(db.Model):
     payouts = db.relationship('Payout', back_populates='account', cascade="all, delete-orphan")
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
 
-    _key_from_config = ACCOUNT_ENCRYPTION_KEY
-    if not _key_from_config or _key_from_config == 'dev-encryption-key-change-in-production':
-        _encryption_key = Fernet.generate_key()
-    else:
-        # Key from config must be a valid Fernet key (32 url-safe base64-encoded bytes)
-        try:
-            _encryption_key = _key_from_config.encode('utf-8')
-            # Test if it's a valid Fernet key
-            Fernet(_encryption_key)
-        except (ValueError, TypeError):
-            # If invalid, generate a new key
-            _encryption_key = Fernet.generate_key()
-    _cipher_suite = Fernet(_encryption_key)
+    __table_args__ = (
+        db.Index('idx_account_user_default', 'user_id', 'is_default'),
+        db.Index('idx_account_user_currency', 'user_id', 'currency_code'),
+    )
 
     def set_account_number(self, account_number):
-        """Encrypt and set account number with uniqueness check"""
-        # check uniiquness and generate hash
+        """Encrypt and set account number; uniqueness is enforced by the unique index on its hash"""
         account_hash = AccountNumberGenerator.generate_hash(account_number)
 
-        # Check if this hash already exists
-        existing_account = Account.query.filter_by(account_number_hash=account_hash).first()
-        if existing_account and existing_account.id != self.id:
-            raise ValueError("Account number already exists")
-
         # Encrypt the account number on db
-        encrypted_account = self._cipher_suite.encrypt(account_number.encode())
+        encrypted_account = keyring.encrypt(account_number.encode())
 
         self.account_number = encrypted_account
         self.account_number_hash = account_hash
+        self.last4 = account_number[-4:]
 
     def get_account_number(self):
         """Decrypt and return account number"""
         if not self.account_number:
             return None
-        decrypted_account = self._cipher_suite.decrypt(self.account_number)
-        return decrypted_account.decode()
+        account_number = decrypt(keyring, self.account_number)
+        rotate_stale(self, 'account_number', account_number)
+        return account_number
+
+    @classmethod
+    def decrypt_account_numbers(cls, accounts):
+        """Decrypt the account numbers of many accounts in one pass; returns {account.id: number}"""
+        accounts = [account for account in accounts if account is not None]
+        numbers = decrypt_many(keyring, [account.account_number for account in accounts])
+        return {account.id: number for account, number in zip(accounts, numbers)}
+
+    def get_masked_account_number(self):
+        """Masked account number for display, read from last4 without decrypting when available"""
+        last4 = self.last4
+        if not last4:
+            account_number = self.get_account_number()
+            last4 = account_number[-4:] if account_number else None
+        return f"****{last4}" if last4 else None
+
+    def get_balance(self):
+        """Return the exact balance as a Decimal derived from the integer minor-unit column"""
+        return from_minor_units(self.balance_minor or 0, self.currency_code)
+
+    @classmethod
+    def query_default(cls, user_id, currency_code=None):
+        """The user's default account (per currency when ``currency_code`` is given)"""
+        query = cls.query.filter_by(user_id=user_id, is_default=True)
+        if currency_code:
+            query = query.filter_by(currency_code=currency_code)
+        return query
+
+    @classmethod
+    def find_by_account_number(cls, account_number, **filters):
+        """Resolve an account from its plaintext number with a single indexed blind-index lookup"""
+        if not account_number:
+            return None
+        hashes = AccountNumberGenerator.lookup_hashes(str(account_number))
+        return cls.query.filter(cls.account_number_hash.in_(hashes)).filter_by(**filters).first()
+
+    @classmethod
+    def find_by_account_numbers(cls, account_numbers, **filters):
+        """Resolve many plaintext account numbers with one blind-index query; returns {number: Account}"""
+        candidates = {
+            str(number): AccountNumberGenerator.lookup_hashes(str(number))
+            for number in account_numbers if number
+        }
+        if not candidates:
+            return {}
+        all_hashes = [h for hashes in candidates.values() for h in hashes]
+        by_hash = {
+            account.account_number_hash: account
+            for account in cls.query.filter(cls.account_number_hash.in_(all_hashes)).filter_by(**filters).all()
+        }
+        resolved = {}
+        for number, hashes in candidates.items():
+            account = next((by_hash[h] for h in hashes if h in by_hash), None)
+            if account is not None:
+                resolved[number] = account
+        return resolved
 
     @classmethod
     def create_account(cls, user_id, bank_code, **kwargs):
-        """Create a new account with a unique account number"""
+        """
+        Create a new account with a unique account number.
+
+        The row is inserted optimistically inside a savepoint; if the generated
+        number collides with an existing one the unique index rejects it, only the
+        savepoint is rolled back and a new number is tried. The caller commits.
+        """
         max_retries = 10
-        retries = 0
-        
-        while retries < max_retries:
+
+        for _ in range(max_retries):
+            account_number = AccountNumberGenerator.generate_account_number(user_id, bank_code)
+
+            account = cls(user_id=user_id, **kwargs)
+            account.set_account_number(account_number)
+            account.balance_minor = to_minor_units(account.balance or 0, account.currency_code)
+
             try:
-                # Generate account number
-                account_number = AccountNumberGenerator.generate_account_number(user_id, bank_code)
-                
-                # Create account instance
-                account = cls(user_id=user_id, **kwargs)
-                account.set_account_number(account_number)
-                
-
-                db.session.add(account)
+                with db.session.begin_nested():
+                    db.session.add(account)
                 return account
-                
-            except IntegrityError:
-                # Unique constraint violated, retry with a new number
-                db.session.rollback()
-                retries += 1
-            except ValueError as e:
-                # Account number already exists, retry until unique
-                db.session.rollback()
-                retries += 1
-        
+            except IntegrityError as e:
+                if not is_unique_violation(e, 'account_number_hash'):
+                    raise
+                # Number already taken; the savepoint rollback discarded the pending row
+
         raise Exception("Failed to create account after multiple attempts")
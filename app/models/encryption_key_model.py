@@ -0,0 +1,32 @@
+from app.extensions import db
+from app.utils.keyring import keyring
+from datetime import datetime
+from sqlalchemy import event
+
+
+class EncryptionKey(db.Model):
+    """
+    Versioned data-encryption key (DEK) for sensitive columns.
+
+    The Fernet key itself is stored wrapped (encrypted) by a master key from
+    ENCRYPTION_MASTER_KEYS; ``master_key_id`` names the master key that wrapped it.
+    Ciphertexts carry the id of the DEK that produced them, so old keys stay
+    readable until the re-encrypt job has moved every row to the primary key.
+    """
+    __tablename__ = 'encryption_keys'
+
+    id = db.Column(db.String(32), primary_key=True)
+    wrapped_key = db.Column(db.LargeBinary, nullable=False)
+    master_key_id = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')
+    # Possible statuses: active (newest active key is primary), retired
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<EncryptionKey {self.id} {self.status}>'
+
+
+@event.listens_for(EncryptionKey.__table__, 'after_create')
+def _create_initial_data_key(table, connection, **kw):
+    # Databases built with db.create_all() get their first DEK with the table, as migrated ones do
+    connection.execute(table.insert().values(**keyring.new_key_row(), created_at=datetime.utcnow()))
@@ -0,0 +1,27 @@
+from app.extensions import db
+from app.utils.guid_utils import GUID
+from datetime import datetime
+import uuid
+
+
+class FxRateHistory(db.Model):
+    """
+    Daily FX rate snapshot: one row per day per base currency.
+
+    ``rates`` holds units of each currency per 1 unit of ``base_currency`` as last
+    fetched that day (UTC), so any cross rate for the day is rates[to] / rates[from].
+    """
+    __tablename__ = 'fx_rate_history'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    day = db.Column(db.Date, nullable=False)
+    base_currency = db.Column(db.String(3), nullable=False)
+    rates = db.Column(db.JSON, nullable=False)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('base_currency', 'day', name='uq_fx_rate_history_base_day'),
+    )
+
+    def __repr__(self):
+        return f'<FxRateHistory {self.base_currency} {self.day}>'
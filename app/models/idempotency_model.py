@@ -0,0 +1,39 @@
+from app.extensions import db
+from app.utils.guid_utils import GUID
+from datetime import datetime
+import uuid
+
+
+class IdempotencyKey(db.Model):
+    """
+    Stored outcome of a money-moving request sent with an Idempotency-Key header.
+
+    A row is inserted in the 'processing' state before the handler runs; the unique
+    (user_id, idempotency_key) constraint makes that insert the lock that collapses
+    concurrent duplicates. Once the handler returns, the serialized response is
+    saved and later retries are answered from it.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(GUID(), db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    idempotency_key = db.Column(db.String(255), nullable=False)
+    endpoint = db.Column(db.String(255), nullable=False)
+    request_fingerprint = db.Column(db.String(64), nullable=False)  # sha256 of method, path and body
+
+    status = db.Column(db.String(20), nullable=False, default='processing')
+    # Possible statuses: processing, completed
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.JSON, nullable=True)
+
+    locked_until = db.Column(db.DateTime, nullable=True)  # in-flight lock, taken over once it lapses
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key', name='uq_idempotency_user_key'),
+        db.Index('idx_idempotency_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.idempotency_key} {self.status}>'
@@ -54,6 +54,15 @@ class Invoice(db.Model):
     # Relationships
     user = db.relationship('User', back_populates='invoices')
     payment_intents = db.relationship('PaymentIntent', back_populates='invoice', cascade="all, delete-orphan")
+
+    __table_args__ = (
+        db.Index('idx_invoice_user_status_due', 'user_id', 'status', 'due_date'),
+    )
+    
+    @classmethod
+    def query_by_status(cls, user_id, status):
+        """A user's invoices in one status; the caller orders them"""
+        return cls.query.filter(cls.user_id == user_id, cls.status == status)
     
     def __init__(self, **kwargs):
         super(Invoice, self).__init__(**kwargs)
@@ -0,0 +1,66 @@
+from app.extensions import db
+from app.utils.guid_utils import GUID
+from datetime import datetime
+import uuid
+
+
+class Job(db.Model):
+    """
+    Long-running work (bulk card issuance, notification fan-outs) executed outside the request.
+
+    The request that enqueues a job returns its id immediately; the worker updates
+    the counters as each chunk is committed so clients can poll progress.
+    """
+    __tablename__ = 'job'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(GUID(), db.ForeignKey('user.id', ondelete='CASCADE'), nullable=True)
+    job_type = db.Column(db.String(50), nullable=False)
+
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    # Possible statuses: queued, running, completed, failed, cancelled
+    payload = db.Column(db.JSON, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    # Set by a cancel request; the handler stops at its next checkpoint
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+
+    total = db.Column(db.Integer, nullable=False, default=0)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    succeeded = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Refreshed with every progress report; running jobs without one for JOB_STALE_SECONDS are failed
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_job_user_created', 'user_id', 'created_at'),
+        # Workers claim the oldest queued job
+        db.Index('idx_job_status_created', 'status', 'created_at'),
+    )
+
+    def to_dict(self):
+        """Convert job to dictionary for API responses"""
+        return {
+            'id': str(self.id),
+            'job_type': self.job_type,
+            'status': self.status,
+            'total': self.total,
+            'processed': self.processed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'progress': round(self.processed / self.total, 4) if self.total else None,
+            'result': self.result,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<Job {self.job_type} {self.status}>'
@@ -0,0 +1,67 @@
+from app.extensions import db
+from app.utils.guid_utils import GUID
+from datetime import datetime
+import uuid
+
+# Ledger account used for the contra leg of money entering or leaving the platform
+EXTERNAL_LEDGER_ACCOUNT = 'external'
+CUSTOMER_LEDGER_ACCOUNT = 'customer'
+
+
+class LedgerEntry(db.Model):
+    """
+    Append-only double-entry posting.
+
+    Every balance movement writes one journal (``journal_id``) whose entries sum
+    to zero. Postings against customer accounts carry the per-account sequence and
+    the running balance after the posting, so the balance at any point in time is
+    a single index seek on (account_id, created_at).
+    """
+    __tablename__ = 'ledger_entry'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    journal_id = db.Column(GUID(), nullable=False)
+    ledger_account = db.Column(db.String(50), nullable=False, default=CUSTOMER_LEDGER_ACCOUNT)
+    account_id = db.Column(GUID(), db.ForeignKey('account.id', ondelete='SET NULL'), nullable=True)
+    sequence = db.Column(db.BigInteger, nullable=True)  # per-account posting number, null for external legs
+    amount_minor = db.Column(db.BigInteger, nullable=False)  # signed: credits positive, debits negative
+    balance_after_minor = db.Column(db.BigInteger, nullable=True)  # running balance, null for external legs
+    currency_code = db.Column(db.String(3), nullable=False)
+    description = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_ledger_entry_account_created', 'account_id', 'created_at'),
+        db.Index('idx_ledger_entry_journal', 'journal_id'),
+        db.UniqueConstraint('account_id', 'sequence', name='uq_ledger_entry_account_sequence'),
+    )
+
+    def to_dict(self):
+        """Convert posting to dictionary for API responses"""
+        return {
+            'id': str(self.id),
+            'journal_id': str(self.journal_id),
+            'ledger_account': self.ledger_account,
+            'account_id': str(self.account_id) if self.account_id else None,
+            'sequence': self.sequence,
+            'amount_minor': self.amount_minor,
+            'balance_after_minor': self.balance_after_minor,
+            'currency_code': self.currency_code,
+            'description': self.description,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+class LedgerSnapshot(db.Model):
+    """Checkpoint of an account balance at a given posting sequence"""
+    __tablename__ = 'ledger_snapshot'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    account_id = db.Column(GUID(), db.ForeignKey('account.id', ondelete='CASCADE'), nullable=False)
+    sequence = db.Column(db.BigInteger, nullable=False)  # last posting included in the balance
+    balance_minor = db.Column(db.BigInteger, nullable=False)
+    as_of = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_ledger_snapshot_account_as_of', 'account_id', 'as_of'),
+    )
@@ -25,10 +25,13 @@ class Notification(db.Model):
 
     title = db.Column(db.String(255), nullable=False)
     message = db.Column(db.Text, nullable=False)
-    category = db.Column(db.String(50), nullable=False, default=NotificationCategory.SYSTEM.value)
+    # active_history: the previous value is needed to move counters even when the row was expired
+    category = db.column_property(
+        db.Column(db.String(50), nullable=False, default=NotificationCategory.SYSTEM.value), active_history=True
+    )
     priority = db.Column(db.String(20), nullable=False, default=NotificationPriority.MEDIUM.value)
 
-    is_read = db.Column(db.Boolean, nullable=False, default=False)
+    is_read = db.column_property(db.Column(db.Boolean, nullable=False, default=False), active_history=True)
     read_at = db.Column(db.DateTime)
 
     # Metadata for additional context (stored as JSON string for SQLite compatibility)
@@ -74,13 +77,7 @@ class Notification(db.Model):
     @classmethod
     def create_notification(cls, user_id, title, message, category='system', priority='medium', metadata=None):
         """Create a new notification"""
-        # Convert metadata to JSON string if provided
-        extra_data = None
-        if metadata:
-            try:
-                extra_data = json.dumps(metadata)
-            except (TypeError, ValueError):
-                extra_data = str(metadata)
+        extra_data = cls.serialize_metadata(metadata)
         
         notification = cls(
             user_id=user_id,
@@ -92,6 +89,16 @@ class Notification(db.Model):
         )
         return notification
 
+    @staticmethod
+    def serialize_metadata(metadata):
+        """Convert metadata to the JSON string stored in extra_data"""
+        if not metadata:
+            return None
+        try:
+            return json.dumps(metadata)
+        except (TypeError, ValueError):
+            return str(metadata)
+
     def mark_as_read(self):
         """Mark notification as read"""
         self.is_read = True
@@ -184,6 +191,18 @@ class NotificationSettings(db.Model):
         )
         return settings
 
+    @classmethod
+    def default_row(cls, user_id, **values):
+        """Column values of create_default_settings(user_id) plus ``values``, for bulk inserts"""
+        defaults = cls.create_default_settings(user_id)
+        row = {
+            column.key: getattr(defaults, column.key)
+            for column in cls.__mapper__.column_attrs
+            if getattr(defaults, column.key) is not None
+        }
+        row.update(values)
+        return row
+
     def get_email_enabled(self, category):
         """Check if email notifications are enabled for a category"""
         field_name = f'email_{category}'
@@ -201,3 +220,24 @@ class NotificationSettings(db.Model):
     def should_send_in_app(self, category):
         """Determine if in-app notification should be created for a category"""
         return self.get_in_app_enabled(category)
+
+
+class NotificationCounter(db.Model):
+    """
+    Denormalized notification counts per user and category.
+
+    Updated in the same transaction as every insert, read-state change and delete
+    of a notification (see NotificationCounterService), so badge polls read a few
+    primary-key rows instead of aggregating the notification table. The
+    notification_counter_repair job rebuilds them from the notifications.
+    """
+    __tablename__ = 'notification_counter'
+
+    user_id = db.Column(GUID(), db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    unread = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<NotificationCounter {self.user_id} {self.category} {self.unread}/{self.total}>'
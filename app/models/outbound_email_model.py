@@ -0,0 +1,41 @@
+from app.extensions import db
+from app.utils.guid_utils import GUID
+from datetime import datetime
+import uuid
+
+
+class OutboundEmail(db.Model):
+    """
+    Durable outbox row for an email waiting to be delivered.
+
+    Requests only insert rows; the background sender claims due rows in batches,
+    delivers them over one SMTP connection and reschedules failures with
+    exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+    """
+    __tablename__ = 'outbound_email'
+
+    id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
+    recipients = db.Column(db.JSON, nullable=False)
+    sender = db.Column(db.String(255), nullable=True)
+    subject = db.Column(db.String(512), nullable=False)
+    html = db.Column(db.Text, nullable=True)
+    body = db.Column(db.Text, nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    # Possible statuses: pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32), nullable=True)  # batch that currently owns the row
+    locked_until = db.Column(db.DateTime, nullable=True)  # a crashed sender's claim lapses after this
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('idx_outbound_email_due', 'status', 'next_attempt_at'),
+        db.Index('idx_outbound_email_claim', 'claim_token'),
+    )
+
+    def __repr__(self):
+        return f'<OutboundEmail {self.subject!r} {self.status}>'
@@ -48,13 +48,36 @@ class PaymentIntent(db.Model):
     payment_method_type = db.Column(db.String(50), nullable=True)  # card, bank_transfer, etc.
     
     # Timestamps
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    # Set in Python so SQLite stores microseconds too; keyset cursors compare (created_at, id)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
     confirmed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('idx_payment_intent_user_card_created', 'user_id', 'virtual_card_id', 'created_at'),
+        db.Index('idx_payment_intent_invoice_created', 'invoice_id', 'created_at'),
+        # Checkout redirects look intents up by session id
+        db.Index('idx_payment_intent_client_secret', 'client_secret'),
+    )
     
     def __repr__(self):
         return f'<PaymentIntent {self.gateway_intent_id}: {self.amount} {self.currency}>'
     
+    @classmethod
+    def query_for_card(cls, user_id, virtual_card_id):
+        """Payment intents charged to one of the user's cards; the caller orders them"""
+        return cls.query.filter_by(user_id=user_id, virtual_card_id=virtual_card_id)
+    
+    @classmethod
+    def query_for_invoice(cls, invoice_id):
+        """Payment intents of an invoice, newest first"""
+        return cls.query.filter_by(invoice_id=invoice_id).order_by(cls.created_at.desc())
+    
+    @classmethod
+    def query_by_client_secret(cls, client_secret):
+        """Payment intent of a checkout session id (its client secret)"""
+        return cls.query.filter_by(client_secret=client_secret)
+    
     @classmethod
     def create_wallet_funding_intent(cls, user_id, account_id, amount, currency, description=None):
         """Create a payment intent for wallet funding"""
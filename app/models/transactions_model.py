@@ -20,12 +20,33 @@ class Transaction(db.Model):
     status = db.Column(db.String(50), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     fee = db.Column(db.Float, nullable=False, default=0.0)
+    amount_minor = db.Column(db.BigInteger, nullable=False, default=0)  # integer minor units (cents/kobo)
+    fee_minor = db.Column(db.BigInteger, nullable=False, default=0)
     description = db.Column(db.Text)
     currency_code = db.Column(db.String(3), nullable=False)
     transction_metadata = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, nullable=False)
     view = db.relationship('TransactionView', back_populates='transaction', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # Per-user listing, newest first (also date-range filters)
+        db.Index('idx_transaction_user_created', 'user_id', 'created_at'),
+        db.Index('idx_transaction_user_type_status', 'user_id', 'type', 'status'),
+    )
+
+    @classmethod
+    def query_for_user(cls, user_id, transaction_type=None, status=None, start_date=None, end_date=None):
+        """A user's transactions narrowed by the list filters; the caller orders them"""
+        query = cls.query.filter_by(user_id=user_id)
+        if transaction_type:
+            query = query.filter(cls.type == transaction_type)
+        if status:
+            query = query.filter(cls.status == status)
+        if start_date:
+            query = query.filter(cls.created_at >= start_date)
+        if end_date:
+            query = query.filter(cls.created_at <= end_date)
+        return query
 
 
 
@@ -36,4 +57,9 @@ class TransactionView(db.Model):
     account_id = db.Column(GUID(), db.ForeignKey('account.id'), nullable=False)
     account = db.relationship('Account', back_populates='view')
     view_type = db.Column(db.String(50), nullable=False)
-    created_at = db.Column(db.DateTime, nullable=False)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        # Covers the account statement: keyset on (created_at, id), then the join to transaction
+        db.Index('idx_transaction_view_account_statement', 'account_id', 'created_at', 'id', 'transaction_id', 'view_type'),
+    )
@@ -101,6 +101,11 @@ class TwoFactorAttempt(db.Model):
     
     # Relationship
     user = relationship("User")
+
+    __table_args__ = (
+        # Rate limiting counts a user's recent failures
+        db.Index('idx_two_factor_attempt_user_success_created', 'user_id', 'success', 'created_at'),
+    )
     
     @classmethod
     def log_attempt(cls, user_id, ip_address, success, attempt_type):
@@ -116,11 +121,16 @@ class TwoFactorAttempt(db.Model):
         return attempt
     
     @classmethod
-    def get_recent_failed_attempts(cls, user_id, minutes=15):
-        """Get recent failed attempts for rate limiting"""
+    def query_recent_failures(cls, user_id, minutes=15):
+        """Failed attempts of a user within the last ``minutes``"""
         since = datetime.utcnow() - timedelta(minutes=minutes)
         return cls.query.filter(
             cls.user_id == user_id,
             cls.success == False,
             cls.created_at >= since
-        ).count()
+        )
+
+    @classmethod
+    def get_recent_failed_attempts(cls, user_id, minutes=15):
+        """Get recent failed attempts for rate limiting"""
+        return cls.query_recent_failures(user_id, minutes).count()
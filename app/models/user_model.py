@@ -35,6 +35,14 @@ class User(db.Model):
     invoices = db.relationship('Invoice', back_populates='user', cascade="all, delete-orphan")
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
 
+    __table_args__ = (
+        db.Index('idx_user_email_verification_token', 'email_verification_token'),
+    )
+
+    @classmethod
+    def query_by_verification_token(cls, token):
+        return cls.query.filter_by(email_verification_token=token)
+
     def set_password(self, password):
         self.password = generate_password_hash(password)
 
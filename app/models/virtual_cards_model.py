@@ -2,19 +2,14 @@ from app.extensions import db
 from app.utils.guid_utils import GUID
 import uuid
 import hashlib
+import secrets
 from datetime import datetime, timedelta
-from app.config import Config
-from cryptography.fernet import Fernet
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.utils.db_utils import is_unique_violation
 from app.utils.generators import CardNumberGenerator
-
-# Access config values safely with proper error handling
-try:
-    from app.config import Config
-    secret_key = getattr(Config, 'SECRET_KEY', '')
-    ACCOUNT_ENCRYPTION_KEY = getattr(Config, 'ACCOUNT_ENCRYPTION_KEY', '')
-except (ImportError, AttributeError) as e:
-    secret_key = ''
-    ACCOUNT_ENCRYPTION_KEY = ''
+from app.utils.crypto import decrypt, rotate_stale
+from app.utils.keyring import keyring
 
 class VirtualCard(db.Model):
     id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
@@ -36,27 +31,8 @@ class VirtualCard(db.Model):
     is_default = db.Column(db.Boolean, default=False)
     is_active = db.Column(db.Boolean, default=True)
     stripe_payment_method_id = db.Column(db.String(255), nullable=True)  # Stripe payment method ID
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
-    
-    # Initialize encryption with safe fallbacks
-    try:
-        _key_from_config = ACCOUNT_ENCRYPTION_KEY
-        if not _key_from_config or _key_from_config == 'dev-encryption-key-change-in-production':
-            _encryption_key = Fernet.generate_key()
-        else:
-            # Key from config should be a base64-encoded string
-            try:
-                _encryption_key = _key_from_config.encode('utf-8')
-                # Test if it's a valid Fernet key
-                Fernet(_encryption_key)
-            except Exception:
-                # If invalid, generate a new key
-                _encryption_key = Fernet.generate_key()
-        _cipher_suite = Fernet(_encryption_key)
-    except Exception as e:
-        # Ultimate fallback - generate a new key
-        _encryption_key = Fernet.generate_key()
-        _cipher_suite = Fernet(_encryption_key)
+    # Set in Python so SQLite stores microseconds too; keyset cursors compare (created_at, id)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
     
     def __init__(self, **kwargs):
         super(VirtualCard, self).__init__(**kwargs)
@@ -64,48 +40,46 @@ class VirtualCard(db.Model):
         if not self._pin:
             self.pin = '0000'
         self.set_expiration_date()
+
+    def _decrypt_field(self, attribute):
+        """Decrypt an encrypted column, moving it to the primary data key if it uses an older one"""
+        if not getattr(self, attribute):
+            return None
+        plaintext = decrypt(keyring, getattr(self, attribute))
+        rotate_stale(self, attribute, plaintext)
+        return plaintext
     
     @property
     def card_number(self):
         """Decrypts and returns the card number."""
-        if not self._card_number:
-            return None
-        return self._cipher_suite.decrypt(self._card_number).decode()
+        return self._decrypt_field('_card_number')
     
     @card_number.setter
     def card_number(self, card_number_plain):
-        """Encrypts the card number and stores its hash for uniqueness checks."""
-        card_hash = hashlib.sha256(card_number_plain.encode()).hexdigest()
-        
-        existing_card = VirtualCard.query.filter_by(card_number_hash=card_hash).first()
-        if existing_card and existing_card.id != self.id:
-            raise ValueError("Card number already exists")
-        self._card_number = self._cipher_suite.encrypt(card_number_plain.encode())
+        """Encrypts the card number and stores its hash; the unique index on the hash enforces uniqueness."""
+        card_hash = VirtualCard.hash_card_number(card_number_plain)
+        self._card_number = keyring.encrypt(card_number_plain.encode())
         self.card_number_hash = card_hash
     
     @property
     def cvv(self):
         """Decrypts and returns the CVV."""
-        if not self._cvv:
-            return None
-        return self._cipher_suite.decrypt(self._cvv).decode()
+        return self._decrypt_field('_cvv')
     
     @cvv.setter
     def cvv(self, cvv_plain):
         """Encrypts and sets the CVV."""
-        self._cvv = self._cipher_suite.encrypt(str(cvv_plain).encode())
+        self._cvv = keyring.encrypt(str(cvv_plain).encode())
     
     @property
     def pin(self):
         """Decrypts and returns the PIN."""
-        if not self._pin:
-            return None
-        return self._cipher_suite.decrypt(self._pin).decode()
+        return self._decrypt_field('_pin')
     
     @pin.setter
     def pin(self, pin_plain):
         """Encrypts and sets the PIN."""
-        self._pin = self._cipher_suite.encrypt(str(pin_plain).encode())
+        self._pin = keyring.encrypt(str(pin_plain).encode())
     
     def set_expiration_date(self):
         """
@@ -115,8 +89,116 @@ class VirtualCard(db.Model):
         expiration = creation_time + timedelta(days=3*365)
         self.expiration_date = expiration.strftime('%m/%Y')
     
+    @staticmethod
+    def hash_card_number(card_number_plain):
+        return hashlib.sha256(card_number_plain.encode()).hexdigest()
+
     @staticmethod
     def generate_card_number(user_id):
-        """Generate a unique 16-digit card number (internal use only)."""
+        """Generate a 16-digit card number (internal use only); uniqueness is settled on insert."""
         # Use dedicated card number generator (BIN + user-derived + random + Luhn)
-        return CardNumberGenerator.generate_card_number(user_id, bin_prefix="543200", length=16)
\ No newline at end of file
+        return CardNumberGenerator.generate_card_number(user_id, bin_prefix="543200", length=16)
+
+    @classmethod
+    def create_card(cls, user_id, **kwargs):
+        """
+        Create a card, generating its number unless one is given.
+
+        Like Account.create_account, the row is inserted optimistically in a savepoint
+        and a generated number that hits the unique index is simply regenerated. The
+        caller commits.
+        """
+        generate = 'card_number' not in kwargs
+        max_retries = 10
+
+        for _ in range(max_retries):
+            if generate:
+                kwargs['card_number'] = cls.generate_card_number(str(user_id))
+            card = cls(user_id=user_id, **kwargs)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(card)
+                return card
+            except IntegrityError as e:
+                if not generate or not is_unique_violation(e, 'card_number_hash'):
+                    raise
+
+        raise Exception("Failed to create card after multiple attempts")
+
+    @classmethod
+    def issue_cards(cls, cards, chunk_size=1000):
+        """
+        Bulk-issue cards for a campaign.
+
+        ``cards`` is an iterable of dicts with user_id, account_id, card_kind, card_type
+        and card_holder (plus optional spending_limit / is_active). Each chunk gets a
+        block of card numbers that are distinct within the block, checked against
+        existing cards with one hash lookup, and written with one multi-row INSERT in a
+        savepoint (regenerated if a concurrent issuer took a number meanwhile). Card
+        numbers are always generated (BIN plus nine random digits, with no per-user
+        component, so one user can receive any number of them); CVVs are random and
+        PINs default to 0000. The caller commits. Returns [{'id', 'user_id', 'account_id', 'last4'}] in input order.
+        """
+        cards = list(cards)
+        issued = []
+        for start in range(0, len(cards), chunk_size):
+            issued.extend(cls._issue_chunk(cards[start:start + chunk_size]))
+        return issued
+
+    @classmethod
+    def _issue_chunk(cls, cards, max_retries=5, max_rounds=50):
+        user_ids = [card['user_id'] for card in cards]
+        expiration_date = (datetime.utcnow() + timedelta(days=3*365)).strftime('%m/%Y')
+        default_pin = '0000'
+
+        for _ in range(max_retries):
+            numbers = CardNumberGenerator.generate_card_numbers(user_ids)
+            # Replace numbers already held by existing cards until the block is clean; each
+            # round costs one query, and rounds shrink with the collisions
+            for _ in range(max_rounds):
+                hashes = {cls.hash_card_number(number): index for index, number in enumerate(numbers)}
+                taken = db.session.execute(
+                    db.select(cls.card_number_hash).where(cls.card_number_hash.in_(list(hashes)))
+                ).scalars().all()
+                if not taken:
+                    break
+                collisions = [hashes[card_hash] for card_hash in taken]
+                replacements = CardNumberGenerator.generate_card_numbers(
+                    [user_ids[index] for index in collisions], exclude=numbers
+                )
+                for index, number in zip(collisions, replacements):
+                    numbers[index] = number
+            else:
+                continue
+
+            rows = []
+            for card, number in zip(cards, numbers):
+                rows.append({
+                    'id': uuid.uuid4(),
+                    'user_id': card['user_id'],
+                    'account_id': card['account_id'],
+                    'card_kind': card.get('card_kind', 'virtual'),
+                    'card_type': card['card_type'],
+                    'card_holder': card['card_holder'],
+                    'spending_limit': card.get('spending_limit'),
+                    'is_default': False,
+                    'is_active': card.get('is_active', True),
+                    '_card_number': keyring.encrypt(number.encode()),
+                    'card_number_hash': cls.hash_card_number(number),
+                    'expiration_date': expiration_date,
+                    '_cvv': keyring.encrypt(f"{secrets.randbelow(1000):03d}".encode()),
+                    '_pin': keyring.encrypt(default_pin.encode()),
+                })
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(cls), rows)
+            except IntegrityError as e:
+                if not is_unique_violation(e, 'card_number_hash'):
+                    raise
+                continue
+            return [
+                {'id': row['id'], 'user_id': row['user_id'], 'account_id': row['account_id'], 'last4': number[-4:]}
+                for row, number in zip(rows, numbers)
+            ]
+
+        raise Exception("Failed to issue cards after multiple attempts")
\ No newline at end of file
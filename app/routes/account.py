@@ -1,12 +1,18 @@
-from flask import Blueprint, current_app, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.utils.decorator import role_required
 from app.models.account_model import Account
-from app.models.user_model import User
-from app.schema.account_schema import AccountSchema, VALID_CURRENCY_CODES
+from app.schema.account_schema import AccountSchema
 from app.extensions import db
-from app.utils.xconverter import apply_margins, fetch_exchange_rates, get_exchange_rate
+from app.utils.xconverter import rate_table
 from app.services.notification_service import NotificationService
+from app.services.ledger_service import LedgerService
+from app.services.balance_summary_service import BalanceSummaryService
+from app.services.account_statement_service import AccountStatementService, EXPORT_FORMATS
+from app.utils.pagination import total_requested, InvalidCursor
+from app.utils.eager_loading import eager_options
+from app.utils.money import from_minor_units
+from datetime import datetime, timedelta
 
 
 account_bp = Blueprint('account', __name__)
@@ -26,7 +32,7 @@ def create_account():
         
         # If this account should be the default, unset the current default.
         if data.get("is_default"):
-            Account.query.filter_by(user_id=user_id, is_default=True).update({"is_default": False})
+            Account.query_default(user_id).update({"is_default": False})
 
         bank_code = data.get("bank_code", "2025")
 
@@ -46,17 +52,18 @@ def create_account():
         )
 
         # Commit the transaction to save the new account and the 'is_default' update
+        BalanceSummaryService.mark_dirty(user_id)
         db.session.commit()
 
         result = account_schema.dump(account)
 
         try:
-            account_number = account.get_account_number()
+            last4 = account.last4
             NotificationService.create_notification(
                 user_id=user_id,
                 title="New account created",
                 message=f"Your {account.currency_code} account"
-                        f"{' ending in ' + account_number[-4:] if account_number else ''}"
+                        f"{' ending in ' + last4 if last4 else ''}"
                         " was created successfully.",
                 category='account',
                 priority='medium',
@@ -87,7 +94,10 @@ def get_accounts():
     """Retrieve all accounts for the logged-in user."""
     try:
         user_id = get_jwt_identity()
-        accounts = Account.query.filter_by(user_id=user_id).order_by(Account.created_at.desc()).all()
+        account_schema = AccountSchema(many=True)
+        accounts = Account.query.filter_by(user_id=user_id).options(
+            *eager_options(account_schema)
+        ).order_by(Account.created_at.desc()).all()
         
         if not accounts:
             return jsonify({
@@ -96,7 +106,6 @@ def get_accounts():
                 "data": []
             }), 200
 
-        account_schema = AccountSchema(many=True)
         result = account_schema.dump(accounts)
 
         return jsonify({
@@ -159,22 +168,23 @@ def update_account(id):
 
         # If the update includes setting this account as default, unset others
         if data.get("is_default") is True:
-            Account.query.filter_by(user_id=user_id, is_default=True).filter(Account.id != id).update({"is_default": False})
+            Account.query_default(user_id).filter(Account.id != id).update({"is_default": False})
             db.session.commit() # Commit this update before loading the current account
 
         # Load the data into the existing account object
         updated_account = account_schema.load(data, instance=account, partial=True)
+        BalanceSummaryService.mark_dirty(user_id)
         db.session.commit()
 
         result = account_schema.dump(updated_account)
 
         try:
-            account_number = updated_account.get_account_number()
+            last4 = updated_account.last4
             NotificationService.create_notification(
                 user_id=user_id,
                 title="Account updated",
                 message=f"Your {updated_account.currency_code} account"
-                        f"{' ending in ' + account_number[-4:] if account_number else ''}"
+                        f"{' ending in ' + last4 if last4 else ''}"
                         " was updated successfully.",
                 category='account',
                 priority='low',
@@ -196,51 +206,179 @@ def update_account(id):
         # It's good practice to log the error here
         return jsonify({"status": 500, "message": str(e)}), 500
 
+@account_bp.route("/accounts/<string:id>/ledger", methods=["GET"])
+@jwt_required()
+def get_account_ledger(id):
+    """Retrieve ledger postings with opening/closing balances for an account over a date range."""
+    try:
+        user_id = get_jwt_identity()
+        account = Account.query.filter_by(user_id=user_id, id=id).first()
+
+        if not account:
+            return jsonify({
+                "status": 404,
+                "message": "Account not found"
+            }), 404
+
+        try:
+            end_date_str = request.args.get("end_date")
+            end_date = datetime.fromisoformat(end_date_str) if end_date_str else datetime.utcnow()
+            start_date_str = request.args.get("start_date")
+            start_date = datetime.fromisoformat(start_date_str) if start_date_str else end_date - timedelta(days=30)
+        except ValueError:
+            return jsonify({
+                "status": 400,
+                "message": "Invalid date. Use ISO 8601 format (e.g. 2025-09-30T21:34:48)."
+            }), 400
+
+        limit = min(request.args.get("limit", 500, type=int), 1000)
+        statement = LedgerService.get_statement(account.id, start_date, end_date, limit=limit)
+        currency = account.currency_code
+
+        return jsonify({
+            "status": 200,
+            "message": "Account ledger retrieved successfully",
+            "data": {
+                "account_id": str(account.id),
+                "currency": currency,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "opening_balance": str(from_minor_units(statement["opening_balance_minor"], currency)),
+                "closing_balance": str(from_minor_units(statement["closing_balance_minor"], currency)),
+                "truncated": statement["truncated"],
+                "entries": [
+                    {
+                        **entry.to_dict(),
+                        "amount": str(from_minor_units(entry.amount_minor, currency)),
+                        "balance_after": str(from_minor_units(entry.balance_after_minor, currency))
+                    }
+                    for entry in statement["entries"]
+                ]
+            }
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_account_ledger: {str(e)}")
+        return jsonify({"status": 500, "message": "An error occurred while retrieving the ledger."}), 500
+
+def _statement_filters():
+    """start_date/end_date/direction query args shared by the statement endpoints; raises ValueError"""
+    filters = {}
+    for name in ("start_date", "end_date"):
+        value = request.args.get(name)
+        if value:
+            filters[name] = datetime.fromisoformat(value)
+    direction = request.args.get("direction")
+    if direction:
+        if direction not in ("debit", "credit"):
+            raise ValueError("direction must be 'debit' or 'credit'")
+        filters["direction"] = direction
+    return filters
+
+@account_bp.route("/accounts/<string:id>/transactions", methods=["GET"])
+@jwt_required()
+def get_account_transactions(id):
+    """Page through an account's transactions, newest first, by (created_at, id) keyset."""
+    try:
+        user_id = get_jwt_identity()
+        account = Account.query.filter_by(user_id=user_id, id=id).first()
+
+        if not account:
+            return jsonify({
+                "status": 404,
+                "message": "Account not found"
+            }), 404
+
+        try:
+            filters = _statement_filters()
+        except ValueError as e:
+            return jsonify({
+                "status": 400,
+                "message": f"Invalid filter: {str(e)}"
+            }), 400
+
+        size = min(max(request.args.get("size", 20, type=int), 1), 100)
+        try:
+            page = AccountStatementService.get_page(
+                account.id, size, request.args.get("cursor"),
+                descending=request.args.get("sort_order", "desc").lower() != "asc",
+                include_total=total_requested(request.args), **filters
+            )
+        except InvalidCursor as e:
+            return jsonify({
+                "status": 400,
+                "message": str(e)
+            }), 400
+
+        return jsonify({
+            "status": 200,
+            "message": "Account transactions retrieved successfully",
+            "data": AccountStatementService.serialize(page.items),
+            "pagination": page.to_dict()
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_account_transactions: {str(e)}")
+        return jsonify({"status": 500, "message": "An error occurred while retrieving the account transactions."}), 500
+
+@account_bp.route("/accounts/<string:id>/transactions/export", methods=["GET"])
+@jwt_required()
+def export_account_transactions(id):
+    """Stream an account statement as CSV or NDJSON, oldest first, without loading it into memory."""
+    try:
+        user_id = get_jwt_identity()
+        account = Account.query.filter_by(user_id=user_id, id=id).first()
+
+        if not account:
+            return jsonify({
+                "status": 404,
+                "message": "Account not found"
+            }), 404
+
+        export_format = request.args.get("format", "csv").lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                "status": 400,
+                "message": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}"
+            }), 400
+
+        try:
+            filters = _statement_filters()
+        except ValueError as e:
+            return jsonify({
+                "status": 400,
+                "message": f"Invalid filter: {str(e)}"
+            }), 400
+
+        filename = f"statement-{account.id}.{export_format}"
+        return Response(
+            stream_with_context(AccountStatementService.export(account.id, export_format, **filters)),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error in export_account_transactions: {str(e)}")
+        return jsonify({"status": 500, "message": "An error occurred while exporting the account transactions."}), 500
+
 @account_bp.route("/balances", methods=["GET"])
 @jwt_required()
 def get_balances():
     """Retrieve all balances for the logged-in user from their various accounts."""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user:
+        summary = BalanceSummaryService.get_summary(user_id)
+        if summary is None:
             return jsonify({
                 "status": 404,
                 "message": "User not found"
             }), 404
-            
-        accounts = Account.query.filter_by(user_id=user_id).all()
-        balances = {}
-        for account in accounts:
-            currency = account.currency_code.lower()
-            balances[currency] = balances.get(currency, 0) + account.balance
-            
-        # Determine the currency of the default account
-        default_account = Account.query.filter_by(user_id=user_id, is_default=True).first()
-        default_currency = default_account.currency_code.lower() if default_account else None
-        
-        # Calculate total in default currency
-        total_in_default = 0.0
-        if default_currency:
-            for currency, balance in balances.items():
-                if currency == default_currency:
-                    total_in_default += balance
-                else:
-                    rate = get_exchange_rate(currency, default_currency)
-                    print(f"DEBUG: Converting {currency} to {default_currency} - Rate: {rate}")
-                    if rate is not None:
-                        total_in_default += balance * rate
-                    else:
-                        print(f"Could not get exchange rate for {currency} to {default_currency}")
-        
+
         # Prepare response data
         response_data = {}
-        for currency, balance in balances.items():
-            response_data[currency] = str(balance)
-            
-        response_data["currency"] = default_account.currency_code if default_account else None
-        response_data["total"] = str(round(total_in_default, 2)) if default_currency else None
-        
+        for currency, balance in summary["balances"].items():
+            response_data[currency.lower()] = str(balance)
+
+        response_data["currency"] = summary["currency"]
+        response_data["total"] = str(summary["total"]) if summary["total"] is not None else None
+
         return jsonify({
             "status": 200,
             "message": "All balances retrieved successfully",
@@ -260,7 +398,7 @@ def get_exchange_rates():
         if not base_currency:
             if user_id:
                 # If user is logged in, try to get their default account's currency
-                default_account = Account.query.filter_by(user_id=user_id, is_default=True).first()
+                default_account = Account.query_default(user_id).first()
                 if default_account:
                     base_currency = default_account.currency_code
             
@@ -270,28 +408,15 @@ def get_exchange_rates():
         
         base_currency = base_currency.upper()
         
-        # Fetch exchange rates (from cache or API)
-        rates = fetch_exchange_rates(base_currency)
-        if rates is None:
+        # Served from the rate table pre-rendered for the current rate snapshot
+        body = rate_table.response_body(base_currency)
+        if body is None:
             return jsonify({
                 "status": 500,
                 "message": "Failed to fetch exchange rates from provider"
             }), 500
-        
-        # Apply margins and format rates for all supported currencies
-        formatted_rates = apply_margins(rates, base_currency, VALID_CURRENCY_CODES)
-        
-        # Prepare response
-        response_data = {
-            "currency": base_currency,
-            "rates": formatted_rates
-        }
-        
-        return jsonify({
-            "status": 200,
-            "message": "Retrieved current exchange rates successfully",
-            "data": response_data
-        }), 200
+
+        return current_app.response_class(body, status=200, mimetype=current_app.json.mimetype)
         
     except Exception as e:
         current_app.logger.error(f"Unexpected error in get_exchange_rates: {str(e)}")
@@ -308,7 +433,7 @@ def get_default_account_balance():
         user_id = get_jwt_identity()
         
         # Find the default account for the user
-        default_account = Account.query.filter_by(user_id=user_id, is_default=True).first()
+        default_account = Account.query_default(user_id).first()
         
         if not default_account:
             return jsonify({
@@ -343,10 +468,11 @@ def close_account():
                 "message": "Account not found"
             }), 404
 
-        account_number = account.get_account_number()
+        last4 = account.last4
         account_currency = account.currency_code
 
         db.session.delete(account)
+        BalanceSummaryService.mark_dirty(user_id)
         db.session.commit()
 
         try:
@@ -354,7 +480,7 @@ def close_account():
                 user_id=user_id,
                 title="Account closed",
                 message=f"Your {account_currency} account"
-                        f"{' ending in ' + account_number[-4:] if account_number else ''}"
+                        f"{' ending in ' + last4 if last4 else ''}"
                         " has been closed by an administrator.",
                 category='account',
                 priority='high',
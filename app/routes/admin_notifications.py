@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.notification_model import Notification, NotificationSettings
-from app.services.notification_service import NotificationService
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.notification_job_service import NotificationJobService
+from app.services.notification_counter_service import NotificationCounterService
 from app.extensions import db
 from app.models.user_model import User
 import logging
@@ -13,7 +15,7 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 @admin_bp.route('/notifications/broadcast', methods=['POST'])
 @jwt_required()
 def broadcast_notification():
-    """Broadcast notification to multiple users (admin only)"""
+    """Broadcast notification to multiple users in a background job (admin only)"""
     try:
         # TODO: Add proper admin role check
         current_user_id = get_jwt_identity()
@@ -48,8 +50,9 @@ def broadcast_notification():
                 "message": "Title and message are required"
             }), 400
 
-        # Broadcast notification using service
-        result = NotificationService.broadcast_notification(
+        # The fan-out runs in a job; poll /api/jobs/<id> for progress
+        job = NotificationJobService.enqueue_broadcast(
+            user_id=current_user.id,
             notification_data={
                 'title': title,
                 'message': message,
@@ -63,10 +66,10 @@ def broadcast_notification():
         )
 
         return jsonify({
-            "status": 201,
-            "message": f"Notification broadcast initiated",
-            "data": result
-        })
+            "status": 202,
+            "message": "Notification broadcast queued",
+            "data": job.to_dict()
+        }), 202
 
     except Exception as e:
         logger.error(f"Error broadcasting notification: {str(e)}")
@@ -79,7 +82,7 @@ def broadcast_notification():
 @admin_bp.route('/notifications/bulk-create', methods=['POST'])
 @jwt_required()
 def bulk_create_notifications():
-    """Create notifications in bulk for specific users (admin only)"""
+    """Create notifications in bulk for specific users in a background job (admin only)"""
     try:
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
@@ -107,28 +110,21 @@ def bulk_create_notifications():
             }), 400
 
         # Verify all users exist
-        users = User.query.filter(User.id.in_(user_ids)).all()
-        if len(users) != len(user_ids):
+        user_ids = list(dict.fromkeys(user_ids))
+        found = User.query.filter(User.id.in_(user_ids)).count()
+        if found != len(user_ids):
             return jsonify({
                 "status": 400,
                 "message": "Some users not found"
             }), 400
 
-        created_count = 0
-        for user in users:
-            created_notifications = NotificationService.create_notifications_for_user(
-                user, notifications_data
-            )
-            created_count += len(created_notifications)
+        job = NotificationJobService.enqueue_bulk_create(current_user.id, user_ids, notifications_data)
 
         return jsonify({
-            "status": 201,
-            "message": "Bulk notifications created successfully",
-            "data": {
-                "users_targeted": len(users),
-                "notifications_created": created_count
-            }
-        })
+            "status": 202,
+            "message": "Bulk notifications queued",
+            "data": job.to_dict()
+        }), 202
 
     except Exception as e:
         logger.error(f"Error bulk creating notifications: {str(e)}")
@@ -141,7 +137,7 @@ def bulk_create_notifications():
 @admin_bp.route('/notifications/cleanup', methods=['DELETE'])
 @jwt_required()
 def cleanup_old_notifications():
-    """Clean up old notifications (admin only)"""
+    """Clean up old notifications in a background job (admin only)"""
     try:
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
@@ -153,16 +149,13 @@ def cleanup_old_notifications():
             }), 403
 
         days_to_keep = request.args.get('days', 90, type=int)
-        deleted_count = NotificationService.cleanup_old_notifications(days_to_keep)
+        job = NotificationJobService.enqueue_cleanup(current_user.id, days_to_keep)
 
         return jsonify({
-            "status": 200,
-            "message": "Notifications cleaned up successfully",
-            "data": {
-                "deleted_count": deleted_count,
-                "days_kept": days_to_keep
-            }
-        })
+            "status": 202,
+            "message": "Notification cleanup queued",
+            "data": job.to_dict()
+        }), 202
 
     except Exception as e:
         logger.error(f"Error cleaning up notifications: {str(e)}")
@@ -172,6 +165,36 @@ def cleanup_old_notifications():
             "error": str(e)
         }), 500
 
+@admin_bp.route('/notifications/counters/repair', methods=['POST'])
+@jwt_required()
+def repair_notification_counters():
+    """Rebuild every user's notification counters in a background job (admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+
+        if current_user.role != 'admin':
+            return jsonify({
+                "status": 403,
+                "message": "Admin access required"
+            }), 403
+
+        job = NotificationCounterService.enqueue_repair(current_user.id)
+
+        return jsonify({
+            "status": 202,
+            "message": "Notification counter repair queued",
+            "data": job.to_dict()
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Error queueing notification counter repair: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "Failed to queue notification counter repair",
+            "error": str(e)
+        }), 500
+
 @admin_bp.route('/notifications/stats', methods=['GET'])
 @jwt_required()
 def get_global_notification_stats():
@@ -226,3 +249,31 @@ def get_global_notification_stats():
             "message": "Failed to retrieve notification statistics",
             "error": str(e)
         }), 500
+
+@admin_bp.route('/email/outbox/stats', methods=['GET'])
+@jwt_required()
+def get_email_outbox_stats():
+    """Get email outbox queue depth and sender metrics (admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+
+        if current_user.role != 'admin':
+            return jsonify({
+                "status": 403,
+                "message": "Admin access required"
+            }), 403
+
+        return jsonify({
+            "status": 200,
+            "message": "Email outbox statistics retrieved",
+            "data": EmailOutboxService.get_stats()
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting email outbox stats: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "Failed to retrieve email outbox statistics",
+            "error": str(e)
+        }), 500
@@ -118,6 +118,7 @@ def login():
         user.name, 
         request.remote_addr or "Unknown"
     )
+    db.session.commit()
 
     access_token = create_access_token(identity=str(user.id), additional_claims={"role": user.role}, expires_delta=timedelta(days=1))
 
@@ -138,7 +139,7 @@ def verify_email():
                         "message": "Verification token is required"}), 400
 
     # Find user by verification token
-    user = User.query.filter_by(email_verification_token=token).first()
+    user = User.query_by_verification_token(token).first()
 
     if not user:
         return jsonify({"status": 404,
@@ -184,7 +185,6 @@ def resend_verification():
 
     # Generate new verification token
     verification_token = user.generate_email_verification_token()
-    db.session.commit()
 
     # Send verification email
     success = EmailService.send_verification_email(
@@ -192,6 +192,7 @@ def resend_verification():
         user.name,
         verification_token
     )
+    db.session.commit()
 
     if success:
         return jsonify({"status": 200,
@@ -227,6 +228,7 @@ def forgot():
     
     # Send password reset email
     EmailService.send_password_reset_email(user.email, reset_token)
+    db.session.commit()
     
     return jsonify({"status": 200,
                     "message": "If a user exists, a password reset link has been sent."}), 200
@@ -1,7 +1,7 @@
 import stripe
 import random
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.virtual_cards_model import VirtualCard
 from app.models.account_model import Account
@@ -11,6 +11,10 @@ from app.extensions import db
 from app.services.payment_service import PaymentService
 from app.config.payment_config import PaymentConfig
 from app.services.notification_service import NotificationService
+from app.services.card_issuance_service import CardIssuanceService
+from app.utils.decorator import idempotent
+from app.utils.pagination import cursor_requested, total_requested, paginate_by_cursor, InvalidCursor
+from app.utils.eager_loading import eager_options
 from decimal import Decimal
 
 # Initialize Stripe using configured secret key
@@ -79,17 +83,10 @@ def create_card():
         card_data['user_id'] = user_id
         card_data['card_holder'] = user.name  # Get full name from user or maybe account
         
-        # Generate a card number if not provided
-        if 'card_number' not in card_data:
-            card_data['card_number'] = VirtualCard.generate_card_number(user_id)
-        
         # Generate a CVV if not provided
         if '_cvv' not in card_data and 'cvv' not in card_data:
             cvv = f"{random.randint(0, 999):03d}"
             card_data['cvv'] = cvv
-        
-        # Create a new card instance
-        new_card = VirtualCard(**card_data)
 
         # Optionally associate an existing Stripe PaymentMethod if provided by client
         pm_id = data.get("stripe_payment_method_id")
@@ -103,7 +100,7 @@ def create_card():
                         "status": 400,
                         "message": "Provided payment method is invalid or not a card."
                     }), 400
-                new_card.stripe_payment_method_id = pm_id
+                card_data['stripe_payment_method_id'] = pm_id
             except stripe.error.StripeError as e:
                 return jsonify({
                     "status": 400,
@@ -116,7 +113,9 @@ def create_card():
                     "message": "Unable to verify Stripe payment method."
                 }), 400
 
-        db.session.add(new_card)
+        # Create the card; a card number is generated (and retried on collision) if not provided
+        new_card = VirtualCard.create_card(**card_data)
+
         db.session.commit()
         
         result = card_schema.dump(new_card)
@@ -167,6 +166,63 @@ def create_card():
             "trace": error_trace
         }), 500
 
+@card_bp.route("/cards/bulk", methods=["POST"])
+@jwt_required()
+@idempotent
+def bulk_create_cards():
+    """
+    Issue many cards (e.g. for a whole team) in a background job; poll /jobs/<job_id> for progress
+    """
+    try:
+        data = request.get_json() or {}
+        user_id = get_jwt_identity()
+
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify({
+                "status": 404,
+                "message": "User not found"
+            }), 404
+
+        cards = data.get("cards")
+        if not isinstance(cards, list) or not cards:
+            return jsonify({
+                "status": 400,
+                "message": "cards must be a non-empty list"
+            }), 400
+
+        max_items = current_app.config.get('BULK_CARD_ISSUANCE_MAX_ITEMS', 10000)
+        if len(cards) > max_items:
+            return jsonify({
+                "status": 400,
+                "message": f"A bulk issuance may contain at most {max_items} cards"
+            }), 400
+
+        normalized, errors = CardIssuanceService.validate_cards(user, cards)
+        if errors:
+            return jsonify({
+                "status": 400,
+                "message": "Invalid data",
+                "errors": {str(index): error for index, error in errors.items()}
+            }), 400
+
+        job = CardIssuanceService.enqueue(user_id, normalized)
+
+        return jsonify({
+            "status": 202,
+            "message": "Card issuance started",
+            "data": job.to_dict()
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Bulk card issuance failed: {e}")
+        return jsonify({
+            "status": 500,
+            "message": "An error occurred while issuing cards"
+        }), 500
+
+
 @card_bp.route("/card/<string:card_id>", methods=["GET"])
 @jwt_required()
 def get_card(card_id):
@@ -231,10 +287,31 @@ def get_all_cards():
         if is_active is not None:
             is_active_bool = is_active.lower() in ['true', '1', 'yes']
             query = query.filter(VirtualCard.is_active == is_active_bool)
+
+        card_schema = VirtualCardSchema(many=True)
+        query = query.options(*eager_options(card_schema))
         
+        if cursor_requested(request.args):
+            try:
+                result = paginate_by_cursor(
+                    query, VirtualCard, size, request.args.get('cursor'),
+                    include_total=total_requested(request.args)
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+
+            return jsonify({
+                "status": 200,
+                "message": "Cards retrieved successfully",
+                "data": card_schema.dump(result.items),
+                "pagination": result.to_dict()
+            }), 200
+
         cards = query.paginate(page=page, per_page=size, error_out=False)
         
-        card_schema = VirtualCardSchema(many=True)
         result = card_schema.dump(cards.items)
         
         return jsonify({
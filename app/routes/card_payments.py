@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.decorator import idempotent
 from app.services.payment_service import PaymentService
 from app.models.payment_intent_model import PaymentIntent
 from app.models.virtual_cards_model import VirtualCard
@@ -9,13 +10,15 @@ from app.extensions import db
 from app.config.payment_config import PaymentConfig
 from decimal import Decimal
 import logging
-from app.routes.transaction import create_transaction
+from app.services.transaction_service import TransactionService
+from app.utils.pagination import cursor_requested, total_requested, paginate_by_cursor, InvalidCursor
 
 card_payments_bp = Blueprint("card_payments", __name__)
 logger = logging.getLogger(__name__)
 
 @card_payments_bp.route("/cards/<string:card_id>/fund-wallet", methods=["POST"])
 @jwt_required()
+@idempotent
 def fund_wallet_with_card(card_id):
     """
     Use virtual card to fund wallet account
@@ -56,7 +59,7 @@ def fund_wallet_with_card(card_id):
         
         # Log transaction as pending intent
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=user_id,
                 txn_type="card_wallet_fund_intent",
                 status="pending",
@@ -114,15 +117,34 @@ def get_card_transactions(card_id):
         
         # Get payment intents associated with this card
         from app.models.payment_intent_model import PaymentIntent
-        payment_intents = PaymentIntent.query.filter_by(
-            user_id=user_id,
-            virtual_card_id=card_id
-        ).order_by(PaymentIntent.created_at.desc()).paginate(
-            page=page, per_page=size, error_out=False
-        )
+        query = PaymentIntent.query_for_card(user_id, card_id)
+        if cursor_requested(request.args):
+            try:
+                result = paginate_by_cursor(
+                    query, PaymentIntent, size, request.args.get('cursor'),
+                    include_total=total_requested(request.args)
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+            intents = result.items
+            pagination = result.to_dict()
+        else:
+            payment_intents = query.order_by(PaymentIntent.created_at.desc()).paginate(
+                page=page, per_page=size, error_out=False
+            )
+            intents = payment_intents.items
+            pagination = {
+                "page": page,
+                "size": size,
+                "total": payment_intents.total,
+                "pages": payment_intents.pages
+            }
         
         transactions_data = []
-        for intent in payment_intents.items:
+        for intent in intents:
             transactions_data.append({
                 "transaction_id": intent.id,
                 "amount": str(intent.amount),
@@ -138,12 +160,7 @@ def get_card_transactions(card_id):
             "message": "Card transactions retrieved successfully",
             "data": {
                 "transactions": transactions_data,
-                "pagination": {
-                    "page": page,
-                    "size": size,
-                    "total": payment_intents.total,
-                    "pages": payment_intents.pages
-                }
+                "pagination": pagination
             }
         }), 200
         
@@ -13,6 +13,7 @@ from app.schema.invoice_schema import (
     InvoiceFilterSchema
 )
 from app.services.notification_service import NotificationService
+from app.utils.pagination import paginate_by_cursor, InvalidCursor
 import logging
 
 invoice_bp = Blueprint('invoice', __name__)
@@ -178,6 +179,30 @@ def get_invoices():
         # Apply pagination
         page = filters.get('page', 1)
         size = filters.get('size', 10)
+        if 'cursor' in filters:
+            if filters.get('sort_by', 'created_at') != 'created_at':
+                return jsonify({
+                    "status": 400,
+                    "message": "Cursor pagination only supports sort_by=created_at"
+                }), 400
+            try:
+                result = paginate_by_cursor(
+                    query, Invoice, size, filters['cursor'],
+                    descending=filters.get('sort_order') != 'asc', include_total=filters['include_total']
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+
+            return jsonify({
+                "status": 200,
+                "message": "Invoices retrieved successfully",
+                "data": InvoiceResponseSchema(many=True).dump(result.items),
+                "pagination": result.to_dict()
+            }), 200
+
         invoices = query.paginate(page=page, per_page=size, error_out=False)
         
         # Serialize results
@@ -224,10 +249,7 @@ def get_draft_invoices():
         size = request.args.get('size', 10, type=int)
         
         # Query draft invoices
-        invoices = Invoice.query.filter(
-            Invoice.user_id == user_id,
-            Invoice.status == InvoiceStatus.DRAFT.value
-        ).order_by(desc(Invoice.created_at)).paginate(
+        invoices = Invoice.query_by_status(user_id, InvoiceStatus.DRAFT.value).order_by(desc(Invoice.created_at)).paginate(
             page=page, per_page=size, error_out=False
         )
         
@@ -267,10 +289,7 @@ def get_pending_invoices():
         size = request.args.get('size', 10, type=int)
         
         # Query pending invoices
-        invoices = Invoice.query.filter(
-            Invoice.user_id == user_id,
-            Invoice.status == InvoiceStatus.PENDING.value
-        ).order_by(desc(Invoice.due_date)).paginate(
+        invoices = Invoice.query_by_status(user_id, InvoiceStatus.PENDING.value).order_by(desc(Invoice.due_date)).paginate(
             page=page, per_page=size, error_out=False
         )
         
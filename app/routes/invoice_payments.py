@@ -8,7 +8,7 @@ from app.extensions import db
 from app.services.notification_service import NotificationService
 from decimal import Decimal
 import logging
-from app.routes.transaction import create_transaction
+from app.services.transaction_service import TransactionService
 
 invoice_payments_bp = Blueprint('invoice_payments', __name__)
 logger = logging.getLogger(__name__)
@@ -55,7 +55,7 @@ def create_invoice_payment_session(invoice_id):
         )
         # Log transaction as pending invoice payment intent
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=invoice.user_id,
                 txn_type="invoice_payment_intent",
                 status="pending",
@@ -147,9 +147,8 @@ def handle_invoice_payment_success(invoice_id):
         
         # Find payment intent by session ID
         from app.models.payment_intent_model import PaymentIntent
-        payment_intent = PaymentIntent.query.filter_by(
-            invoice_id=invoice_id,
-            client_secret=session_id
+        payment_intent = PaymentIntent.query_by_client_secret(session_id).filter_by(
+            invoice_id=invoice_id
         ).first()
         
         if not payment_intent:
@@ -276,9 +275,7 @@ def get_invoice_payment_status(invoice_id):
         
         # Get latest payment intent for this invoice
         from app.models.payment_intent_model import PaymentIntent
-        payment_intent = PaymentIntent.query.filter_by(
-            invoice_id=invoice_id
-        ).order_by(PaymentIntent.created_at.desc()).first()
+        payment_intent = PaymentIntent.query_for_invoice(invoice_id).first()
         
         response_data = {
             "invoice_id": invoice_id,
@@ -354,7 +351,7 @@ def get_invoice_payment_link(invoice_id):
         )
         # Log transaction for the new payment intent
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=user_id,
                 txn_type="invoice_payment_intent",
                 status="pending",
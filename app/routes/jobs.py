@@ -0,0 +1,112 @@
+import uuid
+import logging
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('/jobs/<string:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Get the status and progress of a background job (owner or admin)"""
+    try:
+        try:
+            job_id = uuid.UUID(job_id)
+        except ValueError:
+            return jsonify({
+                "status": 404,
+                "message": "Job not found"
+            }), 404
+
+        owner_id = None if get_jwt().get('role') == 'admin' else get_jwt_identity()
+        job = JobService.get_job(job_id, user_id=owner_id)
+        if not job:
+            return jsonify({
+                "status": 404,
+                "message": "Job not found"
+            }), 404
+
+        return jsonify({
+            "status": 200,
+            "message": "Job retrieved successfully",
+            "data": job.to_dict()
+        })
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "Failed to get job",
+            "error": str(e)
+        }), 500
+
+
+@jobs_bp.route('/jobs', methods=['GET'])
+@jwt_required()
+def list_jobs():
+    """List your most recent background jobs (admins see every job)"""
+    try:
+        status = request.args.get('status')
+        job_type = request.args.get('job_type')
+        limit = min(request.args.get('limit', 20, type=int), 100)
+
+        owner_id = None if get_jwt().get('role') == 'admin' else get_jwt_identity()
+        jobs = JobService.list_jobs(user_id=owner_id, status=status, job_type=job_type, limit=limit)
+
+        return jsonify({
+            "status": 200,
+            "message": "Jobs retrieved successfully",
+            "data": [job.to_dict() for job in jobs]
+        })
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "Failed to list jobs",
+            "error": str(e)
+        }), 500
+
+
+@jobs_bp.route('/jobs/<string:job_id>/cancel', methods=['POST'])
+@jwt_required()
+def cancel_job(job_id):
+    """Cancel a queued or running job (owner or admin); a running job stops after its current chunk"""
+    try:
+        try:
+            job_id = uuid.UUID(job_id)
+        except ValueError:
+            return jsonify({
+                "status": 404,
+                "message": "Job not found"
+            }), 404
+
+        owner_id = None if get_jwt().get('role') == 'admin' else get_jwt_identity()
+        job = JobService.get_job(job_id, user_id=owner_id)
+        if not job:
+            return jsonify({
+                "status": 404,
+                "message": "Job not found"
+            }), 404
+
+        if not JobService.cancel(job):
+            return jsonify({
+                "status": 409,
+                "message": f"Job already {job.status}",
+                "data": job.to_dict()
+            }), 409
+
+        return jsonify({
+            "status": 202,
+            "message": "Job cancelled" if job.status == 'cancelled' else "Job cancellation requested",
+            "data": job.to_dict()
+        }), 202
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "Failed to cancel job",
+            "error": str(e)
+        }), 500
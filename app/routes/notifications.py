@@ -2,7 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.notification_model import Notification, NotificationSettings
 from app.services.notification_service import NotificationService
+from app.services.notification_settings_service import NotificationSettingsService
+from app.services.notification_counter_service import NotificationCounterService
 from app.extensions import db
+from app.utils.pagination import cursor_requested, total_requested, paginate_by_cursor, InvalidCursor
 from datetime import datetime
 import logging
 
@@ -16,25 +19,13 @@ def get_notification_count():
     """Get notification count for authenticated user"""
     try:
         user_id = get_jwt_identity()
-        total_count = Notification.query.filter_by(user_id=user_id).count()
-        unread_count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
-
-        # Category breakdown
-        category_stats = db.session.query(
-            Notification.category,
-            db.func.count(Notification.id)
-        ).filter_by(user_id=user_id).group_by(Notification.category).all()
-
-        category_breakdown = {category: count for category, count in category_stats}
+        # Denormalized counters: a primary-key read instead of three aggregates
+        counts = NotificationCounterService.get_counts(user_id)
 
         return jsonify({
             "status": 200,
             "message": "Notification count retrieved successfully",
-            "data": {
-                "total": total_count,
-                "unread": unread_count,
-                "categories": category_breakdown
-            }
+            "data": counts
         })
     except Exception as e:
         logger.error(f"Error getting notification count: {str(e)}")
@@ -74,6 +65,32 @@ def get_notifications():
         else:
             query = query.order_by(getattr(Notification, sort_by).desc())
 
+        if cursor_requested(request.args):
+            if sort_by != 'created_at':
+                return jsonify({
+                    "status": 400,
+                    "message": "Cursor pagination only supports sort_by=created_at"
+                }), 400
+            try:
+                result = paginate_by_cursor(
+                    query, Notification, limit, request.args.get('cursor'),
+                    descending=sort_order != 'asc', include_total=total_requested(request.args)
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+
+            return jsonify({
+                "status": 200,
+                "message": "Notifications retrieved successfully",
+                "data": {
+                    "notifications": [notif.to_dict() for notif in result.items],
+                    "pagination": result.to_dict()
+                }
+            })
+
         # Pagination
         pagination = query.paginate(page=page, per_page=limit, error_out=False)
         notifications = pagination.items
@@ -245,15 +262,15 @@ def clear_notifications():
         older_than = request.args.get('older_than')
         status = request.args.get('status')
 
-        query = Notification.query.filter_by(user_id=user_id)
+        criteria = [Notification.user_id == user_id]
 
         if category:
-            query = query.filter_by(category=category)
+            criteria.append(Notification.category == category)
 
         if older_than:
             try:
                 older_than_date = datetime.fromisoformat(older_than.replace('Z', '+00:00'))
-                query = query.filter(Notification.created_at < older_than_date)
+                criteria.append(Notification.created_at < older_than_date)
             except ValueError:
                 return jsonify({
                     "status": 400,
@@ -261,12 +278,11 @@ def clear_notifications():
                 }), 400
 
         if status == 'read':
-            query = query.filter_by(is_read=True)
+            criteria.append(Notification.is_read == True)
         elif status == 'unread':
-            query = query.filter_by(is_read=False)
+            criteria.append(Notification.is_read == False)
 
-        deleted_count = query.count()
-        query.delete()
+        deleted_count = NotificationCounterService.delete_notifications(*criteria)
         db.session.commit()
 
         return jsonify({
@@ -293,12 +309,9 @@ def manage_notification_settings():
         user_id = get_jwt_identity()
 
         if request.method == 'GET':
-            # Get current settings
-            settings = NotificationSettings.query.filter_by(user_id=user_id).first()
-            if not settings:
-                settings = NotificationSettings.create_default_settings(user_id)
-                db.session.add(settings)
-                db.session.commit()
+            # Get current settings (cached; missing defaults are inserted by the loader)
+            settings = NotificationSettingsService.get_settings(user_id)
+            db.session.commit()
 
             return jsonify({
                 "status": 200,
@@ -337,6 +350,7 @@ def manage_notification_settings():
                 settings.quiet_hours_enabled = data['quiet_hours_enabled']
 
             db.session.commit()
+            NotificationSettingsService.invalidate(user_id)
 
             return jsonify({
                 "status": 200,
@@ -71,7 +71,7 @@ def payment_success():
     invoice_id = None
 
     if session_id:
-        payment_intent = PaymentIntent.query.filter_by(client_secret=session_id).first()
+        payment_intent = PaymentIntent.query_by_client_secret(session_id).first()
         if payment_intent:
             invoice_id = str(payment_intent.invoice_id) if payment_intent.invoice_id else None
 
@@ -102,7 +102,7 @@ def payment_cancel():
     invoice_id = None
 
     if session_id:
-        payment_intent = PaymentIntent.query.filter_by(client_secret=session_id).first()
+        payment_intent = PaymentIntent.query_by_client_secret(session_id).first()
         if payment_intent:
             invoice_id = str(payment_intent.invoice_id) if payment_intent.invoice_id else None
 
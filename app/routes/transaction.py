@@ -1,86 +1,19 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from sqlalchemy import or_, cast
 from sqlalchemy.sql import text
-from sqlalchemy.types import String
 from datetime import datetime
 from app.extensions import db
 
 from app.models.transactions_model import Transaction, TransactionView
 from app.schema.transactions_schema import TransactionSchema
+from app.utils.pagination import cursor_requested, total_requested, paginate_by_cursor, InvalidCursor
+from app.utils.eager_loading import eager_options
+from app.services.transaction_search_service import TransactionSearchService
 
 
 transaction_bp = Blueprint("transaction", __name__)
 
 
-def create_transaction(
-    *,
-    user_id,
-    txn_type,
-    status,
-    amount,
-    currency_code,
-    description=None,
-    debit_account_id=None,
-    credit_account_id=None,
-    payment_method_id=None,
-    beneficiary_id=None,
-    metadata=None,
-):
-    """
-    Create a Transaction row and associated TransactionView rows for quick listing.
-
-    Required params:
-      - user_id: UUID of the owner
-      - txn_type: e.g. 'wallet_fund_intent', 'wallet_fund', 'payout', 'transfer', 'card_wallet_fund_intent'
-      - status: 'pending' | 'succeeded' | 'failed' | 'canceled'
-      - amount: float or Decimal (will be stored as float)
-      - currency_code: 'USD', 'EUR', etc.
-
-    Optional params help contextualize the transaction for UI and auditing.
-    """
-    created_at = datetime.utcnow()
-    txn = Transaction(
-        user_id=user_id,
-        debit_account_id=debit_account_id,
-        credit_account_id=credit_account_id,
-        payment_method_id=payment_method_id,
-        beneficiary_id=beneficiary_id,
-        type=txn_type,
-        status=status,
-        amount=float(amount),
-        fee=0.0,
-        description=description,
-        currency_code=currency_code,
-        transction_metadata=metadata or {},
-        created_at=created_at,
-    )
-    db.session.add(txn)
-    db.session.flush()  # get txn.id
-
-    # Create views for involved accounts to support per-account listings
-    if debit_account_id:
-        db.session.add(
-            TransactionView(
-                transaction_id=txn.id,
-                account_id=debit_account_id,
-                view_type="debit",
-                created_at=created_at,
-            )
-        )
-    if credit_account_id:
-        db.session.add(
-            TransactionView(
-                transaction_id=txn.id,
-                account_id=credit_account_id,
-                view_type="credit",
-                created_at=created_at,
-            )
-        )
-
-    # Caller is responsible for committing
-    return txn
-
 @transaction_bp.route("/transactions", methods=["GET"])
 @jwt_required()
 def get_transactions():
@@ -101,18 +34,10 @@ def get_transactions():
         sort_by = request.args.get("sort_by", default="created_at")
         sort_order = request.args.get("sort_order", default="desc").lower()
 
-        query = Transaction.query.filter_by(user_id=user_id)
-
-        if transaction_type:
-            query = query.filter(Transaction.type == transaction_type)
-
-        if transaction_status:
-            query = query.filter(Transaction.status == transaction_status)
-
+        start_date = end_date = None
         if start_date_str:
             try:
                 start_date = datetime.fromisoformat(start_date_str)
-                query = query.filter(Transaction.created_at >= start_date)
             except ValueError:
                 return jsonify({
                     "status": 400,
@@ -122,23 +47,20 @@ def get_transactions():
         if end_date_str:
             try:
                 end_date = datetime.fromisoformat(end_date_str)
-                query = query.filter(Transaction.created_at <= end_date)
             except ValueError:
                 return jsonify({
                     "status": 400,
                     "message": "Invalid end_date. Use ISO 8601 format (e.g. 2025-09-30T21:34:48)."
                 }), 400
 
+        query = Transaction.query_for_user(
+            user_id, transaction_type=transaction_type, status=transaction_status,
+            start_date=start_date, end_date=end_date
+        )
+
         if search:
-            like_value = f"%{search}%"
-            query = query.filter(or_(
-                Transaction.description.ilike(like_value),
-                Transaction.type.ilike(like_value),
-                Transaction.status.ilike(like_value),
-                cast(Transaction.currency_code, String).ilike(like_value),
-                cast(Transaction.amount, String).ilike(like_value),
-                cast(Transaction.fee, String).ilike(like_value)
-            ))
+            # Full-text index for words, amount ranges for numbers (see TransactionSearchService.parse)
+            query = TransactionSearchService.filter(query, user_id, search)
 
         if sort_by not in {"created_at", "amount", "status", "type"}:
             sort_by = "created_at"
@@ -147,9 +69,35 @@ def get_transactions():
         sort_column = sort_column.desc() if sort_order != "asc" else sort_column.asc()
         query = query.order_by(sort_column)
 
-        transactions = query.paginate(page=page, per_page=size, error_out=False)
-
+        # Load what the schema nests (user, accounts, beneficiary) with the page itself
         schema = TransactionSchema(many=True)
+        query = query.options(*eager_options(schema))
+
+        if cursor_requested(request.args):
+            if sort_by != "created_at":
+                return jsonify({
+                    "status": 400,
+                    "message": "Cursor pagination only supports sort_by=created_at"
+                }), 400
+            try:
+                result = paginate_by_cursor(
+                    query, Transaction, size, request.args.get("cursor"),
+                    descending=sort_order != "asc", include_total=total_requested(request.args)
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+
+            return jsonify({
+                "status": 200,
+                "message": "Transactions retrieved successfully",
+                "data": schema.dump(result.items),
+                "pagination": result.to_dict()
+            }), 200
+
+        transactions = query.paginate(page=page, per_page=size, error_out=False)
         data = schema.dump(transactions.items)
 
         return jsonify({
@@ -180,7 +128,10 @@ def get_transaction(id):
     """Get a specific transaction by ID"""
     try:
         user_id = get_jwt_identity()
-        transaction = Transaction.query.filter_by(id=id, user_id=user_id).first()
+        transaction_schema = TransactionSchema()
+        transaction = Transaction.query.filter_by(id=id, user_id=user_id).options(
+            *eager_options(transaction_schema)
+        ).first()
 
         if not transaction:
             return jsonify({
@@ -188,7 +139,6 @@ def get_transaction(id):
                 "message": "Transaction not found"
             }), 404
 
-        transaction_schema = TransactionSchema()
         result = transaction_schema.dump(transaction)
 
         return jsonify({
@@ -218,6 +168,7 @@ def delete_transaction(id):
                 "message": "Transaction not found"
             }), 404
 
+        TransactionSearchService.remove([transaction.id])
         db.session.delete(transaction)
         db.session.commit()
 
@@ -109,14 +109,14 @@ def verify_2fa():
         two_fa.is_enabled = True
         backup_codes = two_fa.generate_backup_codes()
         
+        # Send confirmation email
+        user = User.query.get(user_id)
+        EmailService.send_2fa_setup_email(user.email, user.name)
+        
         db.session.commit()
         
         # Log successful attempt
         TwoFactorAttempt.log_attempt(user_id, request.remote_addr, True, 'totp')
-        
-        # Send confirmation email
-        user = User.query.get(user_id)
-        EmailService.send_2fa_setup_email(user.email, user.name)
 
         try:
             NotificationService.create_notification(
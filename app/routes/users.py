@@ -7,6 +7,8 @@ from app.models.user_model import User
 from app.schema.user_schema import User_schema
 from app.schema.beneficiaries_schema import BeneficiariesSchema
 from app.models.beneficiaries_model import Beneficiaries
+from app.utils.pagination import cursor_requested, total_requested, paginate_by_cursor, InvalidCursor
+from app.utils.eager_loading import eager_options
 
 
 user_bp = Blueprint('user', __name__)
@@ -212,11 +214,32 @@ def get_beneficiaries(id):
                 Beneficiaries.bank_name.ilike(f'%{search}%'),
                 Beneficiaries.account_number.ilike(f'%{search}%')
             ))
+
+        beneficiary_schema = BeneficiariesSchema(many=True)
+        query = query.options(*eager_options(beneficiary_schema))
         
+        if cursor_requested(request.args):
+            try:
+                result = paginate_by_cursor(
+                    query, Beneficiaries, size, request.args.get('cursor'),
+                    include_total=total_requested(request.args)
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    "status": 400,
+                    "message": str(e)
+                }), 400
+
+            return jsonify({
+                "status": 200,
+                "message": "Beneficiaries retrieved successfully",
+                "data": beneficiary_schema.dump(result.items),
+                "pagination": result.to_dict()
+            }), 200
+
         # Apply pagination
         beneficiaries = query.paginate(page=page, per_page=size, error_out=False)
         
-        beneficiary_schema = BeneficiariesSchema(many=True)
         result = beneficiary_schema.dump(beneficiaries.items)
         
         return jsonify({
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.decorator import idempotent
 from app.models.account_model import Account
 from app.models.user_model import User
 from app.models.payout_model import Payout
@@ -8,7 +9,7 @@ from app.config.payment_config import PaymentConfig
 from app.extensions import db
 from decimal import Decimal
 import logging
-from app.routes.transaction import create_transaction
+from app.services.transaction_service import TransactionService
 from app.services.notification_service import NotificationService
 
 wallet_bp = Blueprint('wallet', __name__)
@@ -16,6 +17,7 @@ logger = logging.getLogger(__name__)
 
 @wallet_bp.route("/wallets/fund", methods=["POST"])
 @jwt_required()
+@idempotent
 def fund_wallet():
     """
     Create a payment intent for wallet funding using Stripe
@@ -40,10 +42,7 @@ def fund_wallet():
         
         # If no account_id provided, use default account
         if not account_id:
-            default_account = Account.query.filter_by(
-                user_id=user_id, 
-                is_default=True
-            ).first()
+            default_account = Account.query_default(user_id).first()
             
             if not default_account:
                 return jsonify({
@@ -70,7 +69,7 @@ def fund_wallet():
         )
         # Log transaction as pending intent (credit to account on success)
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=user_id,
                 txn_type="wallet_fund_intent",
                 status="pending",
@@ -130,6 +129,7 @@ def fund_wallet():
 
 @wallet_bp.route("/wallets/withdraw", methods=["POST"])
 @jwt_required()
+@idempotent
 def withdraw_funds():
     """
     Create a payout for withdrawing funds to a beneficiary account
@@ -162,12 +162,7 @@ def withdraw_funds():
         method = data.get('method', 'standard')  # standard or instant
         
         # Validate that the account_number exists and belongs to user
-        from app.models.account_model import Account
-        target_account = None
-        for account in Account.query.filter_by(user_id=user_id).all():
-            if account.get_account_number() == account_number:
-                target_account = account
-                break
+        target_account = Account.find_by_account_number(account_number, user_id=user_id)
         
         if not target_account:
             return jsonify({
@@ -177,11 +172,7 @@ def withdraw_funds():
         
         # If no account_id provided, use default account
         if not account_id:
-            default_account = Account.query.filter_by(
-                user_id=user_id, 
-                is_default=True,
-                currency_code=currency
-            ).first()
+            default_account = Account.query_default(user_id, currency).first()
             
             if not default_account:
                 return jsonify({
@@ -209,7 +200,7 @@ def withdraw_funds():
         )
         # Log payout transaction as pending (debit from account)
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=user_id,
                 txn_type="payout",
                 status="pending",
@@ -273,6 +264,7 @@ def withdraw_funds():
 
 @wallet_bp.route("/wallets/transfer", methods=["POST"])
 @jwt_required()
+@idempotent
 def transfer_funds():
     """
     Transfer funds between accounts (beneficiaries, second accounts, other customers, non-customers)
@@ -298,11 +290,7 @@ def transfer_funds():
         
         # If no source_account_id provided, use default account
         if not source_account_id:
-            default_account = Account.query.filter_by(
-                user_id=user_id, 
-                is_default=True,
-                currency_code=currency
-            ).first()
+            default_account = Account.query_default(user_id, currency).first()
             
             if not default_account:
                 return jsonify({
@@ -412,7 +400,7 @@ def transfer_funds():
         
         # Log transfer transaction
         try:
-            create_transaction(
+            TransactionService.create_transaction(
                 user_id=user_id,
                 txn_type="transfer",
                 status="pending",
@@ -474,6 +462,89 @@ def transfer_funds():
             "message": "An error occurred while processing your request"
         }), 500
 
+@wallet_bp.route("/wallets/transfers/bulk", methods=["POST"])
+@jwt_required()
+@idempotent
+def bulk_transfer_funds():
+    """
+    Settle many internal, customer and external transfers in one request and one database transaction
+    """
+    try:
+        data = request.get_json() or {}
+        user_id = get_jwt_identity()
+
+        transfers = data.get('transfers')
+        if not isinstance(transfers, list) or not transfers:
+            return jsonify({
+                "status": 400,
+                "message": "transfers must be a non-empty list"
+            }), 400
+
+        max_items = current_app.config.get('BULK_TRANSFER_MAX_ITEMS', 5000)
+        if len(transfers) > max_items:
+            return jsonify({
+                "status": 400,
+                "message": f"A bulk transfer may contain at most {max_items} transfers"
+            }), 400
+
+        atomic = data.get('atomic', False)
+        if not isinstance(atomic, bool):
+            return jsonify({
+                "status": 400,
+                "message": "atomic must be a boolean"
+            }), 400
+
+        batch = PaymentService.create_bulk_transfer(
+            user_id=user_id,
+            transfers=transfers,
+            atomic=atomic
+        )
+        results = batch["results"]
+        succeeded = [result for result in results if result["status"] in ('completed', 'pending')]
+        failed_count = len(results) - len(succeeded)
+
+        if succeeded:
+            try:
+                NotificationService.create_notification(
+                    user_id=user_id,
+                    title="Bulk transfer processed",
+                    message=f"{len(succeeded)} of {len(results)} transfers in your batch were processed.",
+                    category='transaction',
+                    priority='medium',
+                    metadata={
+                        "batch_id": batch["batch_id"],
+                        "succeeded": len(succeeded),
+                        "failed": failed_count
+                    }
+                )
+            except Exception as notify_err:
+                logger.warning(f"Bulk transfer notification failed: {notify_err}")
+
+        status_code = 201 if succeeded else 400
+        return jsonify({
+            "status": status_code,
+            "message": "Bulk transfer processed" if succeeded else "No transfers in the batch could be processed",
+            "data": {
+                "batch_id": batch["batch_id"],
+                "total": len(results),
+                "succeeded": len(succeeded),
+                "failed": failed_count,
+                "results": results
+            }
+        }), status_code
+
+    except ValueError as e:
+        return jsonify({
+            "status": 400,
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error creating bulk transfer: {str(e)}")
+        return jsonify({
+            "status": 500,
+            "message": "An error occurred while processing your request"
+        }), 500
+
 @wallet_bp.route("/wallets/payment-intents/<string:intent_id>", methods=["GET"])
 @jwt_required()
 def get_payment_intent(intent_id):
@@ -5,6 +5,7 @@ from app.config.payment_config import PaymentConfig
 from app.services.payment_service import PaymentService
 from app.models.payment_intent_model import PaymentIntent
 from app.models.payout_model import Payout
+from app.services.balance_service import BalanceService
 from app.extensions import db
 
 webhooks_bp = Blueprint('webhooks', __name__)
@@ -213,8 +214,8 @@ def handle_payout_failed(payout_data):
             )
             
             # Refund the amount back to the user's account
-            if payout.account:
-                payout.account.balance += payout.amount
+            if payout.account_id:
+                BalanceService.credit(payout.account_id, payout.amount, payout.currency, description=f"Refund of failed payout {payout_id}")
                 logger.info(f"Refunded {payout.amount} {payout.currency} back to account {payout.account_id}")
             
             db.session.commit()
@@ -1,5 +1,5 @@
 from marshmallow_sqlalchemy import SQLAlchemySchema, auto_field
-from marshmallow import fields, validates, ValidationError, validate
+from marshmallow import fields, validates, ValidationError, validate, pre_dump
 from app.models.account_model import Account
 from app.schema.user_schema import User_schema
 from app.extensions import db
@@ -33,6 +33,13 @@ class AccountSchema(SQLAlchemySchema):
     # Custom field for the masked account number (for display)
     account_number_masked = fields.Method("get_masked_account_number", dump_only=True)
 
+    @pre_dump(pass_collection=True)
+    def decrypt_account_numbers(self, data, many, **kwargs):
+        """Decrypt all full account numbers of a collection in one pass before the per-row dump"""
+        if many and 'account_number' in self.fields and not self.fields['account_number'].load_only:
+            Account.decrypt_account_numbers(obj for obj in data if isinstance(obj, Account))
+        return data
+
     def get_full_account_number(self, obj):
         """Return the decrypted account number."""
         if hasattr(obj, 'get_account_number'):
@@ -41,9 +48,8 @@ class AccountSchema(SQLAlchemySchema):
     
     def get_masked_account_number(self, obj):
         """Return a masked version of the account number for display"""
-        if hasattr(obj, 'get_account_number'):
-            full_account = obj.get_account_number()
-            return f"****{full_account[-4:]}" if full_account else None
+        if hasattr(obj, 'get_masked_account_number'):
+            return obj.get_masked_account_number()
         return None
     
     @validates('currency_code')
@@ -141,6 +141,10 @@ class InvoiceFilterSchema(Schema):
         'created_at', 'updated_at', 'issue_date', 'due_date', 'amount', 'total_amount', 'status'
     ]))
     sort_order = fields.Str(load_default='desc', validate=validate.OneOf(['asc', 'desc']))
+
+    # Cursor pagination: pass cursor (empty for the first page) instead of page
+    cursor = fields.Str()
+    include_total = fields.Bool(load_default=False)
     
     # Special filters
     overdue_only = fields.Bool(load_default=False)
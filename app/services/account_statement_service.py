@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import logging
+from flask import current_app
+from sqlalchemy.orm import contains_eager
+from app.models.transactions_model import TransactionView
+from app.schema.transactions_schema import TransactionSchema
+from app.utils.money import from_minor_units
+from app.utils.pagination import paginate_by_cursor
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_COLUMNS = [
+    'created_at', 'transaction_id', 'direction', 'type', 'status',
+    'amount', 'fee', 'currency_code', 'description'
+]
+
+# The statement's own fields; nested user/account/beneficiary would cost a lazy load per row
+statement_schema = TransactionSchema(many=True, exclude=('user', 'debit_account', 'credit_account', 'beneficiary'))
+
+
+class AccountStatementService:
+    """Service class listing and exporting an account's transactions through TransactionView"""
+
+    @staticmethod
+    def query(account_id, start_date=None, end_date=None, direction=None):
+        """
+        TransactionView rows of an account joined to their Transaction in the same
+        SELECT, so a page is one query served by idx_transaction_view_account_statement.
+        """
+        query = TransactionView.query.join(TransactionView.transaction).options(
+            contains_eager(TransactionView.transaction)
+        ).filter(TransactionView.account_id == account_id)
+
+        if start_date:
+            query = query.filter(TransactionView.created_at >= start_date)
+        if end_date:
+            query = query.filter(TransactionView.created_at <= end_date)
+        if direction:
+            query = query.filter(TransactionView.view_type == direction)
+        return query
+
+    @staticmethod
+    def get_page(account_id, size, cursor=None, descending=True, include_total=False, **filters):
+        """One keyset page of the statement; raises InvalidCursor"""
+        return paginate_by_cursor(
+            AccountStatementService.query(account_id, **filters), TransactionView,
+            size, cursor, descending=descending, include_total=include_total
+        )
+
+    @staticmethod
+    def serialize(views):
+        entries = statement_schema.dump([view.transaction for view in views])
+        for entry, view in zip(entries, views):
+            entry['direction'] = view.view_type
+        return entries
+
+    @staticmethod
+    def iter_views(account_id, batch_size=None, **filters):
+        """
+        Every statement row in chronological order, fetched in keyset batches.
+
+        Each batch is a fresh indexed range query, so an export of any length holds
+        neither a long-running cursor nor more than one batch in memory.
+        """
+        batch_size = batch_size or current_app.config['STATEMENT_EXPORT_BATCH_SIZE']
+        cursor = None
+        while True:
+            page = AccountStatementService.get_page(
+                account_id, batch_size, cursor, descending=False, **filters
+            )
+            yield from page.items
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+    @staticmethod
+    def export_row(view):
+        txn = view.transaction
+        return {
+            'created_at': view.created_at.isoformat(),
+            'transaction_id': str(txn.id),
+            'direction': view.view_type,
+            'type': txn.type,
+            'status': txn.status,
+            'amount': str(from_minor_units(txn.amount_minor, txn.currency_code)),
+            'fee': str(from_minor_units(txn.fee_minor, txn.currency_code)),
+            'currency_code': txn.currency_code,
+            'description': txn.description or ''
+        }
+
+    @staticmethod
+    def export(account_id, export_format, **filters):
+        """Generator of CSV (with a header line) or NDJSON lines for the whole statement"""
+        if export_format == 'ndjson':
+            for view in AccountStatementService.iter_views(account_id, **filters):
+                yield json.dumps(AccountStatementService.export_row(view)) + '\n'
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        for view in AccountStatementService.iter_views(account_id, **filters):
+            writer.writerow(AccountStatementService.export_row(view))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        # Header only, for an empty statement
+        if buffer.tell():
+            yield buffer.getvalue()
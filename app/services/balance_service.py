@@ -0,0 +1,219 @@
+import uuid
+import logging
+from sqlalchemy import update
+from sqlalchemy.orm.util import identity_key
+from app.models.account_model import Account
+from app.services.ledger_service import LedgerService
+from app.services.balance_summary_service import BalanceSummaryService
+from app.utils.money import to_minor_units, from_minor_units
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientFundsError(ValueError):
+    """Raised when a conditional debit matches no row because the balance is too low"""
+
+
+class BalanceService:
+    """
+    Central API for mutating Account.balance.
+
+    Every change is a single conditional UPDATE evaluated by the database, so
+    concurrent debits on the same account can never overdraw it or lose updates.
+    The integer balance_minor column is authoritative for the overdraft check;
+    the float balance column is moved in the same statement for API compatibility.
+    Each movement also appends a balanced journal to the ledger, using the
+    balance returned by the UPDATE as the posting's running balance.
+    Callers own the surrounding transaction and are responsible for committing.
+    """
+
+    @staticmethod
+    def _validate_amount(amount, currency):
+        if amount is None or amount <= 0:
+            raise ValueError("Amount must be positive")
+        minor = to_minor_units(amount, currency)
+        if minor <= 0:
+            raise ValueError("Amount is below the smallest currency unit")
+        return float(amount), minor
+
+    @staticmethod
+    def has_funds(account, amount):
+        """
+        Pre-check for flows that debit later: compares the authoritative balance_minor
+        in the account currency's minor units, never the drifting float balance.
+        """
+        return account.balance_minor >= to_minor_units(amount, account.currency_code)
+
+    @staticmethod
+    def _expire(account_id):
+        """Drop the cached balance of an Account already loaded in this session"""
+        key = identity_key(Account, uuid.UUID(str(account_id)))
+        account = db.session.identity_map.get(key)
+        if account is not None:
+            db.session.expire(account, ['balance', 'balance_minor', 'ledger_sequence'])
+
+    @staticmethod
+    def _apply(account_id, value, minor, currency, journal_id, description=None, message="Insufficient balance"):
+        """
+        Apply a signed movement to one account and append its posting:
+        UPDATE account SET balance_minor = balance_minor + :minor, ledger_sequence = ledger_sequence + 1
+        WHERE id = :id [AND balance_minor >= -:minor] RETURNING balance_minor, ledger_sequence
+        """
+        statement = update(Account).where(Account.id == account_id)
+        if minor < 0:
+            statement = statement.where(Account.balance_minor >= -minor)
+
+        row = db.session.execute(
+            statement
+            .values(
+                balance=Account.balance + value,
+                balance_minor=Account.balance_minor + minor,
+                ledger_sequence=Account.ledger_sequence + 1
+            )
+            .returning(Account.balance_minor, Account.ledger_sequence, Account.user_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        BalanceService._expire(account_id)
+
+        if row is None:
+            if minor < 0:
+                raise InsufficientFundsError(message)
+            raise ValueError("Account not found")
+
+        BalanceSummaryService.mark_dirty(row.user_id)
+        LedgerService.record_posting(
+            journal_id, account_id, minor, currency,
+            sequence=row.ledger_sequence,
+            balance_after_minor=row.balance_minor,
+            description=description
+        )
+
+    @staticmethod
+    def debit(account_id, amount, currency, message="Insufficient balance", description=None):
+        """
+        Atomically subtract amount from an account for money leaving the platform.
+        Returns the journal id.
+        """
+        value, minor = BalanceService._validate_amount(amount, currency)
+        journal_id = uuid.uuid4()
+        BalanceService._apply(account_id, -value, -minor, currency, journal_id, description, message)
+        LedgerService.record_external(journal_id, minor, currency, description)
+        return journal_id
+
+    @staticmethod
+    def credit(account_id, amount, currency, description=None):
+        """
+        Atomically add amount to an account for money entering the platform.
+        Returns the journal id.
+        """
+        value, minor = BalanceService._validate_amount(amount, currency)
+        journal_id = uuid.uuid4()
+        BalanceService._apply(account_id, value, minor, currency, journal_id, description)
+        LedgerService.record_external(journal_id, -minor, currency, description)
+        return journal_id
+
+    @staticmethod
+    def lock_accounts(account_ids):
+        """
+        SELECT ... FOR UPDATE the given accounts in primary-key order.
+
+        Locking in a stable order means two opposite transfers between the same
+        pair of accounts queue behind each other instead of deadlocking.
+        """
+        ordered_ids = sorted({uuid.UUID(str(account_id)) for account_id in account_ids}, key=str)
+        return (
+            Account.query
+            .filter(Account.id.in_(ordered_ids))
+            .order_by(Account.id)
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+
+    @staticmethod
+    def transfer(source_account_id, target_account_id, amount, currency, message="Insufficient balance for transfer", description=None):
+        """Move amount between two accounts inside the caller's transaction. Returns the journal id."""
+        if str(source_account_id) == str(target_account_id):
+            raise ValueError("Source and target accounts must differ")
+
+        locked = BalanceService.lock_accounts([source_account_id, target_account_id])
+        if len(locked) != 2:
+            raise ValueError("Account not found")
+
+        value, minor = BalanceService._validate_amount(amount, currency)
+        journal_id = uuid.uuid4()
+        BalanceService._apply(source_account_id, -value, -minor, currency, journal_id, description, message)
+        BalanceService._apply(target_account_id, value, minor, currency, journal_id, description)
+        logger.info(f"Moved {amount} from account {source_account_id} to {target_account_id}")
+        return journal_id
+
+    @staticmethod
+    def post_batch(locked_accounts, journals, message="Insufficient balance"):
+        """
+        Apply many journals against accounts already locked by lock_accounts().
+
+        ``journals`` is a list of dicts with journal_id, currency, description and
+        legs, a list of (account_id, amount_minor) pairs where account_id None is
+        the external contra account. Running balances are computed from the locked
+        rows, then every touched account is written with a single executemany
+        UPDATE and every posting with a single multi-row INSERT. Raises
+        InsufficientFundsError before writing anything if a leg would overdraw.
+        """
+        state = {
+            str(account.id): {
+                'id': account.id,
+                'user_id': account.user_id,
+                'currency_code': account.currency_code,
+                'balance_minor': account.balance_minor,
+                'ledger_sequence': account.ledger_sequence
+            }
+            for account in locked_accounts
+        }
+        touched = {}
+        postings = []
+
+        for journal in journals:
+            for account_id, minor in journal['legs']:
+                posting = {
+                    'journal_id': journal['journal_id'],
+                    'account_id': None,
+                    'amount_minor': minor,
+                    'currency': journal['currency'],
+                    'description': journal.get('description')
+                }
+                if account_id is not None:
+                    row = state.get(str(account_id))
+                    if row is None:
+                        raise ValueError("Account must be locked before posting")
+                    if row['balance_minor'] + minor < 0:
+                        raise InsufficientFundsError(message)
+                    row['balance_minor'] += minor
+                    row['ledger_sequence'] += 1
+                    touched[str(account_id)] = row
+                    posting.update(
+                        account_id=row['id'],
+                        sequence=row['ledger_sequence'],
+                        balance_after_minor=row['balance_minor']
+                    )
+                postings.append(posting)
+
+        if touched:
+            db.session.execute(
+                update(Account),
+                [
+                    {
+                        'id': row['id'],
+                        'balance_minor': row['balance_minor'],
+                        'balance': float(from_minor_units(row['balance_minor'], row['currency_code'])),
+                        'ledger_sequence': row['ledger_sequence']
+                    }
+                    for row in touched.values()
+                ]
+            )
+            for account_id in touched:
+                BalanceService._expire(account_id)
+            BalanceSummaryService.mark_dirty(*{row['user_id'] for row in touched.values()})
+
+        LedgerService.record_postings(postings)
+        logger.info(f"Posted {len(journals)} journals across {len(touched)} accounts")
@@ -0,0 +1,148 @@
+import logging
+import threading
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import event, func, case
+from sqlalchemy.orm import Session
+from app.models.account_model import Account
+from app.models.user_model import User
+from app.utils.money import from_minor_units, quantize_amount
+from app.utils.xconverter import fetch_exchange_rates
+from app.utils.ttl_cache import TTLCache
+from app.config import Config
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting users whose balances changed in the open transaction
+_DIRTY_USERS_KEY = 'balance_summary_dirty_users'
+
+
+class _Flight:
+    """One user's summary computation; concurrent readers of that user share it"""
+
+    __slots__ = ('lock', 'readers', 'version')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.readers = 0
+        self.version = 0  # bumped by invalidate(), so a summary computed across a write is not cached
+
+
+class BalanceSummaryService:
+    """
+    Service class for the per-user balance aggregate served by GET /balances.
+
+    Summaries are cached in-process for BALANCE_SUMMARY_CACHE_SECONDS (at most
+    BALANCE_SUMMARY_CACHE_SIZE users). Balance mutations mark the owning user dirty
+    on the session and the cached summary is dropped when that transaction commits.
+    Concurrent misses for the same user are coalesced so only one request computes
+    the summary; that bookkeeping only exists while a computation is running.
+    """
+
+    _cache = TTLCache(maxsize=Config.BALANCE_SUMMARY_CACHE_SIZE)  # user_id -> summary
+    _flights = {}  # user_id -> _Flight, while the summary is being computed
+    _guard = threading.Lock()
+
+    @staticmethod
+    def get_summary(user_id):
+        """Return {'balances': {currency: Decimal}, 'currency': default currency, 'total': Decimal} or None"""
+        user_key = str(user_id)
+        summary = BalanceSummaryService._cache.get(user_key)
+        if summary is not None:
+            return summary
+
+        with BalanceSummaryService._guard:
+            flight = BalanceSummaryService._flights.get(user_key)
+            if flight is None:
+                flight = BalanceSummaryService._flights[user_key] = _Flight()
+            flight.readers += 1
+
+        try:
+            with flight.lock:
+                # Another request may have filled the cache while we waited
+                summary = BalanceSummaryService._cache.get(user_key)
+                if summary is not None:
+                    return summary
+
+                version = flight.version
+                summary = BalanceSummaryService._compute(user_id)
+                if summary is not None:
+                    ttl = current_app.config.get('BALANCE_SUMMARY_CACHE_SECONDS', 30)
+                    with BalanceSummaryService._guard:
+                        if flight.version == version:
+                            BalanceSummaryService._cache.set(user_key, summary, ttl)
+                return summary
+        finally:
+            with BalanceSummaryService._guard:
+                flight.readers -= 1
+                if flight.readers == 0:
+                    del BalanceSummaryService._flights[user_key]
+
+    @staticmethod
+    def invalidate(*user_ids):
+        """Drop cached summaries immediately"""
+        with BalanceSummaryService._guard:
+            for user_id in user_ids:
+                user_key = str(user_id)
+                BalanceSummaryService._cache.invalidate(user_key)
+                flight = BalanceSummaryService._flights.get(user_key)
+                if flight is not None:
+                    flight.version += 1
+
+    @staticmethod
+    def mark_dirty(*user_ids):
+        """Invalidate the users' summaries once the current transaction commits"""
+        db.session.info.setdefault(_DIRTY_USERS_KEY, set()).update(str(user_id) for user_id in user_ids)
+
+    @staticmethod
+    def _compute(user_id):
+        """One grouped query for the per-currency totals plus one rate-table lookup"""
+        rows = db.session.query(
+            Account.currency_code,
+            func.sum(Account.balance_minor),
+            func.max(case((Account.is_default == True, 1), else_=0))
+        ).filter(Account.user_id == user_id).group_by(Account.currency_code).all()
+
+        if not rows and db.session.get(User, user_id) is None:
+            return None
+
+        balances = {}
+        default_currency = None
+        for currency_code, balance_minor, has_default in rows:
+            balances[currency_code] = from_minor_units(balance_minor or 0, currency_code)
+            if has_default:
+                default_currency = currency_code
+
+        total = None
+        if default_currency:
+            total = Decimal(0)
+            rates = None
+            if any(currency != default_currency for currency in balances):
+                rates = fetch_exchange_rates(default_currency)
+            for currency, balance in balances.items():
+                if currency == default_currency:
+                    total += balance
+                    continue
+                # Rates are quoted per 1 unit of the default currency
+                rate = rates.get(currency) if rates else None
+                if rate:
+                    total += balance / Decimal(str(rate))
+                else:
+                    logger.warning(f"Could not get exchange rate for {currency} to {default_currency}")
+            total = quantize_amount(total, default_currency)
+
+        return {'balances': balances, 'currency': default_currency, 'total': total}
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_balances(session):
+    user_ids = session.info.pop(_DIRTY_USERS_KEY, None)
+    if user_ids:
+        BalanceSummaryService.invalidate(*user_ids)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_balances(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_DIRTY_USERS_KEY, None)
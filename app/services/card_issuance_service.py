@@ -0,0 +1,126 @@
+import uuid
+import logging
+from flask import current_app
+from app.models.account_model import Account
+from app.models.virtual_cards_model import VirtualCard
+from app.services.job_service import JobService
+from app.services.notification_service import NotificationService
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+CARD_TYPES = ('debit', 'credit')
+CARD_KINDS = ('virtual', 'physical')
+
+
+class CardIssuanceService:
+    """Service class for issuing virtual cards in bulk"""
+
+    JOB_TYPE = 'card_issuance'
+
+    @staticmethod
+    def validate_cards(user, cards):
+        """
+        Validate and normalize a bulk issuance request up front, with one account query.
+
+        Returns (normalized cards, errors by item index); cards are only issued when
+        there are no errors.
+        """
+        account_ids = set()
+        for card in cards:
+            try:
+                account_ids.add(str(uuid.UUID(str(card.get('account_id')))))
+            except (AttributeError, ValueError):
+                continue
+        owned = set()
+        if account_ids:
+            owned = {
+                str(account_id) for (account_id,) in db.session.query(Account.id).filter(
+                    Account.id.in_(account_ids), Account.user_id == user.id
+                )
+            }
+
+        normalized = []
+        errors = {}
+        for index, card in enumerate(cards):
+            if not isinstance(card, dict):
+                errors[index] = "Card must be an object"
+                continue
+
+            try:
+                account_id = str(uuid.UUID(str(card.get('account_id'))))
+            except ValueError:
+                account_id = None
+            card_type = card.get('card_type', 'debit')
+            card_kind = card.get('card_kind', 'virtual')
+            card_holder = (card.get('card_holder') or user.name or '').strip()
+            spending_limit = card.get('spending_limit')
+
+            if not account_id:
+                errors[index] = "A valid account_id is required"
+            elif account_id not in owned:
+                errors[index] = "Account not found or not owned by you"
+            elif card_type not in CARD_TYPES:
+                errors[index] = f"card_type must be one of {', '.join(CARD_TYPES)}"
+            elif card_kind not in CARD_KINDS:
+                errors[index] = f"card_kind must be one of {', '.join(CARD_KINDS)}"
+            elif not card_holder or len(card_holder) > 180 or not all(
+                char.isalpha() or char.isspace() or char in ['-', "'"] for char in card_holder
+            ):
+                errors[index] = "Card holder name can only contain letters, spaces, hyphens, and apostrophes"
+            elif spending_limit is not None and (
+                isinstance(spending_limit, bool) or not isinstance(spending_limit, (int, float)) or spending_limit < 0
+            ):
+                errors[index] = "Spending limit must be a non-negative number"
+            else:
+                normalized.append({
+                    'account_id': account_id,
+                    'card_type': card_type,
+                    'card_kind': card_kind,
+                    'card_holder': card_holder,
+                    'spending_limit': spending_limit
+                })
+
+        return normalized, errors
+
+    @staticmethod
+    def enqueue(user_id, cards):
+        """Start a bulk issuance job for already validated cards"""
+        return JobService.enqueue(
+            CardIssuanceService.JOB_TYPE,
+            user_id=user_id,
+            payload={'cards': cards},
+            total=len(cards)
+        )
+
+    @staticmethod
+    def run(job):
+        """
+        Issue the job's cards chunk by chunk: each chunk is one bulk insert committed
+        together with the job's progress, and the owner gets a single notification at
+        the end instead of one per card.
+        """
+        cards = job.payload['cards']
+        chunk_size = current_app.config['BULK_CARD_ISSUANCE_CHUNK_SIZE']
+        card_ids = []
+
+        for start in range(0, len(cards), chunk_size):
+            chunk = [dict(card, user_id=job.user_id) for card in cards[start:start + chunk_size]]
+            issued = VirtualCard.issue_cards(chunk, chunk_size=chunk_size)
+            card_ids.extend(str(card['id']) for card in issued)
+            JobService.report_progress(job, processed=len(chunk), succeeded=len(issued))
+            db.session.commit()
+            JobService.raise_if_cancelled(job)
+
+        NotificationService.create_notification(
+            user_id=job.user_id,
+            title="Cards issued",
+            message=f"{len(card_ids)} new {'card was' if len(card_ids) == 1 else 'cards were'} issued for your team.",
+            category='account',
+            priority='medium',
+            metadata={"job_id": str(job.id), "cards_issued": len(card_ids)}
+        )
+        return {'card_ids': card_ids}
+
+
+JobService.register(CardIssuanceService.JOB_TYPE)(CardIssuanceService.run)
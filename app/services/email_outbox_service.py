@@ -0,0 +1,342 @@
+import time
+import uuid
+import random
+import logging
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from flask_mail import Message
+from sqlalchemy import event, select, update, insert, func, or_, and_, bindparam
+from sqlalchemy.orm import Session
+from app.models.outbound_email_model import OutboundEmail
+from app.extensions import db, mail
+from app.utils.background import start_with_app
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the SMTP connection cannot be reused (other SMTP errors are per message)
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+# Session.info flag: emails were queued in the current transaction
+_QUEUED_KEY = 'email_outbox_queued'
+
+
+class EmailOutboxService:
+    """Service class for the durable outbound email queue"""
+
+    @staticmethod
+    def enqueue(to, subject, html=None, body=None, sender=None):
+        """Queue one email; see enqueue_many"""
+        return EmailOutboxService.enqueue_many([{
+            'to': to, 'subject': subject, 'html': html, 'body': body, 'sender': sender
+        }])
+
+    @staticmethod
+    def enqueue_many(messages):
+        """
+        Queue emails with one multi-row INSERT in the caller's session.
+
+        The rows commit or roll back with the caller's unit of work, so an email is
+        never sent for a change that did not happen; the sender is woken after the
+        commit. The caller commits. Returns the number queued.
+        """
+        if not messages:
+            return 0
+
+        now = datetime.utcnow()
+        default_sender = current_app.config.get('MAIL_DEFAULT_SENDER')
+        rows = [{
+            'id': uuid.uuid4(),
+            'recipients': [message['to']] if isinstance(message['to'], str) else list(message['to']),
+            'sender': message.get('sender') or default_sender,
+            'subject': message['subject'],
+            'html': message.get('html'),
+            'body': message.get('body'),
+            'status': 'pending',
+            'attempts': 0,
+            'next_attempt_at': now,
+            'created_at': now
+        } for message in messages]
+
+        db.session.execute(insert(OutboundEmail), rows)
+        db.session.info[_QUEUED_KEY] = True
+        return len(rows)
+
+    @staticmethod
+    def claim_batch(limit):
+        """Claim up to ``limit`` due emails for this sender; safe with several senders polling"""
+        now = datetime.utcnow()
+        due = or_(
+            and_(OutboundEmail.status == 'pending', OutboundEmail.next_attempt_at <= now),
+            and_(OutboundEmail.status == 'sending', OutboundEmail.locked_until < now)
+        )
+
+        ids = db.session.execute(
+            select(OutboundEmail.id).where(due).order_by(OutboundEmail.next_attempt_at).limit(limit)
+        ).scalars().all()
+        if not ids:
+            return []
+
+        token = uuid.uuid4().hex
+        lock_seconds = current_app.config['EMAIL_OUTBOX_LOCK_SECONDS']
+        db.session.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.id.in_(ids), due)
+            .values(
+                status='sending',
+                claim_token=token,
+                locked_until=now + timedelta(seconds=lock_seconds),
+                attempts=OutboundEmail.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return OutboundEmail.query.filter_by(claim_token=token).all()
+
+    @staticmethod
+    def record_results(sent, failures):
+        """Mark delivered emails sent and reschedule failures ({OutboundEmail: error}) with backoff"""
+        now = datetime.utcnow()
+        config = current_app.config
+        max_attempts = config['EMAIL_OUTBOX_MAX_ATTEMPTS']
+        dead = 0
+
+        if sent:
+            db.session.execute(
+                update(OutboundEmail)
+                .where(OutboundEmail.id.in_([email.id for email in sent]))
+                .values(status='sent', sent_at=now, claim_token=None, locked_until=None, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+
+        if failures:
+            params = []
+            for email, error in failures.items():
+                if email.attempts >= max_attempts:
+                    status = 'failed'
+                    dead += 1
+                    logger.error(f"Giving up on email {email.id} after {email.attempts} attempts: {error}")
+                else:
+                    status = 'pending'
+                params.append({
+                    '_id': email.id,
+                    'status': status,
+                    'next_attempt_at': now + timedelta(seconds=EmailOutboxService.backoff(email.attempts)),
+                    'last_error': str(error)[:1000]
+                })
+            db.session.execute(
+                update(OutboundEmail.__table__)
+                .where(OutboundEmail.__table__.c.id == bindparam('_id'))
+                .values(claim_token=None, locked_until=None),
+                params
+            )
+
+        db.session.commit()
+        return dead
+
+    @staticmethod
+    def backoff(attempts):
+        """Seconds before retry number ``attempts``: exponential with 10% jitter, capped"""
+        config = current_app.config
+        delay = min(config['EMAIL_OUTBOX_RETRY_BASE_SECONDS'] * (2 ** max(attempts - 1, 0)),
+                    config['EMAIL_OUTBOX_RETRY_MAX_SECONDS'])
+        return delay * (1 + random.random() * 0.1)
+
+    @staticmethod
+    def purge_sent(days=7):
+        """Delete sent emails older than ``days``"""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        deleted = OutboundEmail.query.filter(
+            OutboundEmail.status == 'sent', OutboundEmail.sent_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    @staticmethod
+    def get_stats():
+        """Queue depth by status, age of the oldest due email, and this process's sender metrics"""
+        counts = dict(
+            db.session.query(OutboundEmail.status, func.count(OutboundEmail.id)).group_by(OutboundEmail.status).all()
+        )
+        oldest = db.session.query(func.min(OutboundEmail.next_attempt_at)).filter(
+            OutboundEmail.status == 'pending', OutboundEmail.next_attempt_at <= datetime.utcnow()
+        ).scalar()
+        return {
+            'queue': {status: counts.get(status, 0) for status in ('pending', 'sending', 'sent', 'failed')},
+            'oldest_due_seconds': int((datetime.utcnow() - oldest).total_seconds()) if oldest else 0,
+            'sender': email_sender.metrics()
+        }
+
+
+class EmailSender:
+    """
+    Drains the email outbox in the background.
+
+    Due emails are claimed in batches of EMAIL_OUTBOX_BATCH_SIZE and sent through a
+    single SMTP connection (mail.connect()) that stays open until the queue is empty,
+    instead of a connect/login/quit per message; MAIL_MAX_EMAILS bounds how many
+    messages go over one connection before Flask-Mail reconnects. A broken
+    connection is reopened for the rest of the batch.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._metrics = {
+            'sent': 0,
+            'failed_attempts': 0,
+            'dead': 0,
+            'batches': 0,
+            'connections_opened': 0,
+            'last_batch_seconds': None,
+            'last_error': None
+        }
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['email_sender'] = self
+        # Drain whatever a previous process left pending (and its retries) without waiting for a new email
+        start_with_app(app, self.start)
+
+    def start(self, app):
+        if app.config.get('EMAIL_OUTBOX_BACKGROUND', True):
+            self._ensure_thread(app)
+
+    def notify(self):
+        """Wake the sender (starting it if needed) after emails were queued"""
+        if not current_app.config.get('EMAIL_OUTBOX_BACKGROUND', True):
+            return
+        self._ensure_thread(current_app._get_current_object())
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._metrics)
+
+    def drain(self, max_batches=None):
+        """Send due emails until none are left (or max_batches ran); returns the number delivered"""
+        batch_size = current_app.config['EMAIL_OUTBOX_BATCH_SIZE']
+        delivered = 0
+        batches = 0
+        connection = None
+        try:
+            while max_batches is None or batches < max_batches:
+                batch = EmailOutboxService.claim_batch(batch_size)
+                if not batch:
+                    break
+                batches += 1
+                connection, sent = self._deliver(batch, connection)
+                delivered += sent
+        finally:
+            self._close(connection)
+        return delivered
+
+    def _deliver(self, batch, connection):
+        started = time.monotonic()
+        sent = []
+        failures = {}
+
+        for index, email in enumerate(batch):
+            if connection is None:
+                try:
+                    connection = self._open()
+                except Exception as e:
+                    # SMTP server unreachable: reschedule the rest of the batch
+                    logger.error(f"Could not connect to the mail server: {str(e)}")
+                    failures.update({pending: e for pending in batch[index:]})
+                    break
+            try:
+                connection.send(Message(
+                    subject=email.subject,
+                    recipients=email.recipients,
+                    sender=email.sender,
+                    html=email.html,
+                    body=email.body
+                ))
+                sent.append(email)
+            except CONNECTION_ERRORS as e:
+                # The connection is unusable; retry this email later and reconnect for the next one
+                failures[email] = e
+                self._close(connection, quit=False)
+                connection = None
+            except Exception as e:
+                failures[email] = e
+
+        dead = EmailOutboxService.record_results(sent, failures)
+
+        with self._lock:
+            self._metrics['sent'] += len(sent)
+            self._metrics['failed_attempts'] += len(failures)
+            self._metrics['dead'] += dead
+            self._metrics['batches'] += 1
+            self._metrics['last_batch_seconds'] = round(time.monotonic() - started, 3)
+            if failures:
+                self._metrics['last_error'] = str(next(iter(failures.values())))
+        logger.info(f"Email outbox batch: {len(sent)} sent, {len(failures)} failed")
+        return connection, len(sent)
+
+    def _open(self):
+        connection = mail.connect()
+        connection.__enter__()
+        with self._lock:
+            self._metrics['connections_opened'] += 1
+        return connection
+
+    @staticmethod
+    def _close(connection, quit=True):
+        if connection is None or not getattr(connection, 'host', None):
+            return
+        try:
+            if quit:
+                connection.host.quit()
+            else:
+                connection.host.close()
+        except Exception:
+            pass
+
+    def _ensure_thread(self, app):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, args=(app,), name='email-sender', daemon=True)
+                self._thread.start()
+
+    def _run(self, app):
+        with app.app_context():
+            poll_seconds = app.config['EMAIL_OUTBOX_POLL_SECONDS']
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    self.drain()
+                except Exception as e:
+                    logger.error(f"Email outbox sender failed: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                # Retries come due on their own; poll for them between wake-ups
+                self._wake.wait(poll_seconds)
+
+
+email_sender = EmailSender()
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_committed_emails(session):
+    if session.info.pop(_QUEUED_KEY, None) and has_app_context():
+        email_sender.notify()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_emails(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_QUEUED_KEY, None)
@@ -1,6 +1,6 @@
-from flask import current_app, render_template_string
-from flask_mail import Message
-from app.extensions import mail
+from flask import current_app
+from app.services.email_outbox_service import EmailOutboxService
+from app.utils.email_templates import email_templates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,7 +10,13 @@ class EmailService:
     
     @staticmethod
     def send_email(to, subject, template=None, **kwargs):
-        """Send email with template"""
+        """
+        Render a registered email template (see app.utils.email_templates) and queue it in the outbox.
+
+        Delivery happens in the background sender (EmailSender), so the request only
+        pays for one INSERT; True means the email was queued, not that it was delivered.
+        The email is part of the caller's transaction and goes out once it commits.
+        """
         try:
             if not current_app.config.get('MAIL_SERVER'):
                 logger.warning("Mail server not configured. Email not sent.")
@@ -20,56 +26,97 @@ class EmailService:
                 logger.info(f"Email suppressed: {subject} to {to}")
                 return True
             
-            msg = Message(
-                subject=subject,
-                recipients=[to] if isinstance(to, str) else to,
-                sender=current_app.config.get('MAIL_DEFAULT_SENDER')
-            )
-            
+            html = body = None
             if template:
-                msg.html = render_template_string(template, **kwargs)
+                html = email_templates.render(template, **kwargs)
             else:
-                msg.body = kwargs.get('body', '')
-            
-            mail.send(msg)
-            logger.info(f"Email sent successfully: {subject} to {to}")
+                body = kwargs.get('body', '')
+
+            EmailOutboxService.enqueue(to=to, subject=subject, html=html, body=body)
+            logger.info(f"Email queued: {subject} to {to}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email: {str(e)}")
+            logger.error(f"Failed to queue email: {str(e)}")
             return False
+
+    @staticmethod
+    def send_bulk(template, messages):
+        """
+        Render one template for many recipients and queue them with a single insert.
+
+        ``messages`` is a list of dicts with 'to', 'subject' and 'context'. Returns the
+        number of emails queued (0 when mail is not configured).
+        """
+        if not messages:
+            return 0
+        try:
+            if not current_app.config.get('MAIL_SERVER'):
+                logger.warning("Mail server not configured. Emails not sent.")
+                return 0
+
+            if current_app.config.get('MAIL_SUPPRESS_SEND'):
+                logger.info(f"{len(messages)} email(s) suppressed")
+                return len(messages)
+
+            bodies = email_templates.render_many(template, [message['context'] for message in messages])
+            queued = EmailOutboxService.enqueue_many([
+                {'to': message['to'], 'subject': message['subject'], 'html': html}
+                for message, html in zip(messages, bodies)
+            ])
+            logger.info(f"Queued {queued} '{template}' email(s)")
+            return queued
+
+        except Exception as e:
+            logger.error(f"Failed to queue bulk email: {str(e)}")
+            return 0
     
+    @staticmethod
+    def notification_email(category, user_email, user_name, title, message, dashboard_url=None):
+        """
+        Template name and outbox message for a notification email, using the same
+        per-category templates as NotificationService._send_notification_email.
+        """
+        from datetime import datetime
+
+        if category == 'security':
+            return 'security_alert', {
+                'to': user_email,
+                'subject': f"Security Alert - {title.title()} - Swipe Payment",
+                'context': {
+                    'user_name': user_name,
+                    'alert_type': title,
+                    'details': message,
+                    'alert_time': datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+                }
+            }
+        if category == 'transaction':
+            return 'transaction_update', {
+                'to': user_email,
+                'subject': f"Transaction Update - {title} - Swipe Payment",
+                'context': {
+                    'user_name': user_name,
+                    'title': title,
+                    'message': message,
+                    'dashboard_url': dashboard_url
+                }
+            }
+        return 'system_notification', {
+            'to': user_email,
+            'subject': f"System Notification - {title} - Swipe Payment",
+            'context': {
+                'user_name': user_name,
+                'title': title,
+                'message': message,
+                'category': category
+            }
+        }
+
     @staticmethod
     def send_verification_email(user_email, user_name, verification_token):
         """Send email verification email"""
         subject = "Verify Your Email - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #007bff; text-align: center;">Email Verification Required</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>Welcome to Swipe Payment! Please verify your email address to activate your account.</p>
-                <p>Click the button below to verify your email:</p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{{ verification_url }}" style="background-color: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; font-weight: bold;">Verify Email Address</a>
-                </div>
-                <p>Or copy and paste this link in your browser:</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; font-family: monospace; font-size: 12px; word-break: break-all; margin: 20px 0;">
-                    {{ verification_url }}
-                </div>
-                <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Important:</strong> This verification link will expire in 24 hours for security reasons.
-                </div>
-                <p>If you did not create an account with Swipe Payment, please ignore this email.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'verify_email'
 
         from flask import url_for
         verification_url = url_for('auth.verify_email', token=verification_token, _external=True)
@@ -85,27 +132,7 @@ class EmailService:
     @staticmethod
     def send_password_reset_email(user_email, reset_token):
         subject = "Password Reset - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #333; text-align: center;">Password Reset Request</h2>
-                <p>Hello,</p>
-                <p>You have requested to reset your password for your Swipe Payment account.</p>
-                <p>Your password reset token is:</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; font-family: monospace; font-size: 16px; text-align: center; margin: 20px 0;">
-                    {{ reset_token }}
-                </div>
-                <p><strong>This token will expire in 1 hour.</strong></p>
-                <p>If you did not request this password reset, please ignore this email.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'password_reset'
         
         return EmailService.send_email(
             to=user_email,
@@ -118,30 +145,7 @@ class EmailService:
     def send_2fa_setup_email(user_email, user_name):
         """Send 2FA setup confirmation email"""
         subject = "Two-Factor Authentication Enabled - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #28a745; text-align: center;">🔐 Two-Factor Authentication Enabled</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>Two-factor authentication has been successfully enabled for your Swipe Payment account.</p>
-                <div style="background-color: #d4edda; border: 1px solid #c3e6cb; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Your account is now more secure!</strong>
-                    <ul style="margin: 10px 0;">
-                        <li>You'll need your authenticator app to log in</li>
-                        <li>Keep your backup codes in a safe place</li>
-                        <li>You can disable 2FA anytime in your account settings</li>
-                    </ul>
-                </div>
-                <p>If you did not enable 2FA, please contact support immediately.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'two_factor_enabled'
         
         return EmailService.send_email(
             to=user_email,
@@ -154,34 +158,7 @@ class EmailService:
     def send_login_notification_email(user_email, user_name, ip_address, location="Unknown"):
         """Send login notification email"""
         subject = "New Login to Your Account - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #333; text-align: center;">New Login Detected</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>We detected a new login to your Swipe Payment account:</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Login Details:</strong><br>
-                    <strong>IP Address:</strong> {{ ip_address }}<br>
-                    <strong>Location:</strong> {{ location }}<br>
-                    <strong>Time:</strong> {{ login_time }}
-                </div>
-                <p>If this was you, no action is needed.</p>
-                <p><strong>If this wasn't you:</strong></p>
-                <ul>
-                    <li>Change your password immediately</li>
-                    <li>Enable two-factor authentication</li>
-                    <li>Contact our support team</li>
-                </ul>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'login_notification'
         
         from datetime import datetime
         return EmailService.send_email(
@@ -198,29 +175,7 @@ class EmailService:
     def send_transaction_notification_email(user_email, user_name, transaction_type, amount, currency):
         """Send transaction notification email"""
         subject = f"Transaction Notification - {transaction_type.title()} - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #333; text-align: center;">Transaction Notification</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>A {{ transaction_type }} transaction has been processed on your account:</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Transaction Details:</strong><br>
-                    <strong>Type:</strong> {{ transaction_type.title() }}<br>
-                    <strong>Amount:</strong> {{ amount }} {{ currency }}<br>
-                    <strong>Time:</strong> {{ transaction_time }}
-                </div>
-                <p>You can view all your transactions in your account dashboard.</p>
-                <p>If you have any questions about this transaction, please contact our support team.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'transaction_notification'
         
         from datetime import datetime
         return EmailService.send_email(
@@ -238,34 +193,7 @@ class EmailService:
     def send_welcome_email(user_email, user_name):
         """Send welcome email to new users"""
         subject = "Welcome to Swipe Payment!"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #007bff; text-align: center;">Welcome to Swipe Payment!</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>Welcome to Swipe Payment! Your account has been created successfully.</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <h3 style="margin-top: 0; color: #007bff;">What's Next?</h3>
-                    <ul>
-                        <li>Complete your profile information</li>
-                        <li>Set up two-factor authentication for security</li>
-                        <li>Add payment methods to start transacting</li>
-                        <li>Explore our API documentation</li>
-                    </ul>
-                </div>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{{ dashboard_url }}" style="background-color: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; font-weight: bold;">Go to Dashboard</a>
-                </div>
-                <p>If you have any questions, feel free to contact our support team.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'welcome'
 
         from flask import url_for
         dashboard_url = url_for('dashboard.index', _external=True)
@@ -282,37 +210,7 @@ class EmailService:
     def send_security_alert_email(user_email, user_name, alert_type, details):
         """Send security alert email"""
         subject = f"Security Alert - {alert_type.title()} - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #dc3545; text-align: center;">🚨 Security Alert</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>We detected suspicious activity on your Swipe Payment account:</p>
-                <div style="background-color: #f8d7da; border: 1px solid #f5c6cb; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Alert Details:</strong><br>
-                    <strong>Type:</strong> {{ alert_type }}<br>
-                    <strong>Details:</strong> {{ details }}<br>
-                    <strong>Time:</strong> {{ alert_time }}
-                </div>
-                <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>Immediate Actions Required:</strong>
-                    <ul style="margin: 10px 0;">
-                        <li>Review your recent account activity</li>
-                        <li>Change your password if you suspect unauthorized access</li>
-                        <li>Enable two-factor authentication</li>
-                        <li>Contact support if this wasn't you</li>
-                    </ul>
-                </div>
-                <p>This alert was sent because we take your account security seriously.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated security alert from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'security_alert'
 
         from datetime import datetime
         return EmailService.send_email(
@@ -329,24 +227,7 @@ class EmailService:
     def send_system_notification_email(user_email, user_name, title, message, category):
         """Send system notification email"""
         subject = f"System Notification - {title} - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #007bff; text-align: center;">{{ title }}</h2>
-                <p>Hello {{ user_name }},</p>
-                <div style="background-color: #e9ecef; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    {{ message }}
-                </div>
-                <p>If you have any questions about this notification, please contact our support team.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'system_notification'
 
         return EmailService.send_email(
             to=user_email,
@@ -362,29 +243,7 @@ class EmailService:
     def send_transaction_email(user_email, user_name, title, message):
         """Send transaction notification email"""
         subject = f"Transaction Update - {title} - Swipe Payment"
-        template = """
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-                <h2 style="color: #28a745; text-align: center;">💳 Transaction Update</h2>
-                <p>Hello {{ user_name }},</p>
-                <div style="background-color: #d4edda; padding: 15px; border-radius: 4px; margin: 20px 0;">
-                    <strong>{{ title }}</strong><br><br>
-                    {{ message }}
-                </div>
-                <p>You can view all your transactions in your account dashboard.</p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{{ dashboard_url }}" style="background-color: #28a745; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; font-weight: bold;">View Transactions</a>
-                </div>
-                <p>If you have any questions about this transaction, please contact our support team.</p>
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                <p style="color: #6c757d; font-size: 12px;">
-                    This is an automated message from Swipe Payment. Please do not reply to this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        template = 'transaction_update'
 
         from flask import url_for
         dashboard_url = url_for('dashboard.transactions', _external=True)
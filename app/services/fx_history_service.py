@@ -0,0 +1,150 @@
+import math
+import logging
+from array import array
+from datetime import datetime, date, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app.models.fx_rate_model import FxRateHistory
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def _to_day(ts):
+    return ts.date() if isinstance(ts, datetime) else ts
+
+
+class RateSeries:
+    """
+    Columnar in-memory FX history for offline batch conversion.
+
+    Holds one array('d') per currency indexed by days since ``start``; days without
+    a fetch carry the previous day's rates forward. rate_at() is two array reads,
+    so reporting jobs can convert millions of historic rows without touching the
+    database or the provider.
+    """
+
+    def __init__(self, start, end, rows):
+        self.start = start
+        self.end = end
+        self.days = (end - start).days + 1
+        self.columns = {}
+
+        rows = sorted(rows, key=lambda row: row.day)
+        currencies = {currency for row in rows for currency in row.rates}
+        for currency in currencies:
+            self.columns[currency] = array('d', [math.nan]) * self.days
+
+        position = 0
+        current = None
+        for offset in range(self.days):
+            day = start + timedelta(days=offset)
+            while position < len(rows) and rows[position].day <= day:
+                current = rows[position].rates
+                position += 1
+            if current is None:
+                continue
+            for currency, rate in current.items():
+                self.columns[currency][offset] = rate
+
+    def rate_at(self, from_currency, to_currency, ts):
+        """Units of to_currency per 1 unit of from_currency on the day of ts, or None if unknown"""
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        if from_curr == to_curr:
+            return 1.0
+
+        offset = (_to_day(ts) - self.start).days
+        if offset < 0:
+            return None
+        offset = min(offset, self.days - 1)
+
+        from_column = self.columns.get(from_curr)
+        to_column = self.columns.get(to_curr)
+        if from_column is None or to_column is None:
+            return None
+        from_rate = from_column[offset]
+        to_rate = to_column[offset]
+        if math.isnan(from_rate) or math.isnan(to_rate) or from_rate == 0:
+            return None
+        return to_rate / from_rate
+
+
+class FxHistoryService:
+    """Service class for the daily FX rate history"""
+
+    @staticmethod
+    def record_snapshot(snapshot):
+        """Store a rate-store snapshot as the row for its UTC day (the last fetch of a day wins)"""
+        fetched_at = datetime.utcfromtimestamp(snapshot['fetched_at'])
+        base_currency = snapshot['base'].upper()
+        day = fetched_at.date()
+
+        for _ in range(2):
+            row = FxRateHistory.query.filter_by(base_currency=base_currency, day=day).first()
+            if row is None:
+                row = FxRateHistory(base_currency=base_currency, day=day)
+                db.session.add(row)
+            row.rates = snapshot['rates']
+            row.fetched_at = fetched_at
+            try:
+                db.session.commit()
+                return row
+            except IntegrityError:
+                # Another process inserted the day's row first; update it instead
+                db.session.rollback()
+        logger.warning(f"Could not record FX history for {base_currency} on {day}")
+        return None
+
+    @staticmethod
+    def rate_at(from_currency, to_currency, ts):
+        """Units of to_currency per 1 unit of from_currency as recorded for the day of ts (or the last day before it)"""
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        if from_curr == to_curr:
+            return 1.0
+
+        row = FxRateHistory.query.filter(
+            FxRateHistory.base_currency == current_app.config['FX_RATE_FETCH_BASE'],
+            FxRateHistory.day <= _to_day(ts)
+        ).order_by(FxRateHistory.day.desc()).first()
+        if row is None:
+            return None
+
+        from_rate = row.rates.get(from_curr)
+        to_rate = row.rates.get(to_curr)
+        if not from_rate or to_rate is None:
+            return None
+        return to_rate / from_rate
+
+    @staticmethod
+    def load_series(start, end=None):
+        """Load the history between two days into a RateSeries with one query"""
+        start = _to_day(start)
+        end = _to_day(end) if end else date.today()
+        base_currency = current_app.config['FX_RATE_FETCH_BASE']
+
+        rows = FxRateHistory.query.filter(
+            FxRateHistory.base_currency == base_currency,
+            FxRateHistory.day >= start,
+            FxRateHistory.day <= end
+        ).all()
+
+        # Carry the last known rates into the start of the window
+        previous = FxRateHistory.query.filter(
+            FxRateHistory.base_currency == base_currency,
+            FxRateHistory.day < start
+        ).order_by(FxRateHistory.day.desc()).first()
+        if previous is not None:
+            rows.append(previous)
+
+        return RateSeries(start, end, rows)
+
+    @staticmethod
+    def init_app(app, rate_store):
+        """Record every snapshot the rate store fetches from the provider"""
+        def record(snapshot):
+            with app.app_context():
+                FxHistoryService.record_snapshot(snapshot)
+
+        rate_store.on_refresh(record)
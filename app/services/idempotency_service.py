@@ -0,0 +1,183 @@
+import json
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import insert, update, delete, or_
+from sqlalchemy.exc import IntegrityError
+from app.models.idempotency_model import IdempotencyKey
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyService:
+    """Service class for the Idempotency-Key request store"""
+
+    # Outcomes of begin()
+    PROCEED = 'proceed'
+    REPLAY = 'replay'
+    IN_PROGRESS = 'in_progress'
+    MISMATCH = 'mismatch'
+
+    @staticmethod
+    def fingerprint(method, path, payload):
+        """Hash the parts of a request that must match for a key to be replayed"""
+        if isinstance(payload, (bytes, bytearray)):
+            body = payload.decode('utf-8', errors='replace')
+        else:
+            body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(f"{method.upper()}\n{path}\n{body}".encode()).hexdigest()
+
+    @staticmethod
+    def begin(user_id, key, endpoint, fingerprint):
+        """
+        Claim an idempotency key before the handler runs.
+
+        Returns (outcome, record). PROCEED means this request holds the in-flight
+        lock and must call complete() or release(); REPLAY carries the stored
+        response; IN_PROGRESS means a duplicate is still running; MISMATCH means the
+        key was already used for a different request.
+        """
+        now = datetime.utcnow()
+        lock_until = now + timedelta(seconds=current_app.config['IDEMPOTENCY_LOCK_SECONDS'])
+        expires_at = now + timedelta(hours=current_app.config['IDEMPOTENCY_KEY_TTL_HOURS'])
+
+        try:
+            db.session.execute(
+                insert(IdempotencyKey).values(
+                    user_id=user_id,
+                    idempotency_key=key,
+                    endpoint=endpoint,
+                    request_fingerprint=fingerprint,
+                    status='processing',
+                    locked_until=lock_until,
+                    created_at=now,
+                    expires_at=expires_at
+                )
+            )
+            db.session.commit()
+            return IdempotencyService.PROCEED, IdempotencyService._get(user_id, key)
+        except IntegrityError:
+            db.session.rollback()
+
+        record = IdempotencyService._get(user_id, key)
+        if record is None:
+            # Purged between our insert and read; let the client retry
+            return IdempotencyService.IN_PROGRESS, None
+
+        if record.expires_at <= now:
+            # Retention window is over: the key starts a fresh request
+            claimed = IdempotencyService._claim(
+                record.id,
+                IdempotencyKey.expires_at <= now,
+                endpoint=endpoint,
+                request_fingerprint=fingerprint,
+                status='processing',
+                response_status=None,
+                response_body=None,
+                locked_until=lock_until,
+                created_at=now,
+                expires_at=expires_at
+            )
+            return (IdempotencyService.PROCEED, record) if claimed else (IdempotencyService.IN_PROGRESS, record)
+
+        if record.request_fingerprint != fingerprint or record.endpoint != endpoint:
+            return IdempotencyService.MISMATCH, record
+
+        if record.status == 'completed':
+            return IdempotencyService.REPLAY, record
+
+        # Still processing: take the lock over only if its holder has gone away
+        claimed = IdempotencyService._claim(
+            record.id,
+            or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until <= now),
+            locked_until=lock_until
+        )
+        if claimed:
+            logger.warning(f"Took over stale idempotency lock for key {key}")
+            return IdempotencyService.PROCEED, record
+        return IdempotencyService.IN_PROGRESS, record
+
+    @staticmethod
+    @contextmanager
+    def hold(record_id):
+        """
+        Keep renewing a key's in-flight lock while the handler runs.
+
+        The lock only expires once its holder stops renewing it (the process died),
+        so a retry of a slow request gets a 409 instead of running it a second time.
+        Renewals go through their own connection and touch only the key row.
+        """
+        app = current_app._get_current_object()
+        lock_seconds = app.config['IDEMPOTENCY_LOCK_SECONDS']
+        stop = threading.Event()
+
+        def renew():
+            with app.app_context():
+                while not stop.wait(max(lock_seconds / 3, 0.5)):
+                    try:
+                        with db.engine.begin() as connection:
+                            connection.execute(
+                                update(IdempotencyKey)
+                                .where(IdempotencyKey.id == record_id, IdempotencyKey.status == 'processing')
+                                .values(locked_until=datetime.utcnow() + timedelta(seconds=lock_seconds))
+                            )
+                    except Exception as e:
+                        # Retried on the next tick; the lock still has two ticks left
+                        logger.warning(f"Could not renew idempotency lock {record_id}: {str(e)}")
+
+        thread = threading.Thread(target=renew, name=f"idempotency-lock-{record_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @staticmethod
+    def complete(record_id, status_code, body):
+        """Persist the handler's response and release the in-flight lock"""
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id)
+            .values(status='completed', response_status=status_code, response_body=body, locked_until=None)
+        )
+        db.session.commit()
+
+    @staticmethod
+    def release(record_id):
+        """Forget an in-flight key so the client can retry, e.g. after a server error"""
+        db.session.rollback()
+        db.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id, IdempotencyKey.status == 'processing')
+        )
+        db.session.commit()
+
+    @staticmethod
+    def purge_expired():
+        """Delete keys past their retention window"""
+        result = db.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+        )
+        db.session.commit()
+        logger.info(f"Purged {result.rowcount} expired idempotency keys")
+        return result.rowcount
+
+    @staticmethod
+    def _get(user_id, key):
+        return IdempotencyKey.query.filter_by(user_id=user_id, idempotency_key=key).populate_existing().first()
+
+    @staticmethod
+    def _claim(record_id, condition, **values):
+        """Conditionally update a key row; True when this request won the race"""
+        result = db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id, condition)
+            .values(**values)
+        )
+        db.session.commit()
+        return result.rowcount == 1
@@ -0,0 +1,256 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, update
+from app.models.job_model import Job
+from app.extensions import db
+from app.utils.background import start_with_app
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once cancellation of its job was requested"""
+
+
+class JobService:
+    """Service class for enqueueing, running and cancelling background jobs"""
+
+    _handlers = {}
+
+    @staticmethod
+    def register(job_type):
+        """Decorator registering handler(job) -> result dict for a job type"""
+        def decorator(fn):
+            JobService._handlers[job_type] = fn
+            return fn
+        return decorator
+
+    @staticmethod
+    def enqueue(job_type, user_id=None, payload=None, total=0):
+        """Persist a queued job and wake a worker; the job runs outside the current request"""
+        if job_type not in JobService._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = Job(job_type=job_type, user_id=user_id, payload=payload, total=total, status='queued')
+        db.session.add(job)
+        db.session.commit()
+
+        if current_app.config.get('JOBS_RUN_INLINE'):
+            JobService.run(job.id)
+        else:
+            job_runner.notify()
+        return job
+
+    @staticmethod
+    def get_job(job_id, user_id=None):
+        """Fetch a job, optionally restricted to its owner"""
+        query = Job.query.filter_by(id=job_id)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        return query.first()
+
+    @staticmethod
+    def list_jobs(user_id=None, status=None, job_type=None, limit=50):
+        """Most recent jobs first, optionally filtered by owner, status and type"""
+        query = Job.query
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        if status:
+            query = query.filter_by(status=status)
+        if job_type:
+            query = query.filter_by(job_type=job_type)
+        return query.order_by(Job.created_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def cancel(job):
+        """
+        Cancel a job: a queued job is cancelled at once, a running one stops at its next
+        checkpoint (work already committed stays). Returns False if the job already finished.
+        """
+        now = datetime.utcnow()
+        cancelled = db.session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == 'queued')
+            .values(status='cancelled', cancel_requested=True, finished_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not cancelled:
+            cancelled = db.session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == 'running')
+                .values(cancel_requested=True)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        db.session.commit()
+        db.session.refresh(job)
+        return bool(cancelled)
+
+    @staticmethod
+    def report_progress(job, processed=0, succeeded=0, failed=0):
+        """Add a chunk's counts to the job; committed together with the chunk's own writes"""
+        job.processed += processed
+        job.succeeded += succeeded
+        job.failed += failed
+        job.heartbeat_at = datetime.utcnow()
+
+    @staticmethod
+    def raise_if_cancelled(job):
+        """Checkpoint for handlers between committed chunks"""
+        requested = db.session.execute(select(Job.cancel_requested).where(Job.id == job.id)).scalar()
+        if requested:
+            raise JobCancelled()
+
+    @staticmethod
+    def claim_next():
+        """Atomically move the oldest queued job to running; None when the queue is empty"""
+        candidates = db.session.execute(
+            select(Job.id).where(Job.status == 'queued').order_by(Job.created_at).limit(5)
+        ).scalars().all()
+        for job_id in candidates:
+            now = datetime.utcnow()
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == 'queued')
+                .values(status='running', started_at=now, heartbeat_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id, populate_existing=True)
+        return None
+
+    @staticmethod
+    def run(job_id):
+        """Claim a queued job and run it to completion, recording its result, cancellation or error"""
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=now, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        job = db.session.get(Job, job_id, populate_existing=True)
+        if not claimed:
+            return job
+        return JobService._execute(job)
+
+    @staticmethod
+    def fail_stale():
+        """Mark running jobs whose worker stopped heartbeating as failed; returns how many"""
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_STALE_SECONDS'])
+        failed = db.session.execute(
+            update(Job)
+            .where(Job.status == 'running', Job.heartbeat_at < cutoff)
+            .values(status='failed', error='Worker stopped before the job finished', finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return failed
+
+    @staticmethod
+    def _execute(job):
+        job_id = job.id
+        try:
+            result = JobService._handlers[job.job_type](job)
+            job.status = 'completed'
+            job.result = result
+        except JobCancelled:
+            db.session.rollback()
+            job = db.session.get(Job, job_id, populate_existing=True)
+            job.status = 'cancelled'
+            logger.info(f"Job {job_id} ({job.job_type}) cancelled after {job.processed} item(s)")
+        except Exception as e:
+            logger.error(f"Job {job_id} ({job.job_type}) failed: {str(e)}")
+            db.session.rollback()
+            job = db.session.get(Job, job_id, populate_existing=True)
+            job.status = 'failed'
+            job.error = str(e)
+
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+
+class JobRunner:
+    """
+    Pool of worker threads executing queued jobs.
+
+    Each process started with JOB_WORKERS > 0 runs that many workers, started with
+    the app so jobs queued before a restart are picked up (and stale ones failed);
+    `flask jobs work` runs a dedicated worker process instead.
+    Workers claim jobs from the job table with a conditional UPDATE, so any number
+    of processes can share the queue, and sleep on an event between polls.
+    """
+
+    def __init__(self):
+        self._threads = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['job_runner'] = self
+        start_with_app(app, self.start_configured)
+
+    def start_configured(self, app):
+        """Start this process's JOB_WORKERS worker threads (none when it is 0)"""
+        workers = app.config.get('JOB_WORKERS', 2)
+        if workers > 0:
+            self.start(app, workers)
+
+    def notify(self):
+        """Wake a worker (starting the pool if needed) after a job was queued"""
+        workers = current_app.config.get('JOB_WORKERS', 2)
+        if workers > 0:
+            self.start(current_app._get_current_object(), workers)
+        self._wake.set()
+
+    def start(self, app, workers):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            self._stop.clear()
+            while len(self._threads) < workers:
+                thread = threading.Thread(
+                    target=self.work, args=(app,), name=f'job-worker-{len(self._threads)}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def join(self):
+        for thread in list(self._threads):
+            # Short timeouts keep the main thread responsive to Ctrl-C
+            while thread.is_alive():
+                thread.join(1)
+
+    def work(self, app, once=False):
+        """Worker loop: run queued jobs until stopped (or, with once=True, until the queue is empty)"""
+        with app.app_context():
+            poll_seconds = app.config['JOB_POLL_SECONDS']
+            while not self._stop.is_set():
+                job = None
+                try:
+                    JobService.fail_stale()
+                    job = JobService.claim_next()
+                    if job is not None:
+                        JobService._execute(job)
+                except Exception as e:
+                    logger.error(f"Job worker error: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+                if job is None:
+                    if once:
+                        return
+                    self._wake.wait(poll_seconds)
+                    self._wake.clear()
+
+
+job_runner = JobRunner()
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import insert
+from app.models.account_model import Account
+from app.models.ledger_model import LedgerEntry, LedgerSnapshot, EXTERNAL_LEDGER_ACCOUNT, CUSTOMER_LEDGER_ACCOUNT
+from app.extensions import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerService:
+    """Service class for the append-only double-entry journal"""
+
+    @staticmethod
+    def record_posting(journal_id, account_id, amount_minor, currency, sequence, balance_after_minor, description=None):
+        """
+        Append a customer-account posting with its running balance.
+
+        Every LEDGER_SNAPSHOT_INTERVAL postings per account a checkpoint is written
+        in the same transaction.
+        """
+        entry = LedgerEntry(
+            journal_id=journal_id,
+            ledger_account=CUSTOMER_LEDGER_ACCOUNT,
+            account_id=account_id,
+            sequence=sequence,
+            amount_minor=amount_minor,
+            balance_after_minor=balance_after_minor,
+            currency_code=currency.upper(),
+            description=description,
+            created_at=datetime.utcnow()
+        )
+        db.session.add(entry)
+
+        interval = current_app.config.get('LEDGER_SNAPSHOT_INTERVAL')
+        if interval and sequence % interval == 0:
+            db.session.add(LedgerSnapshot(
+                account_id=account_id,
+                sequence=sequence,
+                balance_minor=balance_after_minor,
+                as_of=entry.created_at
+            ))
+        return entry
+
+    @staticmethod
+    def record_external(journal_id, amount_minor, currency, description=None):
+        """Append the contra leg for money entering (negative) or leaving (positive) the platform"""
+        entry = LedgerEntry(
+            journal_id=journal_id,
+            ledger_account=EXTERNAL_LEDGER_ACCOUNT,
+            amount_minor=amount_minor,
+            currency_code=currency.upper(),
+            description=description,
+            created_at=datetime.utcnow()
+        )
+        db.session.add(entry)
+        return entry
+
+    @staticmethod
+    def record_postings(postings):
+        """
+        Bulk variant of record_posting/record_external for batch settlement.
+
+        ``postings`` is a list of dicts with journal_id, account_id (None for the
+        external contra leg), amount_minor, currency, description and, for customer
+        legs, sequence and balance_after_minor. Entries and any due checkpoints are
+        written with one multi-row INSERT each.
+        """
+        if not postings:
+            return
+        now = datetime.utcnow()
+        interval = current_app.config.get('LEDGER_SNAPSHOT_INTERVAL')
+        entries = []
+        snapshots = []
+
+        for posting in postings:
+            account_id = posting.get('account_id')
+            entries.append({
+                'journal_id': posting['journal_id'],
+                'ledger_account': CUSTOMER_LEDGER_ACCOUNT if account_id else EXTERNAL_LEDGER_ACCOUNT,
+                'account_id': account_id,
+                'sequence': posting.get('sequence'),
+                'amount_minor': posting['amount_minor'],
+                'balance_after_minor': posting.get('balance_after_minor'),
+                'currency_code': posting['currency'].upper(),
+                'description': posting.get('description'),
+                'created_at': now
+            })
+            if account_id and interval and posting['sequence'] % interval == 0:
+                snapshots.append({
+                    'account_id': account_id,
+                    'sequence': posting['sequence'],
+                    'balance_minor': posting['balance_after_minor'],
+                    'as_of': now
+                })
+
+        db.session.execute(insert(LedgerEntry), entries)
+        if snapshots:
+            db.session.execute(insert(LedgerSnapshot), snapshots)
+
+    @staticmethod
+    def balance_as_of(account_id, as_of):
+        """
+        Return an account balance in minor units at a point in time.
+
+        Reads the running balance of the last posting at or before ``as_of``; falls
+        back to the latest checkpoint for accounts whose history predates the journal.
+        """
+        entry = LedgerEntry.query.filter(
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.created_at <= as_of
+        ).order_by(LedgerEntry.created_at.desc(), LedgerEntry.sequence.desc()).first()
+        if entry:
+            return entry.balance_after_minor
+
+        snapshot = LedgerSnapshot.query.filter(
+            LedgerSnapshot.account_id == account_id,
+            LedgerSnapshot.as_of <= as_of
+        ).order_by(LedgerSnapshot.as_of.desc()).first()
+        return snapshot.balance_minor if snapshot else 0
+
+    @staticmethod
+    def get_statement(account_id, start_date, end_date, limit=500):
+        """Return opening/closing balances and the postings for an account in a date range"""
+        entries = LedgerEntry.query.filter(
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.created_at >= start_date,
+            LedgerEntry.created_at <= end_date
+        ).order_by(LedgerEntry.created_at.asc(), LedgerEntry.sequence.asc()).limit(limit).all()
+
+        if entries:
+            # The first posting's running balance already encodes everything before it
+            opening_balance = entries[0].balance_after_minor - entries[0].amount_minor
+        else:
+            opening_balance = LedgerService.balance_as_of(account_id, start_date - timedelta(microseconds=1))
+
+        return {
+            'opening_balance_minor': opening_balance,
+            'closing_balance_minor': entries[-1].balance_after_minor if entries else opening_balance,
+            'entries': entries,
+            'truncated': len(entries) == limit
+        }
+
+    @staticmethod
+    def snapshot_accounts(batch_size=500):
+        """Checkpoint the current balance of every account"""
+        created = 0
+        last_id = None
+        now = datetime.utcnow()
+
+        while True:
+            query = Account.query.with_entities(
+                Account.id, Account.ledger_sequence, Account.balance_minor
+            ).order_by(Account.id)
+            if last_id is not None:
+                query = query.filter(Account.id > last_id)
+            rows = query.limit(batch_size).all()
+            if not rows:
+                break
+
+            db.session.add_all([
+                LedgerSnapshot(account_id=row.id, sequence=row.ledger_sequence, balance_minor=row.balance_minor, as_of=now)
+                for row in rows
+            ])
+            db.session.commit()
+            created += len(rows)
+            last_id = rows[-1].id
+
+        logger.info(f"Created {created} ledger snapshots")
+        return created
@@ -0,0 +1,188 @@
+import uuid
+import logging
+from datetime import datetime
+from collections import defaultdict
+from sqlalchemy import event, inspect, select, delete, insert, func, case
+from sqlalchemy.orm import Session
+from app.models.notification_model import Notification, NotificationCounter
+from app.services.job_service import JobService
+from app.utils.db_utils import upsert_insert
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationCounterService:
+    """Service class maintaining the per-user notification counters"""
+
+    JOB_TYPE = 'notification_counter_repair'
+
+    @staticmethod
+    def get_counts(user_id):
+        """Total and unread counts of a user, overall and per category, from the counter rows"""
+        counters = NotificationCounter.query.filter_by(user_id=user_id).all()
+        return {
+            'total': sum(counter.total for counter in counters),
+            'unread': sum(counter.unread for counter in counters),
+            'categories': {counter.category: counter.total for counter in counters if counter.total},
+            'unread_categories': {counter.category: counter.unread for counter in counters if counter.unread}
+        }
+
+    @staticmethod
+    def new_deltas():
+        """Accumulator for apply(): (user_id, category) -> [total delta, unread delta]"""
+        return defaultdict(lambda: [0, 0])
+
+    @staticmethod
+    def add(deltas, user_id, category, is_read, sign=1):
+        key = (str(user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))), category)
+        deltas[key][0] += sign
+        if not is_read:
+            deltas[key][1] += sign
+
+    @staticmethod
+    def apply(deltas, connection=None):
+        """
+        Add the deltas to the counters with one executemany upsert.
+
+        Runs on the caller's transaction (``connection`` during a flush, the session
+        otherwise), so counters commit or roll back together with the notifications.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {'user_id': user_id, 'category': category, 'total': total, 'unread': unread, 'updated_at': now}
+            for (user_id, category), (total, unread) in deltas.items() if total or unread
+        ]
+        if not rows:
+            return
+
+        executor = connection if connection is not None else db.session
+        dialect_name = connection.dialect.name if connection is not None else db.session.get_bind().dialect.name
+        table = NotificationCounter.__table__
+        statement = upsert_insert(table, dialect_name)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.category],
+            set_={
+                'total': table.c.total + statement.excluded.total,
+                'unread': table.c.unread + statement.excluded.unread,
+                'updated_at': statement.excluded.updated_at
+            }
+        )
+        executor.execute(statement, rows)
+
+    @staticmethod
+    def delete_notifications(*criteria):
+        """Delete the notifications matching ``criteria`` and decrement their counters; returns the count"""
+        deleted = db.session.execute(
+            delete(Notification).where(*criteria)
+            .returning(Notification.user_id, Notification.category, Notification.is_read)
+            .execution_options(synchronize_session=False)
+        ).all()
+        deltas = NotificationCounterService.new_deltas()
+        for user_id, category, is_read in deleted:
+            NotificationCounterService.add(deltas, user_id, category, is_read, sign=-1)
+        NotificationCounterService.apply(deltas)
+        return len(deleted)
+
+    @staticmethod
+    def rebuild(user_ids=None, chunk_size=1000, on_progress=None):
+        """
+        Recompute counters from the notification table.
+
+        Works through users in keyset pages: per page one grouped aggregate, a delete
+        of the page's counters and one insert of the recomputed rows, committed
+        together. Returns the number of users and counter rows written.
+        """
+        from app.models.user_model import User
+
+        users = 0
+        rows_written = 0
+        last_id = None
+        while True:
+            query = select(User.id).order_by(User.id).limit(chunk_size)
+            if user_ids is not None:
+                query = query.where(User.id.in_(user_ids))
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            page = db.session.execute(query).scalars().all()
+            if not page:
+                break
+            last_id = page[-1]
+
+            now = datetime.utcnow()
+            rows = [
+                {'user_id': user_id, 'category': category, 'total': total, 'unread': unread, 'updated_at': now}
+                for user_id, category, total, unread in db.session.execute(
+                    select(
+                        Notification.user_id,
+                        Notification.category,
+                        func.count(Notification.id),
+                        func.sum(case((Notification.is_read == False, 1), else_=0))
+                    ).where(Notification.user_id.in_(page)).group_by(Notification.user_id, Notification.category)
+                )
+            ]
+            db.session.execute(
+                delete(NotificationCounter).where(NotificationCounter.user_id.in_(page))
+                .execution_options(synchronize_session=False)
+            )
+            if rows:
+                db.session.execute(insert(NotificationCounter), rows)
+            db.session.commit()
+
+            users += len(page)
+            rows_written += len(rows)
+            if on_progress:
+                on_progress(len(page))
+
+        logger.info(f"Rebuilt {rows_written} notification counter(s) for {users} user(s)")
+        return {'users': users, 'counters': rows_written}
+
+    @staticmethod
+    def enqueue_repair(user_id):
+        """Queue a rebuild of every user's counters"""
+        from app.models.user_model import User
+
+        return JobService.enqueue(NotificationCounterService.JOB_TYPE, user_id=user_id, total=User.query.count())
+
+    @staticmethod
+    def run_repair(job):
+        def on_progress(users):
+            JobService.report_progress(job, processed=users, succeeded=users)
+            db.session.commit()
+            JobService.raise_if_cancelled(job)
+
+        return NotificationCounterService.rebuild(on_progress=on_progress)
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_flushed_notifications(session, flush_context):
+    """Keep counters in step with notifications inserted, updated or deleted through the ORM"""
+    deltas = NotificationCounterService.new_deltas()
+    add = NotificationCounterService.add
+
+    for obj in session.new:
+        if isinstance(obj, Notification):
+            add(deltas, obj.user_id, obj.category, obj.is_read)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Notification) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        old = {}
+        for name in ('category', 'is_read'):
+            history = state.attrs[name].history
+            if history.deleted:
+                old[name] = history.deleted[0]
+        if old:
+            add(deltas, obj.user_id, old.get('category', obj.category), old.get('is_read', obj.is_read), sign=-1)
+            add(deltas, obj.user_id, obj.category, obj.is_read)
+
+    for obj in session.deleted:
+        if isinstance(obj, Notification):
+            add(deltas, obj.user_id, obj.category, obj.is_read, sign=-1)
+
+    if deltas:
+        NotificationCounterService.apply(deltas, connection=session.connection())
+
+
+JobService.register(NotificationCounterService.JOB_TYPE)(NotificationCounterService.run_repair)
@@ -0,0 +1,107 @@
+import logging
+from app.services.job_service import JobService
+from app.services.notification_service import NotificationService
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationJobService:
+    """Service class running the admin notification fan-outs as background jobs"""
+
+    BROADCAST = 'notification_broadcast'
+    BULK_CREATE = 'notification_bulk_create'
+    CLEANUP = 'notification_cleanup'
+
+    @staticmethod
+    def enqueue_broadcast(user_id, notification_data, notification_types, target_users, user_filters):
+        """Queue a broadcast; the total is the number of users it targets right now"""
+        return JobService.enqueue(
+            NotificationJobService.BROADCAST,
+            user_id=user_id,
+            payload={
+                'notification_data': notification_data,
+                'notification_types': notification_types,
+                'target_users': target_users,
+                'user_filters': user_filters
+            },
+            total=NotificationService.count_target_users(target_users, user_filters)
+        )
+
+    @staticmethod
+    def enqueue_bulk_create(user_id, user_ids, notifications_data):
+        """Queue notifications for specific users; progress counts (user, notification) pairs"""
+        return JobService.enqueue(
+            NotificationJobService.BULK_CREATE,
+            user_id=user_id,
+            payload={'user_ids': [str(target_id) for target_id in user_ids], 'notifications': notifications_data},
+            total=len(user_ids) * len(notifications_data)
+        )
+
+    @staticmethod
+    def enqueue_cleanup(user_id, days_to_keep):
+        """Queue deletion of notifications older than ``days_to_keep`` days"""
+        return JobService.enqueue(
+            NotificationJobService.CLEANUP,
+            user_id=user_id,
+            payload={'days_to_keep': days_to_keep},
+            total=NotificationService.count_old_notifications(days_to_keep)
+        )
+
+    @staticmethod
+    def _checkpoint(job):
+        """on_progress callback for broadcast pages: record the page, then honour a cancel request"""
+        def on_progress(users, notifications, emails):
+            JobService.report_progress(job, processed=users, succeeded=notifications)
+            db.session.commit()
+            JobService.raise_if_cancelled(job)
+        return on_progress
+
+    @staticmethod
+    def run_broadcast(job):
+        payload = job.payload
+        return NotificationService.broadcast_notification(
+            notification_data=payload['notification_data'],
+            notification_types=payload['notification_types'],
+            target_users=payload['target_users'],
+            user_filters=payload['user_filters'],
+            on_progress=NotificationJobService._checkpoint(job)
+        )
+
+    @staticmethod
+    def run_bulk_create(job):
+        """Each notification goes through the paged broadcast pipeline for the listed users"""
+        user_ids = job.payload['user_ids']
+        notifications_created = 0
+        emails_sent = 0
+        for notification_data in job.payload['notifications']:
+            result = NotificationService.broadcast_notification(
+                notification_data=notification_data,
+                target_users=user_ids,
+                on_progress=NotificationJobService._checkpoint(job)
+            )
+            notifications_created += result['notifications_created']
+            emails_sent += result['emails_sent']
+
+        return {
+            'users_targeted': len(user_ids),
+            'notifications_created': notifications_created,
+            'emails_sent': emails_sent
+        }
+
+    @staticmethod
+    def run_cleanup(job):
+        days_to_keep = job.payload['days_to_keep']
+
+        def on_progress(deleted):
+            JobService.report_progress(job, processed=deleted, succeeded=deleted)
+            db.session.commit()
+            JobService.raise_if_cancelled(job)
+
+        deleted_count = NotificationService.cleanup_old_notifications(days_to_keep, on_progress=on_progress)
+        return {'deleted_count': deleted_count, 'days_kept': days_to_keep}
+
+
+JobService.register(NotificationJobService.BROADCAST)(NotificationJobService.run_broadcast)
+JobService.register(NotificationJobService.BULK_CREATE)(NotificationJobService.run_bulk_create)
+JobService.register(NotificationJobService.CLEANUP)(NotificationJobService.run_cleanup)
@@ -1,7 +1,13 @@
 from app.models.notification_model import Notification, NotificationSettings
-from app.extensions import db
 from app.services.email_service import EmailService
-from flask import current_app
+from app.services.notification_settings_service import NotificationSettingsService
+from app.services.notification_counter_service import NotificationCounterService
+from app.config.payment_config import PaymentConfig
+from app.extensions import db
+from flask import current_app, url_for
+from sqlalchemy import insert, select, func
+from datetime import datetime, timedelta
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,6 +39,7 @@ class NotificationService:
     def create_notifications_for_user(user, notifications_data):
         """Create multiple notifications for a user"""
         created_notifications = []
+        settings = NotificationSettingsService.get_settings(user.id)
 
         for notif_data in notifications_data:
             notification = NotificationService.create_notification(
@@ -48,11 +55,6 @@ class NotificationService:
                 created_notifications.append(notification)
 
                 # Send email if enabled
-                settings = NotificationSettings.query.filter_by(user_id=user.id).first()
-                if not settings:
-                    settings = NotificationSettings.create_default_settings(user.id)
-                    db.session.add(settings)
-
                 if settings.should_send_email(notification.category):
                     NotificationService._send_notification_email(user, notification)
 
@@ -60,96 +62,164 @@ class NotificationService:
         return created_notifications
 
     @staticmethod
-    def broadcast_notification(notification_data, notification_types=None, target_users='all', user_filters=None):
+    def broadcast_notification(notification_data, notification_types=None, target_users='all', user_filters=None,
+                               on_progress=None):
         """
         Broadcast notification to multiple users
 
+        Streams the target users in keyset pages of BROADCAST_CHUNK_SIZE: each page is
+        one query joining the users' settings, one executemany INSERT of notifications
+        (plus default settings for users that have none) and of counter updates, and
+        one outbox insert for the page's emails, committed together. Memory stays
+        bounded by the page size.
+
         Args:
             notification_data: Dict with title, message, category, priority, metadata
             notification_types: List of ['in_app', 'email'] (default: both)
             target_users: 'all', 'verified', 'active', or list of user IDs
             user_filters: Additional filter criteria
+            on_progress: Optional callback(users, notifications, emails) run after each committed page
         """
+        from app.models.user_model import User
+
         if notification_types is None:
             notification_types = ['in_app', 'email']
 
-        # Get target users
-        users = NotificationService._get_target_users(target_users, user_filters)
-
         title = notification_data.get('title', 'System Notification')
         message = notification_data.get('message', '')
         category = notification_data.get('category', 'system')
         priority = notification_data.get('priority', 'medium')
         metadata = notification_data.get('metadata')
-
-        created_notifications = []
+        extra_data = Notification.serialize_metadata(metadata)
+
+        chunk_size = current_app.config['BROADCAST_CHUNK_SIZE']
+        send_in_app = 'in_app' in notification_types
+        send_email = 'email' in notification_types
+
+        # Users without a settings row get (and are stored with) the defaults
+        default_settings = NotificationSettings.create_default_settings(None)
+        email_default = default_settings.should_send_email(category)
+        email_column = getattr(NotificationSettings, f'email_{category}', None)
+        dashboard_url = NotificationService._dashboard_url() if send_email and category == 'transaction' else None
+
+        base_query = NotificationService._target_users_query(target_users, user_filters).with_only_columns(
+            User.id,
+            User.email,
+            User.name,
+            NotificationSettings.id,
+            email_column if email_column is not None else db.literal(False)
+        ).outerjoin(NotificationSettings, NotificationSettings.user_id == User.id).order_by(User.id).limit(chunk_size)
+
+        total_users = 0
+        notifications_created = 0
         emails_sent = 0
+        last_id = None
+
+        while True:
+            query = base_query if last_id is None else base_query.where(User.id > last_id)
+            page = db.session.execute(query).all()
+            if not page:
+                break
+            last_id = page[-1][0]
+
+            now = datetime.utcnow()
+            seen = set()
+            new_settings = []
+            notifications = []
+            emails = []
+            for user_id, email, name, settings_id, email_enabled in page:
+                if user_id in seen:
+                    # A user with duplicate settings rows appears once per row
+                    continue
+                seen.add(user_id)
+
+                if settings_id is None:
+                    new_settings.append(NotificationSettings.default_row(
+                        user_id, id=str(uuid.uuid4()), created_at=now, updated_at=now
+                    ))
+                    email_enabled = email_default
+
+                if send_in_app:
+                    notifications.append({
+                        'id': str(uuid.uuid4()),
+                        'user_id': user_id,
+                        'title': title,
+                        'message': message,
+                        'category': category,
+                        'priority': priority,
+                        'is_read': False,
+                        'extra_data': extra_data,
+                        'created_at': now,
+                        'updated_at': now
+                    })
+
+                if send_email and email_enabled:
+                    emails.append(EmailService.notification_email(
+                        category, email, name, title, message, dashboard_url=dashboard_url
+                    ))
+
+            if new_settings:
+                db.session.execute(insert(NotificationSettings), new_settings)
+            if notifications:
+                db.session.execute(insert(Notification), notifications)
+                counter_deltas = NotificationCounterService.new_deltas()
+                for notification in notifications:
+                    NotificationCounterService.add(counter_deltas, notification['user_id'], category, False)
+                NotificationCounterService.apply(counter_deltas)
+            if emails:
+                emails_sent += EmailService.send_bulk(emails[0][0], [email_message for _, email_message in emails])
+            db.session.commit()
 
-        for user in users:
-            try:
-                # Check or create user notification settings
-                settings = NotificationSettings.query.filter_by(user_id=user.id).first()
-                if not settings:
-                    settings = NotificationSettings.create_default_settings(user.id)
-                    db.session.add(settings)
-
-                # Create in-app notification for all users by default
-                if 'in_app' in notification_types:
-                    notification = Notification.create_notification(
-                        user_id=user.id,
-                        title=title,
-                        message=message,
-                        category=category,
-                        priority=priority,
-                        metadata=metadata
-                    )
-                    db.session.add(notification)
-                    created_notifications.append(notification)
-
-                # Send email notification if enabled in user settings
-                if 'email' in notification_types and settings.should_send_email(category):
-                    success = NotificationService._send_notification_email(user, notification)
-                    if success:
-                        emails_sent += 1
-
-            except Exception as e:
-                logger.error(f"Failed to create notification for user {user.id}: {str(e)}")
-                continue
-
-        db.session.commit()
+            total_users += len(seen)
+            notifications_created += len(notifications)
+            if on_progress:
+                on_progress(len(seen), len(notifications), len(emails))
 
         return {
-            'total_users': len(users),
-            'notifications_created': len(created_notifications),
+            'total_users': total_users,
+            'notifications_created': notifications_created,
             'emails_sent': emails_sent,
             'success': True
         }
 
     @staticmethod
-    def _get_target_users(target_users='all', user_filters=None):
-        """Get target users based on criteria"""
+    def count_target_users(target_users='all', user_filters=None):
+        """Number of users a broadcast to ``target_users`` would reach"""
+        query = NotificationService._target_users_query(target_users, user_filters)
+        return db.session.execute(select(func.count()).select_from(query.subquery())).scalar()
+
+    @staticmethod
+    def _target_users_query(target_users='all', user_filters=None):
+        """Select statement over the users a broadcast targets"""
         from app.models.user_model import User
 
-        query = User.query
+        query = db.select(User)
 
         if target_users == 'verified':
-            query = query.filter(User.email_verified == True)
+            query = query.where(User.email_verified == True)
         elif target_users == 'active':
             # Consider users active if they have logged in within 30 days
-            from datetime import datetime, timedelta
             thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            query = query.filter(User.updated_at >= thirty_days_ago)
+            query = query.where(User.updated_at >= thirty_days_ago)
         elif isinstance(target_users, list):
-            query = query.filter(User.id.in_(target_users))
+            query = query.where(User.id.in_(target_users))
         # 'all' doesn't need additional filtering
 
         # Apply additional filters if provided
         if user_filters:
             for key, value in user_filters.items():
                 if hasattr(User, key):
-                    query = query.filter(getattr(User, key) == value)
+                    query = query.where(getattr(User, key) == value)
 
-        return query.all()
+        return query
+
+    @staticmethod
+    def _dashboard_url():
+        """Transactions dashboard link for transaction emails"""
+        try:
+            return url_for('dashboard.transactions', _external=True)
+        except Exception:
+            return f"{PaymentConfig.FRONTEND_URL.rstrip('/')}/transactions"
 
     @staticmethod
     def _send_notification_email(user, notification):
@@ -265,15 +335,38 @@ class NotificationService:
         }
 
     @staticmethod
-    def cleanup_old_notifications(days_to_keep=90):
-        """Clean up old notifications"""
-        from datetime import datetime, timedelta
+    def cleanup_old_notifications(days_to_keep=90, on_progress=None):
+        """
+        Clean up old notifications
+
+        Deletes in batches of NOTIFICATION_CLEANUP_CHUNK_SIZE, committing each batch,
+        so a large purge never holds one long transaction (or table lock).
 
+        Args:
+            days_to_keep: Notifications newer than this many days are kept
+            on_progress: Optional callback(deleted) run after each committed batch
+        """
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
-        deleted_count = Notification.query.filter(
-            Notification.created_at < cutoff_date
-        ).delete()
+        chunk_size = current_app.config['NOTIFICATION_CLEANUP_CHUNK_SIZE']
+        deleted_count = 0
+
+        while True:
+            ids = db.session.execute(
+                select(Notification.id).where(Notification.created_at < cutoff_date).limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+            deleted = NotificationCounterService.delete_notifications(Notification.id.in_(ids))
+            db.session.commit()
+            deleted_count += deleted
+            if on_progress:
+                on_progress(deleted)
 
-        db.session.commit()
         logger.info(f"Cleaned up {deleted_count} old notifications")
         return deleted_count
+
+    @staticmethod
+    def count_old_notifications(days_to_keep=90):
+        """Number of notifications cleanup_old_notifications would delete"""
+        cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+        return Notification.query.filter(Notification.created_at < cutoff_date).count()
@@ -0,0 +1,91 @@
+import uuid
+import logging
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from app.models.notification_model import NotificationSettings
+from app.utils.ttl_cache import TTLCache
+from app.config import Config
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# user id -> column values of the user's NotificationSettings row
+settings_cache = TTLCache(maxsize=Config.NOTIFICATION_SETTINGS_CACHE_SIZE)
+
+# Session.info key collecting default rows inserted in the open transaction, cached once it commits
+_PENDING_ROWS_KEY = 'notification_settings_pending_rows'
+
+
+class NotificationSettingsService:
+    """Service class for cached notification preference lookups"""
+
+    @staticmethod
+    def get_settings(user_id):
+        """Notification settings of one user; see get_settings_for"""
+        return NotificationSettingsService.get_settings_for([user_id])[NotificationSettingsService._key(user_id)]
+
+    @staticmethod
+    def get_settings_for(user_ids):
+        """
+        Notification settings of many users, keyed by user id (as a string).
+
+        Users found in the per-process cache cost nothing; the rest are loaded with
+        one IN query, and users without a settings row get their default row in one
+        bulk INSERT on the caller's session (the caller commits; those rows are
+        only cached once it does, so a rollback cannot leave a cached id behind).
+        The returned objects are detached, read-only snapshots: to change settings,
+        load the row and call invalidate() after committing.
+        """
+        keys = list(dict.fromkeys(NotificationSettingsService._key(user_id) for user_id in user_ids))
+        values = settings_cache.get_many(keys)
+
+        missing = [key for key in keys if key not in values]
+        if missing:
+            loaded = {}
+            for row in NotificationSettings.query.filter(NotificationSettings.user_id.in_(missing)):
+                # Keep the first row if a user somehow has several, like .first() did
+                loaded.setdefault(str(row.user_id), NotificationSettingsService._column_values(row))
+
+            now = datetime.utcnow()
+            new_rows = [
+                NotificationSettings.default_row(key, id=str(uuid.uuid4()), created_at=now, updated_at=now)
+                for key in missing if key not in loaded
+            ]
+            settings_cache.set_many(loaded, current_app.config['NOTIFICATION_SETTINGS_CACHE_SECONDS'])
+            values.update(loaded)
+
+            if new_rows:
+                db.session.execute(insert(NotificationSettings), new_rows)
+                inserted = {row['user_id']: row for row in new_rows}
+                db.session.info.setdefault(_PENDING_ROWS_KEY, {}).update(inserted)
+                values.update(inserted)
+
+        return {key: NotificationSettings(**values[key]) for key in keys}
+
+    @staticmethod
+    def invalidate(user_id):
+        """Drop a user's cached settings in this process, e.g. after they were updated"""
+        settings_cache.invalidate(NotificationSettingsService._key(user_id))
+
+    @staticmethod
+    def _column_values(row):
+        return {column.key: getattr(row, column.key) for column in NotificationSettings.__mapper__.column_attrs}
+
+    @staticmethod
+    def _key(user_id):
+        return str(user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id)))
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_settings(session):
+    rows = session.info.pop(_PENDING_ROWS_KEY, None)
+    if rows and has_app_context():
+        settings_cache.set_many(rows, current_app.config['NOTIFICATION_SETTINGS_CACHE_SECONDS'])
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_settings(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_ROWS_KEY, None)
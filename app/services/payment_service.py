@@ -1,4 +1,5 @@
 import stripe
+import uuid
 import logging
 from decimal import Decimal
 from flask import current_app
@@ -8,6 +9,9 @@ from app.models.payout_model import Payout
 from app.models.account_model import Account
 from app.models.user_model import User
 from app.models.virtual_cards_model import VirtualCard
+from app.services.balance_service import BalanceService
+from app.services.transaction_service import TransactionService
+from app.utils.money import to_minor_units
 from app.extensions import db
 
 # Configure Stripe with validation
@@ -106,16 +110,12 @@ class PaymentService:
             if hasattr(stripe_intent, 'status') and stripe_intent.status == 'succeeded':
                 logger.info(f"Mock payment succeeded, updating account balance for intent {stripe_intent.id}")
                 try:
-                    # Directly update the account balance for mock payments
-                    account = Account.query.get(account_id)
-                    if account:
-                        old_balance = account.balance
-                        account.balance += float(amount)  # Convert Decimal to float
-                        db.session.commit()
-                        logger.info(f"Updated account {account.id} balance from {old_balance} to {account.balance}")
-                    else:
-                        logger.error(f"Account {account_id} not found for balance update")
+                    # Directly credit the account balance for mock payments
+                    BalanceService.credit(account_id, amount, currency, description="Wallet funding")
+                    db.session.commit()
+                    logger.info(f"Credited {amount} {currency.upper()} to account {account_id}")
                 except Exception as e:
+                    db.session.rollback()
                     logger.error(f"Error processing mock payment {stripe_intent.id}: {str(e)}")
             
             logger.info(f"Created payment intent {stripe_intent.id} for user {user_id}")
@@ -268,7 +268,7 @@ class PaymentService:
             if not source_account:
                 raise ValueError("Source account not found or doesn't belong to user")
             
-            if source_account.balance < amount:
+            if not BalanceService.has_funds(source_account, amount):
                 raise ValueError("Insufficient balance for withdrawal")
             
             # For now, create a mock withdrawal (in production, you'd integrate with bank APIs)
@@ -291,7 +291,7 @@ class PaymentService:
             withdrawal.description = f'Withdrawal of {amount} {currency} to bank account {target_account_number}'
             
             # Deduct amount from source account balance
-            source_account.balance -= float(amount)  # Convert Decimal to float
+            BalanceService.debit(source_account_id, amount, currency, "Insufficient balance for withdrawal", description="Withdrawal")
             
             db.session.add(withdrawal)
             db.session.commit()
@@ -332,7 +332,7 @@ class PaymentService:
             if not account:
                 raise ValueError("Account not found or doesn't belong to user")
             
-            if account.balance < amount:
+            if not BalanceService.has_funds(account, amount):
                 raise ValueError("Insufficient balance for payout")
             
             # For now, create a mock payout (in production, you'd need to set up Stripe Connect)
@@ -355,7 +355,7 @@ class PaymentService:
             payout.status = 'pending'
             
             # Deduct amount from account balance
-            account.balance -= float(amount)  # Convert Decimal to float
+            BalanceService.debit(account_id, amount, currency, "Insufficient balance for payout", description="Payout")
             
             db.session.add(payout)
             db.session.commit()
@@ -386,7 +386,7 @@ class PaymentService:
             if not beneficiary:
                 raise ValueError("Beneficiary not found or doesn't belong to user")
             
-            if source_account.balance < amount:
+            if not BalanceService.has_funds(source_account, amount):
                 raise ValueError("Insufficient balance for transfer")
             
             # Create transfer record using existing payout infrastructure
@@ -412,12 +412,11 @@ class PaymentService:
             if not target_account:
                 raise ValueError("Target account not found or doesn't belong to user")
             
-            if source_account.balance < amount:
+            if not BalanceService.has_funds(source_account, amount):
                 raise ValueError("Insufficient balance for transfer")
             
             # Perform internal transfer (immediate)
-            source_account.balance -= float(amount)
-            target_account.balance += float(amount)
+            BalanceService.transfer(source_account_id, target_account_id, amount, currency, description="Internal transfer")
             
             # Create transaction record
             import time
@@ -457,7 +456,7 @@ class PaymentService:
             if not source_account:
                 raise ValueError("Source account not found or doesn't belong to user")
             
-            if source_account.balance < amount:
+            if not BalanceService.has_funds(source_account, amount):
                 raise ValueError("Insufficient balance for transfer")
             
             # Find target user and account
@@ -466,21 +465,16 @@ class PaymentService:
                 target_user = User.query.filter_by(email=target_user_email).first()
                 if not target_user:
                     raise ValueError(f"No customer found with email: {target_user_email}")
-                target_account = Account.query.filter_by(user_id=target_user.id, currency_code=currency, is_default=True).first()
+                target_account = Account.query_default(target_user.id, currency).first()
             elif target_account_number:
-                # Search through all accounts to find matching account number
-                all_accounts = Account.query.filter_by(currency_code=currency).all()
-                for account in all_accounts:
-                    if account.get_account_number() == target_account_number:
-                        target_account = account
-                        break
+                # Resolve the account number through the blind index
+                target_account = Account.find_by_account_number(target_account_number, currency_code=currency)
             
             if not target_account:
                 raise ValueError("Target customer account not found")
             
             # Perform customer transfer (immediate)
-            source_account.balance -= float(amount)
-            target_account.balance += float(amount)
+            BalanceService.transfer(source_account_id, target_account.id, amount, currency, description="Customer transfer")
             
             import time
             timestamp = int(time.time() * 1000)
@@ -517,12 +511,12 @@ class PaymentService:
             if not source_account:
                 raise ValueError("Source account not found or doesn't belong to user")
             
-            if source_account.balance < amount:
+            if not BalanceService.has_funds(source_account, amount):
                 raise ValueError("Insufficient balance for transfer")
             
             # For external transfers, we'd typically integrate with ACH/wire services
             # For now, create a mock external transfer
-            source_account.balance -= float(amount)
+            BalanceService.debit(source_account_id, amount, currency, "Insufficient balance for transfer", description="External transfer")
             
             import time
             timestamp = int(time.time() * 1000)
@@ -551,6 +545,215 @@ class PaymentService:
             logger.error(f"Error creating external transfer: {str(e)}")
             db.session.rollback()
             raise e
+
+    @staticmethod
+    def create_bulk_transfer(user_id, transfers, atomic=False):
+        """
+        Settle a batch of internal, customer and external transfers in one database transaction.
+
+        Every item is validated and its accounts resolved up front (one query per
+        lookup kind, not per item), the involved accounts are locked once, balance
+        changes and ledger postings are applied in bulk, and all Transaction and
+        TransactionView rows are written with multi-row inserts before a single commit.
+
+        Items are settled in request order against running balances, so an item that
+        would overdraw its source fails without affecting the others. With atomic=True
+        the whole batch is rejected if any item fails.
+
+        Returns {"batch_id": ..., "results": [...]} with one result per item in request order.
+        """
+        try:
+            results = [None] * len(transfers)
+            accepted = []
+
+            user_accounts = {str(account.id): account for account in Account.query.filter_by(user_id=user_id).all()}
+            default_accounts = {account.currency_code: account for account in user_accounts.values() if account.is_default}
+
+            # Resolve every customer target with one query per lookup kind
+            customer_items = [item for item in transfers if isinstance(item, dict) and item.get('transfer_type') == 'customer']
+            accounts_by_number = Account.find_by_account_numbers(
+                {item.get('target_account_number') for item in customer_items if item.get('target_account_number')}
+            )
+            emails = {item.get('target_user_email') for item in customer_items if item.get('target_user_email')}
+            accounts_by_email = {}
+            if emails:
+                users = User.query.filter(User.email.in_(emails)).all()
+                email_by_user = {str(user.id): user.email for user in users}
+                for account in Account.query.filter(Account.user_id.in_([user.id for user in users]), Account.is_default == True).all():
+                    accounts_by_email[(email_by_user[str(account.user_id)], account.currency_code)] = account
+
+            for index, item in enumerate(transfers):
+                def fail(message):
+                    results[index] = {"index": index, "status": "failed", "message": message}
+
+                if not isinstance(item, dict):
+                    fail("Each transfer must be an object")
+                    continue
+
+                missing = [field for field in ('amount', 'currency', 'transfer_type') if field not in item]
+                if missing:
+                    fail(f"Missing required field: {missing[0]}")
+                    continue
+
+                transfer_type = item['transfer_type']
+                currency = str(item['currency']).upper()
+                if transfer_type not in ('internal', 'customer', 'external'):
+                    fail("Invalid transfer_type. Must be one of: internal, customer, external")
+                    continue
+                if not PaymentConfig.is_payout_currency_supported(currency):
+                    fail(f"Currency {currency} is not supported for transfers")
+                    continue
+
+                try:
+                    amount = Decimal(str(item['amount']))
+                    minor = to_minor_units(amount, currency)
+                except Exception:
+                    fail("Invalid amount")
+                    continue
+                if minor <= 0:
+                    fail("Amount must be positive")
+                    continue
+
+                source_account_id = item.get('source_account_id')
+                source = user_accounts.get(str(source_account_id)) if source_account_id else default_accounts.get(currency)
+                if not source:
+                    fail("Source account not found or doesn't belong to user" if source_account_id
+                         else f"No default {currency} account found. Please specify source_account_id.")
+                    continue
+                if source.currency_code != currency:
+                    fail("Source account currency does not match transfer currency")
+                    continue
+
+                target = None
+                if transfer_type == 'internal':
+                    target = user_accounts.get(str(item.get('target_account_id')))
+                    if not target:
+                        fail("Target account not found or doesn't belong to user")
+                        continue
+                elif transfer_type == 'customer':
+                    if item.get('target_user_email'):
+                        target = accounts_by_email.get((item['target_user_email'], currency))
+                    elif item.get('target_account_number'):
+                        target = accounts_by_number.get(str(item['target_account_number']))
+                    else:
+                        fail("Either target_user_email or target_account_number is required for customer transfers")
+                        continue
+                    if not target:
+                        fail("Target customer account not found")
+                        continue
+                else:
+                    external_fields = ['target_account_number', 'target_routing_number', 'target_bank_name', 'target_account_holder']
+                    missing = [field for field in external_fields if not item.get(field)]
+                    if missing:
+                        fail(f"Missing required field for external transfer: {missing[0]}")
+                        continue
+
+                if target is not None:
+                    if target.currency_code != currency:
+                        fail("Target account currency does not match transfer currency")
+                        continue
+                    if target.id == source.id:
+                        fail("Source and target accounts must differ")
+                        continue
+
+                accepted.append({
+                    "index": index,
+                    "item": item,
+                    "transfer_type": transfer_type,
+                    "currency": currency,
+                    "amount": amount,
+                    "minor": minor,
+                    "source_id": source.id,
+                    "target_id": target.id if target is not None else None
+                })
+
+            # Lock every involved account once, in primary-key order
+            account_ids = {leg["source_id"] for leg in accepted} | {leg["target_id"] for leg in accepted if leg["target_id"]}
+            locked = BalanceService.lock_accounts(account_ids) if account_ids else []
+            available = {str(account.id): account.balance_minor for account in locked}
+
+            settled = []
+            for leg in accepted:
+                source_key = str(leg["source_id"])
+                if available[source_key] < leg["minor"]:
+                    results[leg["index"]] = {"index": leg["index"], "status": "failed", "message": "Insufficient balance for transfer"}
+                    continue
+                available[source_key] -= leg["minor"]
+                if leg["target_id"]:
+                    available[str(leg["target_id"])] += leg["minor"]
+                settled.append(leg)
+
+            if atomic and len(settled) != len(transfers):
+                db.session.rollback()
+                for leg in settled:
+                    results[leg["index"]] = {
+                        "index": leg["index"],
+                        "status": "rejected",
+                        "message": "Batch rejected because other transfers failed"
+                    }
+                return {"batch_id": None, "results": results}
+
+            batch_id = uuid.uuid4()
+            journals = []
+            transactions = []
+            for leg in settled:
+                journal_id = uuid.uuid4()
+                counterparty = leg["target_id"]  # None books the contra leg to the external account
+                label = f"{leg['transfer_type'].capitalize()} transfer"
+                journals.append({
+                    "journal_id": journal_id,
+                    "currency": leg["currency"],
+                    "description": label,
+                    "legs": [(leg["source_id"], -leg["minor"]), (counterparty, leg["minor"])]
+                })
+
+                item = leg["item"]
+                metadata = {
+                    "transfer_id": f"tr_{leg['transfer_type']}_{journal_id.hex}",
+                    "transfer_type": leg["transfer_type"],
+                    "batch_id": str(batch_id),
+                    "journal_id": str(journal_id)
+                }
+                if leg["transfer_type"] == 'external':
+                    metadata.update(
+                        target_bank_name=item.get('target_bank_name'),
+                        target_account_holder=item.get('target_account_holder')
+                    )
+                transactions.append({
+                    "user_id": user_id,
+                    "txn_type": "transfer",
+                    "status": "pending" if leg["transfer_type"] == 'external' else "succeeded",
+                    "amount": leg["amount"],
+                    "currency_code": leg["currency"],
+                    "description": item.get('description') or f"Transfer ({leg['transfer_type']})",
+                    "debit_account_id": leg["source_id"],
+                    "credit_account_id": leg["target_id"],
+                    "metadata": metadata
+                })
+                leg["transfer_id"] = metadata["transfer_id"]
+
+            BalanceService.post_batch(locked, journals, "Insufficient balance for transfer")
+            transaction_ids = TransactionService.create_transactions(transactions)
+            db.session.commit()
+
+            for leg, transaction_id in zip(settled, transaction_ids):
+                results[leg["index"]] = {
+                    "index": leg["index"],
+                    "status": "pending" if leg["transfer_type"] == 'external' else "completed",
+                    "transfer_id": leg["transfer_id"],
+                    "transaction_id": str(transaction_id),
+                    "transfer_type": leg["transfer_type"],
+                    "amount": str(leg["amount"]),
+                    "currency": leg["currency"]
+                }
+
+            logger.info(f"Settled bulk transfer batch {batch_id} for user {user_id}: {len(settled)}/{len(transfers)} transfers")
+            return {"batch_id": str(batch_id), "results": results}
+
+        except Exception as e:
+            logger.error(f"Error creating bulk transfer: {str(e)}")
+            db.session.rollback()
+            raise e
     
     @staticmethod
     def confirm_payment_intent(payment_intent_id, payment_method_id=None):
@@ -622,8 +825,11 @@ class PaymentService:
             payment_intent.update_status('succeeded')
             
             # Update account balance for wallet funding
-            if payment_intent.intent_type in ['wallet_funding', 'card_funding'] and payment_intent.account:
-                payment_intent.account.balance += payment_intent.amount
+            if payment_intent.intent_type in ['wallet_funding', 'card_funding'] and payment_intent.account_id:
+                BalanceService.credit(
+                    payment_intent.account_id, payment_intent.amount, payment_intent.currency,
+                    description=f"Payment {payment_intent_id}"
+                )
                 logger.info(f"Added {payment_intent.amount} {payment_intent.currency} to account {payment_intent.account_id}")
             
             # Mark invoice as paid for invoice payments
@@ -750,16 +956,12 @@ class PaymentService:
             if hasattr(stripe_intent, 'status') and stripe_intent.status == 'succeeded':
                 logger.info(f"Mock payment succeeded, updating account balance for intent {stripe_intent.id}")
                 try:
-                    # Directly update the account balance for mock payments
-                    account = Account.query.get(card.account_id)
-                    if account:
-                        old_balance = account.balance
-                        account.balance += amount
-                        db.session.commit()
-                        logger.info(f"Updated account {account.id} balance from {old_balance} to {account.balance}")
-                    else:
-                        logger.error(f"Account {card.account_id} not found for balance update")
+                    # Directly credit the account balance for mock payments
+                    BalanceService.credit(card.account_id, amount, currency, description="Card wallet funding")
+                    db.session.commit()
+                    logger.info(f"Credited {amount} {currency.upper()} to account {card.account_id}")
                 except Exception as e:
+                    db.session.rollback()
                     logger.error(f"Error processing mock payment {stripe_intent.id}: {str(e)}")
             
             logger.info(f"Created card payment intent {stripe_intent.id} for user {user_id} using card {card_id}")
@@ -0,0 +1,109 @@
+import uuid
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.models.transactions_model import Transaction, TransactionView
+from app.models.account_model import Account
+from app.models.payment_intent_model import PaymentIntent
+from app.models.invoice_model import Invoice, InvoiceStatus
+from app.models.user_model import User
+from app.models.two_factor_auth_model import TwoFactorAttempt
+from app.services.account_statement_service import AccountStatementService
+from app.utils.pagination import keyset_query
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class QueryPlanService:
+    """Service class checking that the hot query shapes are served by their indexes"""
+
+    @staticmethod
+    def hot_queries():
+        """
+        (name, query, expected index) for the queries the routes run on every request.
+
+        Each query comes from the same model or service helper the route calls, with
+        sample values, so a change to a route's query is checked as it really runs.
+        A tuple of indexes means any of them serves the query equally well.
+        """
+        user_id = uuid.uuid4()
+        now = datetime.utcnow()
+        return [
+            ('transactions: list',
+             keyset_query(Transaction.query_for_user(user_id), Transaction),
+             'idx_transaction_user_created'),
+            ('transactions: date range',
+             keyset_query(Transaction.query_for_user(user_id, start_date=now - timedelta(days=30)), Transaction),
+             'idx_transaction_user_created'),
+            ('transactions: type and status',
+             Transaction.query_for_user(user_id, transaction_type='transfer', status='succeeded'),
+             'idx_transaction_user_type_status'),
+            ('account transactions',
+             keyset_query(AccountStatementService.query(uuid.uuid4()), TransactionView),
+             'idx_transaction_view_account_statement'),
+            ('accounts: default',
+             Account.query_default(user_id),
+             'idx_account_user_default'),
+            ('accounts: default in currency',
+             Account.query_default(user_id, 'USD'),
+             ('idx_account_user_currency', 'idx_account_user_default')),
+            ('card payments',
+             keyset_query(PaymentIntent.query_for_card(user_id, uuid.uuid4()), PaymentIntent),
+             'idx_payment_intent_user_card_created'),
+            ('invoice: latest payment intent',
+             PaymentIntent.query_for_invoice(uuid.uuid4()),
+             'idx_payment_intent_invoice_created'),
+            ('payment redirect',
+             PaymentIntent.query_by_client_secret('cs_test'),
+             'idx_payment_intent_client_secret'),
+            ('invoices: pending',
+             Invoice.query_by_status(user_id, InvoiceStatus.PENDING.value).order_by(Invoice.due_date.desc()),
+             'idx_invoice_user_status_due'),
+            ('email verification',
+             User.query_by_verification_token('token'),
+             'idx_user_email_verification_token'),
+            ('2fa: recent failures',
+             TwoFactorAttempt.query_recent_failures(str(user_id)),
+             'idx_two_factor_attempt_user_success_created'),
+        ]
+
+    @staticmethod
+    def explain(query):
+        """Query plan of an ORM query as a list of lines (sample values are rendered inline)"""
+        dialect = db.session.get_bind().dialect
+        sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+        if dialect.name == 'sqlite':
+            # (id, parent, notused, detail)
+            return [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        return [row[0] for row in db.session.execute(text(f"EXPLAIN {sql}"))]
+
+    @staticmethod
+    def check():
+        """
+        Explain every hot query and report whether its plan uses the expected index.
+
+        PostgreSQL is told to avoid sequential scans for the check, since on small
+        or empty tables it would rightly prefer them; the question is only whether
+        the index can serve the query. Runs in a transaction that is rolled back.
+        """
+        results = []
+        try:
+            if db.session.get_bind().dialect.name == 'postgresql':
+                db.session.execute(text('SET LOCAL enable_seqscan = off'))
+            for name, query, indexes in QueryPlanService.hot_queries():
+                indexes = (indexes,) if isinstance(indexes, str) else indexes
+                plan = QueryPlanService.explain(query)
+                results.append({
+                    'name': name,
+                    'index': ' or '.join(indexes),
+                    'uses_index': any(index in line for index in indexes for line in plan),
+                    'plan': plan
+                })
+        finally:
+            db.session.rollback()
+
+        missing = [result['name'] for result in results if not result['uses_index']]
+        if missing:
+            logger.warning(f"Queries not using their index: {', '.join(missing)}")
+        return results
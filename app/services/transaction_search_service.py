@@ -0,0 +1,175 @@
+import re
+import logging
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import DDL, event, select, insert, delete, and_, or_, func, literal_column, table, column
+from app.models.transactions_model import Transaction
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# SQLite: FTS5 table holding one search document per transaction (PostgreSQL uses a
+# generated tsvector column on the transaction table instead, so it needs no syncing)
+SEARCH_TABLE = 'transaction_search'
+search_table = table(SEARCH_TABLE, column('transaction_id'), column('user_id'), column('document'))
+
+SQLITE_CREATE = DDL(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    "USING fts5(transaction_id UNINDEXED, user_id UNINDEXED, document)"
+)
+POSTGRES_CREATE = [
+    DDL(
+        "ALTER TABLE \"transaction\" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple'::regconfig, coalesce(description, '') || ' ' || type || ' ' || status "
+        "|| ' ' || currency_code)) STORED"
+    ),
+    DDL("CREATE INDEX IF NOT EXISTS idx_transaction_search ON \"transaction\" USING GIN (search_vector)"),
+]
+
+# Created with the transaction table, so db.create_all() databases get them as well as migrated ones
+event.listen(Transaction.__table__, 'after_create', SQLITE_CREATE.execute_if(dialect='sqlite'))
+for statement in POSTGRES_CREATE:
+    event.listen(Transaction.__table__, 'after_create', statement.execute_if(dialect='postgresql'))
+
+WORD_RE = re.compile(r'[^\W_]+')
+NUMBER = r'\d+(?:\.\d+)?'
+RANGE_RE = re.compile(rf'^({NUMBER})(?:-|\.\.)({NUMBER})$')
+COMPARISON_RE = re.compile(rf'^(>=|<=|>|<)({NUMBER})$')
+EXACT_RE = re.compile(rf'^{NUMBER}$')
+
+
+class TransactionSearchService:
+    """Service class for indexed transaction search"""
+
+    @staticmethod
+    def document(description, txn_type, status, currency_code):
+        return ' '.join(part for part in (description, txn_type, status, currency_code) if part)
+
+    @staticmethod
+    def index(transactions):
+        """
+        Add search documents for new transactions (dicts or Transaction rows) on the
+        caller's transaction. Only SQLite needs this; PostgreSQL computes the tsvector itself.
+        """
+        if not transactions or TransactionSearchService._dialect() != 'sqlite':
+            return
+        rows = []
+        for txn in transactions:
+            get = txn.get if isinstance(txn, dict) else lambda key, txn=txn: getattr(txn, key)
+            rows.append({
+                'transaction_id': str(get('id')),
+                'user_id': str(get('user_id')),
+                'document': TransactionSearchService.document(
+                    get('description'), get('type'), get('status'), get('currency_code')
+                )
+            })
+        db.session.execute(insert(search_table), rows)
+
+    @staticmethod
+    def remove(transaction_ids):
+        if not transaction_ids or TransactionSearchService._dialect() != 'sqlite':
+            return
+        db.session.execute(
+            delete(search_table).where(search_table.c.transaction_id.in_([str(txn_id) for txn_id in transaction_ids]))
+        )
+
+    @staticmethod
+    def reindex(batch_size=1000):
+        """Rebuild the SQLite search table from the transaction table; returns the number indexed"""
+        if TransactionSearchService._dialect() != 'sqlite':
+            return 0
+        db.session.execute(delete(search_table))
+        indexed = 0
+        last_id = None
+        while True:
+            query = select(
+                Transaction.id, Transaction.user_id, Transaction.description,
+                Transaction.type, Transaction.status, Transaction.currency_code
+            ).order_by(Transaction.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Transaction.id > last_id)
+            rows = [dict(row._mapping) for row in db.session.execute(query)]
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            TransactionSearchService.index(rows)
+            indexed += len(rows)
+        db.session.commit()
+        return indexed
+
+    @staticmethod
+    def parse(search):
+        """
+        Split a search string into words and amount conditions.
+
+        Amount syntax: ``100-200`` or ``100..200`` (inclusive), ``>50``, ``<=20``, and
+        bare numbers, which match amounts at the precision typed (``100`` matches
+        100.00 to 100.99) as well as numbers in the text. Returns (words, ranges,
+        numbers) where ranges are (operator, value) lists.
+        """
+        words = []
+        ranges = []
+        numbers = []
+        for token in search.split():
+            range_match = RANGE_RE.match(token)
+            comparison_match = COMPARISON_RE.match(token)
+            try:
+                if range_match:
+                    low, high = sorted(Decimal(value) for value in range_match.groups())
+                    ranges.append([('>=', low), ('<=', high)])
+                    continue
+                if comparison_match:
+                    ranges.append([(comparison_match.group(1), Decimal(comparison_match.group(2)))])
+                    continue
+                if EXACT_RE.match(token):
+                    value = Decimal(token)
+                    step = Decimal(1).scaleb(value.as_tuple().exponent)
+                    numbers.append((token, [('>=', value), ('<', value + step)]))
+                    continue
+            except InvalidOperation:
+                pass
+            words.extend(WORD_RE.findall(token.lower()))
+        return words, ranges, numbers
+
+    @staticmethod
+    def filter(query, user_id, search):
+        """Restrict a Transaction query to ``search``: indexed text match AND amount conditions"""
+        words, ranges, numbers = TransactionSearchService.parse(search)
+
+        conditions = [TransactionSearchService._amount_condition(conditions) for conditions in ranges]
+        if words:
+            conditions.append(TransactionSearchService._text_condition(user_id, words))
+        for token, amount_conditions in numbers:
+            conditions.append(or_(
+                TransactionSearchService._amount_condition(amount_conditions),
+                TransactionSearchService._text_condition(user_id, WORD_RE.findall(token))
+            ))
+        return query.filter(*conditions) if conditions else query
+
+    @staticmethod
+    def _amount_condition(conditions):
+        operators = {
+            '>': Transaction.amount.__gt__,
+            '>=': Transaction.amount.__ge__,
+            '<': Transaction.amount.__lt__,
+            '<=': Transaction.amount.__le__,
+        }
+        return and_(*[operators[operator](float(value)) for operator, value in conditions])
+
+    @staticmethod
+    def _text_condition(user_id, words):
+        """Every word must prefix-match a word of the transaction's search document"""
+        if TransactionSearchService._dialect() == 'postgresql':
+            tsquery = ' & '.join(f"{word}:*" for word in words)
+            return literal_column('"transaction".search_vector').op('@@')(func.to_tsquery('simple', tsquery))
+
+        match = ' '.join(f'"{word}"*' for word in words)
+        return Transaction.id.in_(
+            select(search_table.c.transaction_id).where(
+                literal_column(SEARCH_TABLE).op('MATCH')(match),
+                search_table.c.user_id == str(user_id)
+            )
+        )
+
+    @staticmethod
+    def _dialect():
+        return db.session.get_bind().dialect.name
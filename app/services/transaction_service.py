@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import insert
+from app.extensions import db
+from app.utils.money import to_minor_units
+from app.models.transactions_model import Transaction, TransactionView
+from app.services.transaction_search_service import TransactionSearchService
+
+
+class TransactionService:
+    """Service class for recording transactions and their per-account views"""
+
+    @staticmethod
+    def create_transaction(
+        *,
+        user_id,
+        txn_type,
+        status,
+        amount,
+        currency_code,
+        description=None,
+        debit_account_id=None,
+        credit_account_id=None,
+        payment_method_id=None,
+        beneficiary_id=None,
+        metadata=None,
+    ):
+        """
+        Create a Transaction row and associated TransactionView rows for quick listing.
+
+        Required params:
+          - user_id: UUID of the owner
+          - txn_type: e.g. 'wallet_fund_intent', 'wallet_fund', 'payout', 'transfer', 'card_wallet_fund_intent'
+          - status: 'pending' | 'succeeded' | 'failed' | 'canceled'
+          - amount: float or Decimal (stored as float and as integer minor units)
+          - currency_code: 'USD', 'EUR', etc.
+
+        Optional params help contextualize the transaction for UI and auditing.
+        """
+        created_at = datetime.utcnow()
+        txn = Transaction(
+            user_id=user_id,
+            debit_account_id=debit_account_id,
+            credit_account_id=credit_account_id,
+            payment_method_id=payment_method_id,
+            beneficiary_id=beneficiary_id,
+            type=txn_type,
+            status=status,
+            amount=float(amount),
+            fee=0.0,
+            amount_minor=to_minor_units(amount, currency_code),
+            fee_minor=0,
+            description=description,
+            currency_code=currency_code,
+            transction_metadata=metadata or {},
+            created_at=created_at,
+        )
+        db.session.add(txn)
+        db.session.flush()  # get txn.id
+        TransactionSearchService.index([txn])
+
+        # Create views for involved accounts to support per-account listings
+        if debit_account_id:
+            db.session.add(
+                TransactionView(
+                    transaction_id=txn.id,
+                    account_id=debit_account_id,
+                    view_type="debit",
+                    created_at=created_at,
+                )
+            )
+        if credit_account_id:
+            db.session.add(
+                TransactionView(
+                    transaction_id=txn.id,
+                    account_id=credit_account_id,
+                    view_type="credit",
+                    created_at=created_at,
+                )
+            )
+
+        # Caller is responsible for committing
+        return txn
+
+    @staticmethod
+    def create_transactions(entries):
+        """
+        Bulk variant of create_transaction for batch flows.
+
+        ``entries`` is a list of dicts taking the same keyword arguments as
+        create_transaction. All Transaction rows, then all TransactionView rows, are
+        written with one multi-row INSERT each. Returns the new transaction ids in order.
+        """
+        created_at = datetime.utcnow()
+        transactions = []
+        views = []
+
+        for entry in entries:
+            txn_id = uuid.uuid4()
+            transactions.append({
+                "id": txn_id,
+                "user_id": entry["user_id"],
+                "debit_account_id": entry.get("debit_account_id"),
+                "credit_account_id": entry.get("credit_account_id"),
+                "payment_method_id": entry.get("payment_method_id"),
+                "beneficiary_id": entry.get("beneficiary_id"),
+                "type": entry["txn_type"],
+                "status": entry["status"],
+                "amount": float(entry["amount"]),
+                "fee": 0.0,
+                "amount_minor": to_minor_units(entry["amount"], entry["currency_code"]),
+                "fee_minor": 0,
+                "description": entry.get("description"),
+                "currency_code": entry["currency_code"],
+                "transction_metadata": entry.get("metadata") or {},
+                "created_at": created_at,
+            })
+            for view_type, account_key in (("debit", "debit_account_id"), ("credit", "credit_account_id")):
+                if entry.get(account_key):
+                    views.append({
+                        "id": uuid.uuid4(),
+                        "transaction_id": txn_id,
+                        "account_id": entry[account_key],
+                        "view_type": view_type,
+                        "created_at": created_at,
+                    })
+
+        if transactions:
+            db.session.execute(insert(Transaction), transactions)
+            TransactionSearchService.index(transactions)
+        if views:
+            db.session.execute(insert(TransactionView), views)
+
+        # Caller is responsible for committing
+        return [txn["id"] for txn in transactions]
@@ -66,6 +66,7 @@ invoices_ns = api.namespace('invoices', description='Invoice management operatio
 invoice_payments_ns = api.namespace('invoice-payments', description='Invoice payment processing operations')
 notifications_ns = api.namespace('notifications', description='User notification operations')
 admin_notifications_ns = api.namespace('admin', description='Administrative notification operations')
+jobs_ns = api.namespace('jobs', description='Background job operations')
 
 # Import documentation classes to register them
 from app.docs.auth_docs import *
@@ -80,3 +81,4 @@ from app.docs.invoice_docs import *
 from app.docs.invoice_payments_docs import *
 from app.docs.notifications_docs import *
 from app.docs.admin_notifications_docs import *
+from app.docs.jobs_docs import *
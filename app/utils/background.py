@@ -0,0 +1,27 @@
+import click
+
+
+def serves_requests():
+    """False while the app is being created for a CLI command (`flask db upgrade`, `flask jobs work`, ...)"""
+    return click.get_current_context(silent=True) is None
+
+
+def start_with_app(app, start):
+    """
+    Run start(app) once the app serves requests.
+
+    Under a WSGI server (run.py, waitress) that is right away, so work left queued
+    by a previous process resumes without waiting for traffic. CLI commands never
+    start it, except `flask run`, which starts it on its first request.
+    """
+    if serves_requests():
+        start(app)
+        return
+
+    started = []
+
+    @app.before_request
+    def _start_background_work():
+        if not started:
+            started.append(True)
+            start(app)
@@ -0,0 +1,62 @@
+from flask import g, has_request_context
+from app.utils.keyring import keyring
+
+_MEMO_ATTR = '_decrypt_memo'
+
+
+def _memo():
+    """
+    Plaintexts decrypted during the current request, keyed by ciphertext.
+
+    Request-scoped only: job workers and CLI commands keep one app context open for
+    their whole run, where a memo would hold every account and card number decrypted.
+    """
+    if not has_request_context():
+        return None
+    memo = g.get(_MEMO_ATTR)
+    if memo is None:
+        memo = {}
+        setattr(g, _MEMO_ATTR, memo)
+    return memo
+
+
+def decrypt(cipher, token):
+    """
+    Decrypt a Fernet token once per request.
+
+    Serializing the same row several times (e.g. an account nested in many
+    transactions) reuses the first result instead of re-running HMAC + AES.
+    """
+    if token is None:
+        return None
+    token = bytes(token)
+    memo = _memo()
+    if memo is not None and token in memo:
+        return memo[token]
+    plaintext = cipher.decrypt(token).decode()
+    if memo is not None:
+        memo[token] = plaintext
+    return plaintext
+
+
+def decrypt_many(cipher, tokens):
+    """Decrypt a batch of tokens, each distinct ciphertext once; returns plaintexts in input order"""
+    unique = {}
+    for token in tokens:
+        if token is not None:
+            token = bytes(token)
+            if token not in unique:
+                unique[token] = decrypt(cipher, token)
+    return [unique[bytes(token)] if token is not None else None for token in tokens]
+
+
+def rotate_stale(instance, attribute, plaintext):
+    """
+    Lazily re-encrypt a column under the primary data key once it has been read.
+
+    The new ciphertext is only persisted if the surrounding transaction commits;
+    the offline `flask keys reencrypt` job covers rows that are never read.
+    """
+    rotated = keyring.rotate(getattr(instance, attribute), plaintext)
+    if rotated is not None:
+        setattr(instance, attribute, rotated)
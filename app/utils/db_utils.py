@@ -0,0 +1,14 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def is_unique_violation(error, column_name):
+    """True when a SQLAlchemy IntegrityError was raised by the unique constraint on ``column_name``"""
+    message = str(getattr(error, 'orig', error))
+    return column_name in message and ('unique' in message.lower() or 'duplicate' in message.lower())
+
+
+def upsert_insert(table, dialect_name):
+    """INSERT supporting .on_conflict_do_update() on the databases we run on (PostgreSQL, SQLite)"""
+    if dialect_name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
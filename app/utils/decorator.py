@@ -1,6 +1,7 @@
 from functools import wraps
-from flask import Flask, jsonify
-from flask_jwt_extended import get_jwt, jwt_required
+from flask import Flask, jsonify, request, make_response
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from app.services.idempotency_service import IdempotencyService
 
 def role_required(role):
     def wrapper(fn):
@@ -13,3 +14,62 @@ def role_required(role):
             return fn(*args, **kwargs)
         return decorator
     return wrapper
+
+
+def idempotent(fn):
+    """
+    Honour an Idempotency-Key header on a money-moving endpoint.
+
+    The first request with a key runs the handler and stores its response; retries
+    with the same key and body are answered from the store without running the
+    handler again. A duplicate arriving while the first is still in flight gets a
+    409, and reusing a key for a different request gets a 422. Server errors are
+    not stored, so the client may retry them. Must be applied under jwt_required().
+    """
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return fn(*args, **kwargs)
+        if len(key) > 255:
+            return jsonify({"status": 400, "message": "Idempotency-Key must be at most 255 characters"}), 400
+
+        payload = request.get_json(silent=True)
+        fingerprint = IdempotencyService.fingerprint(
+            request.method, request.path, payload if payload is not None else request.get_data()
+        )
+        outcome, record = IdempotencyService.begin(get_jwt_identity(), key, request.path, fingerprint)
+
+        if outcome == IdempotencyService.REPLAY:
+            response = jsonify(record.response_body)
+            response.status_code = record.response_status
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        if outcome == IdempotencyService.MISMATCH:
+            return jsonify({
+                "status": 422,
+                "message": "Idempotency-Key has already been used for a different request"
+            }), 422
+        if outcome == IdempotencyService.IN_PROGRESS:
+            response = jsonify({
+                "status": 409,
+                "message": "A request with this Idempotency-Key is already being processed"
+            })
+            response.status_code = 409
+            response.headers['Retry-After'] = '1'
+            return response
+
+        try:
+            with IdempotencyService.hold(record.id):
+                response = make_response(fn(*args, **kwargs))
+        except Exception:
+            IdempotencyService.release(record.id)
+            raise
+
+        body = response.get_json(silent=True) if response.is_json else None
+        if response.status_code >= 500 or body is None:
+            IdempotencyService.release(record.id)
+        else:
+            IdempotencyService.complete(record.id, response.status_code, body)
+        return response
+    return decorator
@@ -0,0 +1,44 @@
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+_presets = {}
+
+
+def eager_options(schema, model=None):
+    """
+    Loader options for every relationship ``schema`` dumps through a Nested field.
+
+    Follows the schema's own ``only``/``exclude``, recursing into nested schemas, so
+    the preset always matches what the dump touches: many-to-one relationships are
+    joined into the list query, collections get one selectin query each. Use as
+    ``query.options(*eager_options(schema))``; ``model`` is only needed for schemas
+    without ``Meta.model``. Presets are cached per schema shape.
+    """
+    model = model or getattr(schema.opts, 'model', None)
+    key = (type(schema), model, _frozen(schema.only), _frozen(schema.exclude))
+    if key not in _presets:
+        _presets[key] = _options_for(schema, model)
+    return _presets[key]
+
+
+def _frozen(names):
+    return frozenset(names) if names else frozenset()
+
+
+def _options_for(schema, model):
+    mapper = inspect(model)
+    options = []
+    for name, field in schema.dump_fields.items():
+        nested = field.inner if isinstance(field, fields.List) else field
+        if not isinstance(nested, fields.Nested):
+            continue
+        relationship = mapper.relationships.get(field.attribute or name)
+        if relationship is None:
+            continue
+
+        attribute = getattr(model, relationship.key)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        child_options = _options_for(nested.schema, relationship.mapper.class_)
+        options.append(loader.options(*child_options) if child_options else loader)
+    return options
@@ -0,0 +1,59 @@
+import threading
+from flask import current_app
+
+TEMPLATE_DIR = 'email'
+
+# Registered email templates: name -> file under app/templates/email/
+EMAIL_TEMPLATES = {
+    'verify_email': 'verify_email.html',
+    'password_reset': 'password_reset.html',
+    'two_factor_enabled': 'two_factor_enabled.html',
+    'login_notification': 'login_notification.html',
+    'transaction_notification': 'transaction_notification.html',
+    'welcome': 'welcome.html',
+    'security_alert': 'security_alert.html',
+    'system_notification': 'system_notification.html',
+    'transaction_update': 'transaction_update.html',
+}
+
+
+class EmailTemplateRegistry:
+    """
+    Compiled email templates, parsed once per application.
+
+    render_template_string re-parses and re-compiles its source on every call; here
+    each registered template is compiled on first use and the compiled Template is
+    reused for every later render. Templates are autoescaped like any other .html
+    template of the app.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['email_templates'] = {}
+
+    def get(self, name):
+        """The compiled template registered under ``name``"""
+        compiled = current_app.extensions.setdefault('email_templates', {})
+        template = compiled.get(name)
+        if template is None:
+            if name not in EMAIL_TEMPLATES:
+                raise KeyError(f"Unknown email template: {name}")
+            with self._lock:
+                template = compiled.get(name)
+                if template is None:
+                    template = current_app.jinja_env.get_template(f"{TEMPLATE_DIR}/{EMAIL_TEMPLATES[name]}")
+                    compiled[name] = template
+        return template
+
+    def render(self, name, **context):
+        return self.get(name).render(**context)
+
+    def render_many(self, name, contexts):
+        """Render one template for many recipients' contexts; returns the HTML bodies in order"""
+        render = self.get(name).render
+        return [render(**context) for context in contexts]
+
+
+email_templates = EmailTemplateRegistry()
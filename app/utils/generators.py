@@ -1,7 +1,9 @@
 import hashlib
+import hmac
 import secrets
 import string
 import uuid
+from app.config import Config
 
 class AccountNumberGenerator:
     @staticmethod
@@ -47,27 +49,43 @@ class AccountNumberGenerator:
         return str((10 - (checksum % 10)) % 10)
     
     @staticmethod
-    def generate_hash(account_number):
-        """Generate a hash for uniqueness checking"""
-        return hashlib.sha256(account_number.encode()).hexdigest()
+    def generate_hash(account_number, key=None):
+        """Generate the keyed blind index (HMAC-SHA256) used for lookups and uniqueness checking"""
+        key = key or Config.ACCOUNT_NUMBER_HASH_KEY
+        return hmac.new(key.encode(), account_number.encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def lookup_hashes(account_number):
+        """
+        Return every blind-index value an account number may currently be stored under:
+        the current key, any retired keys still being rotated out, and the legacy
+        unkeyed SHA-256 used before the backfill ran.
+        """
+        hashes = [AccountNumberGenerator.generate_hash(account_number)]
+        for key in Config.ACCOUNT_NUMBER_HASH_PREVIOUS_KEYS:
+            hashes.append(AccountNumberGenerator.generate_hash(account_number, key))
+        hashes.append(hashlib.sha256(account_number.encode()).hexdigest())
+        return hashes
 
 
 class CardNumberGenerator:
     @staticmethod
-    def generate_card_number(user_id: str, bin_prefix: str = "543200", length: int = 16) -> str:
+    def generate_card_number(user_id: str, bin_prefix: str = "543200", length: int = 16, user_digits: int = 6) -> str:
         """
         Generate a 16-digit card number (internal use) using:
         - 6-digit BIN prefix
-        - 6-digit user-based component
+        - user_digits-digit user-based component (0 for none)
         - variable random digits to reach (length-1)
         - 1-digit Luhn check digit
         """
         # Normalize BIN to 6 digits
         bin_part = (bin_prefix or "").strip()[:6].ljust(6, '0')
 
-        # Derive a 6-digit component from user UUID for stability per-user
-        user_uuid = uuid.UUID(user_id)
-        user_component = str(user_uuid.int % 1_000_000).zfill(6)
+        # Derive a component from user UUID for stability per-user
+        user_component = ''
+        if user_digits:
+            user_uuid = uuid.UUID(user_id)
+            user_component = str(user_uuid.int % 10 ** user_digits).zfill(user_digits)
 
         # Fill remaining digits (excluding check digit)
         target_without_check = length - 1
@@ -79,3 +97,26 @@ class CardNumberGenerator:
         check_digit = AccountNumberGenerator._calculate_luhn_check_digit(partial)
 
         return partial + check_digit
+
+    @staticmethod
+    def generate_card_numbers(user_ids, bin_prefix: str = "543200", length: int = 16, exclude=None, max_attempts: int = 50):
+        """
+        Generate a block of card numbers, one per entry of user_ids, that are distinct
+        from each other and from ``exclude`` (numbers known to be taken).
+
+        Bulk numbers carry no user component: with it a user only has three random
+        digits (~1000 numbers), and a campaign issuing more than that to one user
+        would fail mid-job. The full random segment leaves uniqueness to the hash check.
+        """
+        taken = set(exclude or ())
+        numbers = []
+        for user_id in user_ids:
+            for _ in range(max_attempts):
+                number = CardNumberGenerator.generate_card_number(str(user_id), bin_prefix, length, user_digits=0)
+                if number not in taken:
+                    break
+            else:
+                raise ValueError(f"Could not generate a free card number for user {user_id}")
+            taken.add(number)
+            numbers.append(number)
+        return numbers
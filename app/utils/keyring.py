@@ -0,0 +1,350 @@
+import os
+import time
+import uuid
+import base64
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.fernet import Fernet, InvalidToken
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Ciphertexts are stored as b"<data key id>$<fernet token>"; Fernet tokens never contain '$'
+KEY_ID_SEPARATOR = b'$'
+DEV_ENCRYPTION_KEY = 'dev-encryption-key-change-in-production'
+
+
+def _fernet_or_none(key):
+    try:
+        return Fernet(key.encode('utf-8') if isinstance(key, str) else key)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_master_keys(config):
+    """
+    Master keys from ENCRYPTION_MASTER_KEYS ("id:fernet-key,id:fernet-key", current first).
+
+    Without explicit master keys one is derived deterministically from
+    ACCOUNT_ENCRYPTION_KEY, so data stays readable across restarts even on the dev
+    default (which is logged loudly rather than silently replaced by a random key).
+    """
+    master_keys = []
+    for entry in (config.ENCRYPTION_MASTER_KEYS or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key_id, _, key = entry.partition(':')
+        fernet = _fernet_or_none(key)
+        if not key_id or fernet is None:
+            raise ValueError(f"Invalid ENCRYPTION_MASTER_KEYS entry for key id '{key_id}'")
+        master_keys.append((key_id, fernet))
+
+    if not master_keys:
+        secret = config.ACCOUNT_ENCRYPTION_KEY or DEV_ENCRYPTION_KEY
+        if secret == DEV_ENCRYPTION_KEY:
+            logger.warning("Using the development encryption key; set ENCRYPTION_MASTER_KEYS in production")
+        derived = base64.urlsafe_b64encode(hashlib.sha256(secret.encode('utf-8')).digest())
+        master_keys.append(('derived', Fernet(derived)))
+    return master_keys
+
+
+class KeyRing:
+    """
+    Envelope encryption for sensitive columns.
+
+    Data is encrypted with versioned data keys (DEKs) stored wrapped by a master
+    key in the encryption_keys table; each ciphertext is prefixed with the id of
+    its DEK. Like MultiFernet, decryption accepts any known key and rotate()
+    re-encrypts with the primary key, so readers can migrate rows lazily. Bare
+    tokens written before the key ring existed are read with ACCOUNT_ENCRYPTION_KEY.
+    """
+
+    def __init__(self, master_keys, legacy_key=None, refresh_seconds=300):
+        self.master_keys = master_keys
+        self.legacy_key = legacy_key
+        self.legacy = _fernet_or_none(legacy_key) if legacy_key else None
+        self.refresh_seconds = refresh_seconds
+        self._data_keys = {}  # key id -> Fernet
+        self._unwrapped = {}  # key id -> raw key, needed to re-wrap and to hand to worker processes
+        self._primary_id = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        legacy_key = config.ACCOUNT_ENCRYPTION_KEY
+        if legacy_key == DEV_ENCRYPTION_KEY or _fernet_or_none(legacy_key or '') is None:
+            legacy_key = None
+        return cls(parse_master_keys(config), legacy_key, config.KEYRING_REFRESH_SECONDS)
+
+    @classmethod
+    def from_material(cls, material):
+        """Rebuild an offline key ring (no database access) from export_material()"""
+        ring = cls([], material['legacy_key'], refresh_seconds=None)
+        ring._unwrapped = dict(material['data_keys'])
+        ring._data_keys = {key_id: Fernet(key) for key_id, key in material['data_keys'].items()}
+        ring._primary_id = material['primary_id']
+        ring._loaded_at = float('inf')
+        return ring
+
+    def export_material(self):
+        """Unwrapped key material for worker processes of the re-encrypt job"""
+        self._ensure_loaded()
+        return {
+            'data_keys': dict(self._unwrapped),
+            'primary_id': self._primary_id,
+            'legacy_key': self.legacy_key
+        }
+
+    @property
+    def primary_id(self):
+        self._ensure_loaded()
+        return self._primary_id
+
+    def encrypt(self, plaintext):
+        """Encrypt bytes with the primary data key; returns b'<key id>$<token>'"""
+        self._ensure_loaded()
+        if self._primary_id is None:
+            # Possibly created by another process since we last loaded
+            self.reload()
+            if self._primary_id is None:
+                raise RuntimeError("No active data encryption key; run `flask db upgrade` or `flask keys rotate`")
+        token = self._data_keys[self._primary_id].encrypt(plaintext)
+        return self._primary_id.encode() + KEY_ID_SEPARATOR + token
+
+    def decrypt(self, blob):
+        """Decrypt a blob written by encrypt() or a legacy bare Fernet token"""
+        key_id, token = self._split(blob)
+        return self._cipher_for(key_id).decrypt(token)
+
+    def key_id_of(self, blob):
+        return self._split(blob)[0]
+
+    def needs_rotation(self, blob):
+        return self.key_id_of(blob) != self.primary_id
+
+    def rotate(self, blob, plaintext=None):
+        """Re-encrypt a blob under the primary key; None when it already uses it"""
+        if not blob or not self.needs_rotation(blob):
+            return None
+        if plaintext is None:
+            plaintext = self.decrypt(blob)
+        elif isinstance(plaintext, str):
+            plaintext = plaintext.encode()
+        return self.encrypt(plaintext)
+
+    def new_key_row(self):
+        """Column values of a fresh DEK wrapped with the current master key"""
+        master_id, master = self.master_keys[0]
+        return {
+            'id': f"dk{uuid.uuid4().hex[:12]}",
+            'wrapped_key': master.encrypt(Fernet.generate_key()),
+            'master_key_id': master_id,
+            'status': 'active'
+        }
+
+    def create_data_key(self):
+        """
+        Generate a new DEK, wrap it with the current master key and make it primary.
+
+        Run from `flask keys rotate`, never inside a request: it commits on its own
+        connection, which on SQLite would wait behind the request's write lock.
+        """
+        from app.extensions import db
+        from app.models.encryption_key_model import EncryptionKey
+
+        row = self.new_key_row()
+        # Committed on its own connection: a DEK must never be rolled back with the caller's transaction
+        with db.engine.begin() as connection:
+            connection.execute(
+                EncryptionKey.__table__.update()
+                .where(EncryptionKey.__table__.c.status == 'active')
+                .values(status='retired')
+            )
+            connection.execute(EncryptionKey.__table__.insert().values(**row))
+        logger.info(f"Created data encryption key {row['id']}")
+        self.reload()
+        return row['id']
+
+    def rewrap_data_keys(self):
+        """Re-wrap every DEK with the current master key (master key rotation; no data is re-encrypted)"""
+        from app.extensions import db
+        from app.models.encryption_key_model import EncryptionKey
+
+        self._ensure_loaded()
+        master_id, master = self.master_keys[0]
+        rewrapped = 0
+        for row in EncryptionKey.query.filter(EncryptionKey.master_key_id != master_id).all():
+            row.wrapped_key = master.encrypt(self._unwrapped[row.id])
+            row.master_key_id = master_id
+            rewrapped += 1
+        db.session.commit()
+        return rewrapped
+
+    def reload(self):
+        with self._lock:
+            self._load()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or (
+            self.refresh_seconds is not None and time.monotonic() - self._loaded_at > self.refresh_seconds
+        ):
+            self.reload()
+
+    def _load(self):
+        from app.extensions import db
+        from app.models.encryption_key_model import EncryptionKey
+
+        # Read on a separate connection so loading keys never autoflushes the caller's half-built rows
+        table = EncryptionKey.__table__
+        with db.engine.connect() as connection:
+            rows = connection.execute(table.select().order_by(table.c.created_at)).all()
+
+        masters = dict(self.master_keys)
+        data_keys = {}
+        unwrapped = {}
+        primary_id = None
+        for row in rows:
+            master = masters.get(row.master_key_id)
+            if master is None:
+                logger.error(f"Data key {row.id} is wrapped by unknown master key {row.master_key_id}")
+                continue
+            try:
+                key = master.decrypt(row.wrapped_key)
+            except InvalidToken:
+                logger.error(f"Could not unwrap data key {row.id} with master key {row.master_key_id}")
+                continue
+            data_keys[row.id] = Fernet(key)
+            unwrapped[row.id] = key
+            if row.status == 'active':
+                primary_id = row.id
+
+        self._data_keys = data_keys
+        self._unwrapped = unwrapped
+        self._primary_id = primary_id
+        self._loaded_at = time.monotonic()
+
+    def _cipher_for(self, key_id):
+        if key_id is None:
+            if self.legacy is None:
+                raise InvalidToken("No legacy encryption key configured for unversioned ciphertext")
+            return self.legacy
+        cipher = self._data_keys.get(key_id)
+        if cipher is None:
+            # Possibly created by another process since we last loaded
+            self.reload()
+            cipher = self._data_keys.get(key_id)
+            if cipher is None:
+                raise InvalidToken(f"Unknown data key {key_id}")
+        return cipher
+
+    @staticmethod
+    def _split(blob):
+        blob = bytes(blob)
+        key_id, separator, token = blob.partition(KEY_ID_SEPARATOR)
+        if not separator:
+            return None, blob
+        return key_id.decode(), token
+
+
+# Key ring of a re-encrypt worker process, built once by the pool initializer
+_worker_ring = None
+
+
+def _init_reencrypt_worker(material):
+    global _worker_ring
+    _worker_ring = KeyRing.from_material(material)
+
+
+def _reencrypt_chunk(rows, ring=None):
+    """Re-encrypt (id, blob, blob, ...) rows under the primary key; returns (id, old blobs, new blobs) for changed rows"""
+    ring = ring or _worker_ring
+    changed = []
+    for row_id, *blobs in rows:
+        rotated = [ring.rotate(blob) if blob else None for blob in blobs]
+        if any(blob is not None for blob in rotated):
+            new_blobs = [new if new is not None else old for old, new in zip(blobs, rotated)]
+            changed.append((row_id, blobs, new_blobs))
+    return changed
+
+
+def reencrypt_table(table, column_names, chunk_size=1000, workers=None):
+    """
+    Move every ciphertext in ``table`` to the primary data key.
+
+    Rows are streamed in primary-key order (keyset paging, one chunk in memory per
+    worker), decrypted and re-encrypted in a process pool, and written back with one
+    executemany UPDATE per chunk, committed per chunk. Each UPDATE only applies if the
+    row still holds the ciphertext that was read, so concurrent application writes win
+    and the row is simply picked up again on the next run. ``workers=0`` runs inline.
+    Returns the number of rows re-encrypted.
+    """
+    from sqlalchemy import select, update, and_, bindparam
+    from app.extensions import db
+
+    if keyring.primary_id is None:
+        keyring.create_data_key()
+
+    id_column = table.c.id
+    columns = [table.c[name] for name in column_names]
+    statement = (
+        update(table)
+        .where(and_(id_column == bindparam('_id'), *[
+            column == bindparam(f'_old_{column.name}') for column in columns
+        ]))
+        .values({column.name: bindparam(f'_new_{column.name}') for column in columns})
+    )
+
+    def chunks():
+        last_id = None
+        while True:
+            query = select(id_column, *columns).order_by(id_column).limit(chunk_size)
+            if last_id is not None:
+                query = query.where(id_column > last_id)
+            rows = [tuple(row) for row in db.session.execute(query)]
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    def write(changed):
+        if not changed:
+            return 0
+        params = []
+        for row_id, old_blobs, new_blobs in changed:
+            values = {'_id': row_id}
+            for column, old, new in zip(columns, old_blobs, new_blobs):
+                values[f'_old_{column.name}'] = old
+                values[f'_new_{column.name}'] = new
+            params.append(values)
+        result = db.session.execute(statement, params)
+        db.session.commit()
+        return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(params)
+
+    written = 0
+    if workers == 0:
+        for rows in chunks():
+            written += write(_reencrypt_chunk(rows, keyring))
+        return written
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_reencrypt_worker,
+        initargs=(keyring.export_material(),)
+    ) as pool:
+        in_flight = deque()
+        window = (workers or os.cpu_count() or 1) * 2
+        for rows in chunks():
+            in_flight.append(pool.submit(_reencrypt_chunk, rows))
+            if len(in_flight) >= window:
+                written += write(in_flight.popleft().result())
+        while in_flight:
+            written += write(in_flight.popleft().result())
+    return written
+
+
+keyring = KeyRing.from_config(Config)
@@ -0,0 +1,31 @@
+from decimal import Decimal, ROUND_HALF_UP
+from app.config.payment_config import PaymentConfig
+
+
+def _scale(currency):
+    return Decimal(10) ** PaymentConfig.get_currency_exponent(currency)
+
+
+def quantize_amount(amount, currency):
+    """Round an amount to the precision of its currency (e.g. 2 places for USD, 0 for JPY)"""
+    exponent = PaymentConfig.get_currency_exponent(currency)
+    return Decimal(str(amount)).quantize(Decimal(1).scaleb(-exponent), rounding=ROUND_HALF_UP)
+
+
+def to_minor_units(amount, currency):
+    """Convert a major-unit amount (Decimal, float or str) to integer minor units, e.g. 12.34 USD -> 1234"""
+    if amount is None:
+        return None
+    return int(quantize_amount(amount, currency) * _scale(currency))
+
+
+def from_minor_units(minor_units, currency):
+    """Convert integer minor units back to a Decimal major-unit amount, e.g. 1234 USD -> Decimal('12.34')"""
+    if minor_units is None:
+        return None
+    return quantize_amount(Decimal(int(minor_units)) / _scale(currency), currency)
+
+
+def sum_minor_units(amounts, currency):
+    """Sum major-unit amounts exactly by accumulating in minor units"""
+    return from_minor_units(sum(to_minor_units(amount, currency) for amount in amounts), currency)
@@ -0,0 +1,96 @@
+import json
+import uuid
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was tampered with or belongs to a different sort order"""
+
+
+def cursor_requested(args):
+    """Cursor mode is opted into by passing ``cursor`` (empty for the first page)"""
+    return 'cursor' in args
+
+
+def total_requested(args):
+    return str(args.get('include_total', '')).lower() in ['true', '1', 'yes']
+
+
+def encode_cursor(created_at, row_id, descending=True):
+    """Opaque cursor for the position after a row: its (created_at, id) and the sort direction"""
+    payload = [created_at.isoformat(), str(row_id), 'desc' if descending else 'asc']
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, descending=True):
+    """(created_at, id) of a cursor produced by encode_cursor for the same sort direction"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(created_at)
+        row_id = uuid.UUID(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor("Invalid cursor")
+    if direction != ('desc' if descending else 'asc'):
+        raise InvalidCursor("Cursor does not match the requested sort order")
+    return created_at, row_id
+
+
+class CursorPage:
+    """One page of keyset pagination"""
+
+    def __init__(self, items, size, next_cursor, total=None):
+        self.items = items
+        self.size = size
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.total = total
+
+    def to_dict(self):
+        pagination = {
+            'size': self.size,
+            'has_next': self.has_next,
+            'next_cursor': self.next_cursor
+        }
+        if self.total is not None:
+            pagination['total'] = self.total
+        return pagination
+
+
+def keyset_query(query, model, cursor=None, descending=True):
+    """
+    ``query`` ordered on (created_at, id) and positioned after ``cursor``.
+
+    Any ordering already on the query is replaced. Raises InvalidCursor.
+    """
+    order_columns = (model.created_at, model.id)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, descending)
+        position = tuple_(*order_columns)
+        query = query.filter(position < (created_at, row_id) if descending else position > (created_at, row_id))
+
+    return query.order_by(None).order_by(*[
+        column.desc() if descending else column.asc() for column in order_columns
+    ])
+
+
+def paginate_by_cursor(query, model, size, cursor=None, descending=True, include_total=False):
+    """
+    Keyset-paginate ``query`` on (created_at, id); see keyset_query.
+
+    Unlike .paginate(), a page costs one indexed range scan however deep it is, and
+    the COUNT(*) over the whole filtered set only runs when ``include_total`` is
+    set. Raises InvalidCursor.
+    """
+    total = query.order_by(None).count() if include_total else None
+
+    rows = keyset_query(query, model, cursor, descending).limit(size + 1).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id, descending)
+    return CursorPage(rows, size, next_cursor, total)
@@ -0,0 +1,101 @@
+import logging
+import threading
+from contextlib import contextmanager
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+# The listener is only attached while a counter or the monitor needs it, so
+# statements pay nothing for counting in the default configuration
+_listener_users = 0
+_listener_lock = threading.Lock()
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in getattr(_local, 'counters', ()):
+        counter.statements.append(statement)
+    if has_app_context() and g.get('sql_statement_count') is not None:
+        g.sql_statement_count += 1
+
+
+def _attach():
+    global _listener_users
+    with _listener_lock:
+        if _listener_users == 0:
+            event.listen(Engine, 'before_cursor_execute', _count_statement)
+        _listener_users += 1
+
+
+def _detach():
+    global _listener_users
+    with _listener_lock:
+        _listener_users -= 1
+        if _listener_users == 0:
+            event.remove(Engine, 'before_cursor_execute', _count_statement)
+
+
+class StatementCounter:
+    """Records the SQL statements executed on this thread while it is active"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        if not hasattr(_local, 'counters'):
+            _local.counters = []
+        _local.counters.append(self)
+        _attach()
+        return self
+
+    def __exit__(self, *exc_info):
+        _detach()
+        _local.counters.remove(self)
+        return False
+
+
+@contextmanager
+def assert_max_statements(limit):
+    """
+    Fail if the block executes more than ``limit`` SQL statements.
+
+    Meant for tests pinning an endpoint's query count, e.g.
+    ``with assert_max_statements(3): client.get('/api/transactions?size=100')``,
+    so a lazy load creeping into a list endpoint shows up as a failure.
+    """
+    with StatementCounter() as counter:
+        yield counter
+    if counter.count > limit:
+        listing = '\n'.join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(f"Expected at most {limit} SQL statements, got {counter.count}:\n{listing}")
+
+
+class StatementMonitor:
+    """Logs requests whose SQL statement count exceeds SQL_STATEMENT_WARN_THRESHOLD"""
+
+    def init_app(self, app):
+        threshold = app.config.get('SQL_STATEMENT_WARN_THRESHOLD', 0)
+        if threshold <= 0:
+            return
+        _attach()
+
+        @app.before_request
+        def _start_counting():
+            g.sql_statement_count = 0
+
+        @app.after_request
+        def _report_count(response):
+            count = g.get('sql_statement_count')
+            if count is not None and count > threshold:
+                logger.warning(f"{request.method} {request.path} ({request.endpoint}) ran {count} SQL statements")
+            return response
+
+
+statement_monitor = StatementMonitor()
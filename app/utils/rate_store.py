@@ -0,0 +1,326 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+import requests
+from werkzeug.utils import import_string
+from app.schema.account_schema import VALID_CURRENCY_CODES
+from app.utils.background import start_with_app
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; every process may refresh
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateBackend:
+    """Keeps the rate snapshot in this process only"""
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def __init__(self):
+        self._snapshot = None
+
+    def load(self):
+        return self._snapshot
+
+    def save(self, snapshot):
+        self._snapshot = snapshot
+
+    @contextmanager
+    def refresh_lock(self):
+        yield True
+
+
+class FileRateBackend:
+    """
+    Shares the rate snapshot between processes through a JSON file.
+
+    Writes go to a temporary file that is atomically renamed over the snapshot, so
+    readers never see a partial file; the parsed snapshot is only re-read when the
+    file's mtime changes. A non-blocking flock on a sidecar lock file elects a single
+    process to call the provider.
+    """
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('FX_RATE_STORE_PATH') or os.path.join(tempfile.gettempdir(), 'swipe_fx_rates.json'))
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._snapshot = None
+
+    def load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as fh:
+                    self._snapshot = json.load(fh)
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read FX rate snapshot {self.path}: {e}")
+        return self._snapshot
+
+    def save(self, snapshot):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.fx_rates_')
+        try:
+            with os.fdopen(fd, 'w') as fh:
+                json.dump(snapshot, fh)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @contextmanager
+    def refresh_lock(self):
+        if fcntl is None:
+            yield True
+            return
+        with open(self.path + '.lock', 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+RATE_BACKENDS = {
+    'memory': MemoryRateBackend,
+    'file': FileRateBackend,
+}
+
+
+class RateStore:
+    """
+    Process-safe FX rate store shared by every request, thread and worker.
+
+    One provider call per refresh fetches all rates against FX_RATE_FETCH_BASE; the
+    cross-rate matrix for every VALID_CURRENCY_CODES base is derived from it. A
+    background thread refreshes FX_RATE_REFRESH_AHEAD_SECONDS before expiry, and
+    readers are served the last snapshot (stale-while-revalidate, up to
+    FX_RATE_MAX_STALE_SECONDS) so a request never waits on the provider once a
+    snapshot exists. Before the first one, readers fetch synchronously.
+    """
+
+    def __init__(self):
+        self.backend = MemoryRateBackend()
+        self.provider_url = 'https://open.er-api.com/v6/latest/{base}'
+        self.fetch_base = 'USD'
+        self.ttl = 6 * 3600
+        self.refresh_ahead = 30 * 60
+        self.max_stale = 24 * 3600
+        self.retry_interval = 60
+        self.background = True
+        self._serving = False  # set once the app serves requests; CLI commands never start the refresher
+
+        self._snapshot = None  # raw snapshot the matrix was built from
+        self._matrix = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._listeners = []
+        self._last_failed_fetch = None
+
+    def init_app(self, app):
+        config = app.config
+        backend = config.get('FX_RATE_STORE_BACKEND', 'file')
+        backend_cls = RATE_BACKENDS[backend] if backend in RATE_BACKENDS else import_string(backend)
+        self.backend = backend_cls.from_config(config)
+        self.provider_url = config.get('FX_PROVIDER_URL', self.provider_url)
+        self.fetch_base = config.get('FX_RATE_FETCH_BASE', self.fetch_base)
+        self.ttl = config.get('FX_RATE_TTL_SECONDS', self.ttl)
+        self.refresh_ahead = config.get('FX_RATE_REFRESH_AHEAD_SECONDS', self.refresh_ahead)
+        self.max_stale = config.get('FX_RATE_MAX_STALE_SECONDS', self.max_stale)
+        self.background = config.get('FX_RATE_BACKGROUND_REFRESH', self.background)
+        self._listeners = []  # listeners are bound to the app being initialised
+        app.extensions['rate_store'] = self
+        # Load rates at startup rather than on the first /rates or /balances call
+        self._serving = False
+        start_with_app(app, self.start)
+
+    def start(self, app):
+        self._serving = True
+        self._ensure_refresher()
+
+    @property
+    def version(self):
+        """Identifies the snapshot currently served (its fetch time), None before the first one"""
+        return self._snapshot['fetched_at'] if self._snapshot else None
+
+    @property
+    def snapshot(self):
+        """Raw snapshot currently served ({'base', 'fetched_at', 'rates'}), None before the first one"""
+        return self._snapshot
+
+    def on_refresh(self, callback):
+        """Register callback(snapshot) to run after each successful provider fetch"""
+        self._listeners.append(callback)
+        return callback
+
+    def get_rates(self, base_currency):
+        """Rates per 1 unit of base_currency, or None when no usable snapshot exists yet"""
+        snapshot = self._current()
+        self._ensure_refresher()
+
+        if snapshot is None:
+            snapshot = self._initial_fetch()
+            if snapshot is None:
+                return None
+
+        age = time.time() - snapshot['fetched_at']
+        if age >= self.ttl:
+            self.refresh_async()
+        if age > self.max_stale:
+            logger.error(f"FX rates are {int(age)}s old, beyond FX_RATE_MAX_STALE_SECONDS")
+            return None
+
+        return self._rates_for(base_currency.upper())
+
+    def get_rate(self, from_currency, to_currency):
+        """Units of to_currency per 1 unit of from_currency"""
+        rates = self.get_rates(from_currency)
+        return rates.get(to_currency.upper()) if rates else None
+
+    def refresh(self):
+        """Fetch from the provider unless another process holds the refresh lock; True when a snapshot is available"""
+        with self.backend.refresh_lock() as acquired:
+            if not acquired:
+                return self._current() is not None
+
+            # Another process may have refreshed while we waited for the lock
+            snapshot = self._current()
+            if snapshot is not None and time.time() - snapshot['fetched_at'] < self.ttl - self.refresh_ahead:
+                return True
+
+            snapshot = self._fetch()
+            if snapshot is None:
+                return False
+            self.backend.save(snapshot)
+
+        self._current()
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"FX rate refresh listener failed: {e}")
+        return True
+
+    def _initial_fetch(self):
+        """
+        Fetch synchronously when there is nothing to serve yet (e.g. right after a
+        deploy). Concurrent callers wait for one fetch; after a failure, callers get
+        None without waiting until retry_interval has passed.
+        """
+        if self._last_failed_fetch and time.time() - self._last_failed_fetch < self.retry_interval:
+            return None
+        with self._refresh_lock:
+            snapshot = self._current()
+            if snapshot is None:
+                self.refresh()
+                snapshot = self._current()
+            self._last_failed_fetch = None if snapshot is not None else time.time()
+        return snapshot
+
+    def refresh_async(self):
+        """Start a refresh in a daemon thread unless one is already running"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=run, name='fx-rate-refresh', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _ensure_refresher(self):
+        if not self.background or not self._serving or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='fx-rate-refresher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            snapshot = self._current()
+            now = time.time()
+            due = snapshot['fetched_at'] + self.ttl - self.refresh_ahead if snapshot else now
+
+            if now >= due:
+                with self._refresh_lock:
+                    ok = self.refresh()
+                wait = self.retry_interval if not ok else 1
+            else:
+                # Wake periodically so a snapshot written by another process is picked up
+                wait = min(due - now, 300)
+            self._stop.wait(wait)
+
+    def _fetch(self):
+        try:
+            response = requests.get(self.provider_url.format(base=self.fetch_base), timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            if data.get('result') != 'success':
+                logger.error(f"FX provider error: {data.get('error-type', 'Unknown error')}")
+                return None
+            logger.info(f"Fetched FX rates against {self.fetch_base}")
+            return {'base': self.fetch_base, 'fetched_at': time.time(), 'rates': data['rates']}
+        except Exception as e:
+            logger.error(f"FX provider request failed: {e}")
+            return None
+
+    def _current(self):
+        """Load the latest snapshot from the backend and rebuild the matrix if it changed"""
+        snapshot = self.backend.load()
+        if snapshot is not None and snapshot is not self._snapshot:
+            with self._lock:
+                if snapshot is not self._snapshot:
+                    self._matrix = {
+                        base: self._cross_rates(snapshot, base)
+                        for base in VALID_CURRENCY_CODES
+                        if base in snapshot['rates']
+                    }
+                    self._snapshot = snapshot
+        return self._snapshot
+
+    def _rates_for(self, base_currency):
+        rates = self._matrix.get(base_currency)
+        if rates is None and self._snapshot and base_currency in self._snapshot['rates']:
+            # Bases outside VALID_CURRENCY_CODES are derived on demand and kept with this snapshot
+            rates = self._matrix.setdefault(base_currency, self._cross_rates(self._snapshot, base_currency))
+        return rates
+
+    @staticmethod
+    def _cross_rates(snapshot, base_currency):
+        """Rates per 1 unit of base_currency derived from the fetch-base rates"""
+        rates = snapshot['rates']
+        base_rate = rates[base_currency]
+        return {currency: rate / base_rate for currency, rate in rates.items()}
+
+
+rate_store = RateStore()
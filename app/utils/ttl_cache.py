@@ -0,0 +1,61 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe per-process cache whose entries expire ``ttl`` seconds after being stored.
+
+    Each process keeps its own copy, so invalidate() only reaches the calling
+    process; other processes see a change once their entry expires. Once more than
+    ``maxsize`` keys are held the oldest stored entries are dropped.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Cached values for the keys that are present and fresh"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                else:
+                    found[key] = entry[1]
+        return found
+
+    def set(self, key, value, ttl):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, values, ttl):
+        if ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries.pop(key, None)
+                self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,91 +1,30 @@
-import requests
+import threading
 from flask import current_app
-from datetime import datetime, timedelta
-from functools import wraps
+from app.utils.rate_store import rate_store
+from app.schema.account_schema import VALID_CURRENCY_CODES
 
-# Global cache for exchange rates
-rates_cache = {}
-CACHE_DURATION = timedelta(hours=6)  # Cache rates for 6 hours
 
 def get_exchange_rate(from_currency, to_currency):
-    """Get exchange rate with caching - no API key required"""
+    """Units of to_currency per 1 unit of from_currency, served from the shared rate store"""
     from_curr = from_currency.upper()
     to_curr = to_currency.upper()
-    
+
     if from_curr == to_curr:
         return 1.0
-    
-    cache_key = f"{from_curr}_{to_curr}"
-    
-    # Check cache first
-    if cache_key in rates_cache:
-        rate, timestamp = rates_cache[cache_key]
-        if datetime.now() - timestamp < CACHE_DURATION:
-            return rate
-    
-    # Fetch new rate from API - NO API KEY NEEDED
-    try:
-        url = f"https://open.er-api.com/v6/latest/{from_curr}"
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get('result') == 'success':  # Different success indicator
-            rate = data['rates'][to_curr]
-            rates_cache[cache_key] = (rate, datetime.now())
-            return rate
-        else:
-            return None
-    except Exception as e:
-        return None
-    
-    return None
 
-# Cache for exchange rates
-_rates_cache = {
-    'data': None,
-    'timestamp': None,
-    'base_currency': None,
-    'expiry': timedelta(hours=6)
-}
+    return rate_store.get_rate(from_curr, to_curr)
 
 
 def fetch_exchange_rates(base_currency):
-    """Fetch exchange rates from API or return cached version if still valid"""
-    global _rates_cache
-
-    # Check if cache is valid for the base_currency
-    if (_rates_cache['data'] is not None and 
-        _rates_cache['base_currency'] == base_currency and
-        _rates_cache['timestamp'] and 
-        (datetime.now() - _rates_cache['timestamp']) < _rates_cache['expiry']):
-        current_app.logger.info("Returning cached exchange rates")
-        return _rates_cache['data']
-
-    try:
-        url = f'https://open.er-api.com/v6/latest/{base_currency}'
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get('result') != 'success':
-            current_app.logger.error(f"API error: {data.get('error-type', 'Unknown error')}")
-            return None
-
-        rates = data['rates']
-        # Update cache
-        _rates_cache['data'] = rates
-        _rates_cache['timestamp'] = datetime.now()
-        _rates_cache['base_currency'] = base_currency
-
-        return rates
+    """
+    Return all rates per 1 unit of base_currency from the shared rate store.
 
-    except requests.exceptions.RequestException as e:
-        current_app.logger.error(f"Request error: {str(e)}")
-        return None
-    except Exception as e:
-        current_app.logger.error(f"Unexpected error: {str(e)}")
-        return None
+    The store is refreshed in the background and serves the last snapshot while a
+    refresh is in flight; the provider is only called on the request thread when
+    no snapshot exists yet, as the first call fetches synchronously. Returns None
+    when that fetch fails or the snapshot is too stale to use.
+    """
+    return rate_store.get_rates(base_currency)
 
 # 'buyPrice' is what the bank pays for foreign currency (lower rate).
 BUY_MARGIN_PERCENT = 0.0158
@@ -119,3 +58,116 @@ def apply_margins(rates, base_currency, target_currencies):
             })
     
     return formatted_rates
+
+
+class _RateTableState:
+    """
+    Prices and rendered /rates bodies derived from one rate snapshot.
+
+    Swapped into RateTable as a whole with one assignment. Its caches only ever
+    receive values derived from its own snapshot, so a reader holding it renders
+    consistent prices even while a newer state replaces it.
+    """
+
+    __slots__ = ('version', 'rates', 'margins', 'responses')
+
+    def __init__(self, snapshot, target_currencies):
+        self.version = snapshot['fetched_at']
+        self.rates = snapshot['rates']  # per 1 unit of the snapshot's fetch base
+        self.responses = {}
+        # Invert and price every base/target pair of VALID_CURRENCY_CODES in one pass
+        self.margins = {
+            base: self._prices(base, target_currencies)
+            for base in target_currencies
+            if self._usable(base)
+        }
+
+    def prices(self, base_currency, target_currencies):
+        prices = self.margins.get(base_currency)
+        if prices is None and self._usable(base_currency):
+            # Bases outside VALID_CURRENCY_CODES are priced on first use and kept with this snapshot
+            prices = self.margins.setdefault(base_currency, self._prices(base_currency, target_currencies))
+        return prices
+
+    def _usable(self, currency):
+        rate = self.rates.get(currency)
+        return rate is not None and rate > 0
+
+    def _prices(self, base_currency, target_currencies):
+        # The price of 1 target in base is rates[base] / rates[target]
+        base_rate = self.rates[base_currency]
+        return [
+            {
+                "currency": target,
+                "buyPrice": f"{base_rate / self.rates[target] * (1 - BUY_MARGIN_PERCENT):,.2f}",
+                "sellPrice": f"{base_rate / self.rates[target] * (1 + SELL_MARGIN_PERCENT):,.2f}"
+            }
+            for target in target_currencies
+            if target != base_currency and self._usable(target)
+        ]
+
+
+class RateTable:
+    """
+    Buy/sell prices for every base/target pair of VALID_CURRENCY_CODES, plus the
+    rendered /rates response body per base.
+
+    Everything is derived once per rate snapshot (the first request after a refresh
+    rebuilds it), so serving /rates is a dictionary lookup instead of inverting and
+    formatting every rate and serializing the response on each request. Readers
+    take one reference to the current state and render only from it.
+    """
+
+    def __init__(self, target_currencies):
+        self.target_currencies = list(target_currencies)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def margins(self, base_currency):
+        """Formatted buy/sell prices for base_currency, or None when no rates are available"""
+        base_currency = base_currency.upper()
+        state = self._current(base_currency)
+        if state is None:
+            return None
+        return state.prices(base_currency, self.target_currencies)
+
+    def response_body(self, base_currency):
+        """Pre-rendered JSON body of the /rates success response for base_currency"""
+        base_currency = base_currency.upper()
+        state = self._current(base_currency)
+        if state is None:
+            return None
+        body = state.responses.get(base_currency)
+        if body is None:
+            prices = state.prices(base_currency, self.target_currencies)
+            if prices is None:
+                return None
+            payload = {
+                "status": 200,
+                "message": "Retrieved current exchange rates successfully",
+                "data": {
+                    "currency": base_currency,
+                    "rates": prices
+                }
+            }
+            body = state.responses.setdefault(base_currency, current_app.json.response(payload).get_data())
+        return body
+
+    def _current(self, base_currency):
+        """State for the snapshot the rate store serves, or None when it has no usable rates"""
+        # Checks freshness (and fetches the very first snapshot) before the table is consulted
+        if rate_store.get_rates(base_currency) is None:
+            return None
+
+        snapshot = rate_store.snapshot
+        state = self._state
+        if state is None or state.version != snapshot['fetched_at']:
+            with self._lock:
+                state = self._state
+                if state is None or state.version != snapshot['fetched_at']:
+                    state = _RateTableState(snapshot, self.target_currencies)
+                    self._state = state
+        return state
+
+
+rate_table = RateTable(VALID_CURRENCY_CODES)
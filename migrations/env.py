@@ -94,6 +94,18 @@ def run_migrations_online():
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
 
+    # Transaction search structures (SQLite FTS5 table and its shadow tables, the
+    # PostgreSQL tsvector column and GIN index) are not mapped by the models
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'table' and name.startswith('transaction_search'):
+            return False
+        if name in ('search_vector', 'idx_transaction_search'):
+            return False
+        return True
+
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
+
     connectable = get_engine()
 
     with connectable.connect() as connection:
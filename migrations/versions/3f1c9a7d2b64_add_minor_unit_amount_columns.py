@@ -0,0 +1,53 @@
+"""Add integer minor-unit columns for balances and transaction amounts
+
+Revision ID: 3f1c9a7d2b64
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '7a8b9c0d1e2f'
+branch_labels = None
+depends_on = None
+
+# Currencies without a minor unit; everything else is stored in hundredths.
+# Snapshot of PaymentConfig.CURRENCY_EXPONENTS at the time of this migration.
+ZERO_EXPONENT_CURRENCIES = ('JPY',)
+
+
+def _to_minor(column):
+    zero_exponent = ", ".join(f"'{code}'" for code in ZERO_EXPONENT_CURRENCIES)
+    return (
+        f"CAST(ROUND({column} * CASE WHEN currency_code IN ({zero_exponent}) "
+        f"THEN 1 ELSE 100 END) AS BIGINT)"
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('balance_minor', sa.BigInteger(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('amount_minor', sa.BigInteger(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('fee_minor', sa.BigInteger(), nullable=False, server_default='0'))
+
+    # Backfill from the existing float columns
+    op.execute(f"UPDATE account SET balance_minor = {_to_minor('balance')}")
+    op.execute(
+        f'UPDATE "transaction" SET amount_minor = {_to_minor("amount")}, '
+        f'fee_minor = {_to_minor("fee")}'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.drop_column('fee_minor')
+        batch_op.drop_column('amount_minor')
+
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.drop_column('balance_minor')
@@ -0,0 +1,76 @@
+"""Add double-entry ledger journal and snapshot tables
+
+Revision ID: 9b2e4d6f8a10
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2e4d6f8a10'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ledger_sequence', sa.BigInteger(), nullable=False, server_default='0'))
+
+    op.create_table('ledger_entry',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('journal_id', GUID(), nullable=False),
+        sa.Column('ledger_account', sa.String(length=50), nullable=False, server_default='customer'),
+        sa.Column('account_id', GUID(), nullable=True),
+        sa.Column('sequence', sa.BigInteger(), nullable=True),
+        sa.Column('amount_minor', sa.BigInteger(), nullable=False),
+        sa.Column('balance_after_minor', sa.BigInteger(), nullable=True),
+        sa.Column('currency_code', sa.String(length=3), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['account_id'], ['account.id'], ondelete='SET NULL'),
+        sa.UniqueConstraint('account_id', 'sequence', name='uq_ledger_entry_account_sequence')
+    )
+
+    op.create_table('ledger_snapshot',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('account_id', GUID(), nullable=False),
+        sa.Column('sequence', sa.BigInteger(), nullable=False),
+        sa.Column('balance_minor', sa.BigInteger(), nullable=False),
+        sa.Column('as_of', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['account_id'], ['account.id'], ondelete='CASCADE')
+    )
+
+    with op.batch_alter_table('ledger_entry') as batch_op:
+        batch_op.create_index('idx_ledger_entry_account_created', ['account_id', 'created_at'])
+        batch_op.create_index('idx_ledger_entry_journal', ['journal_id'])
+
+    with op.batch_alter_table('ledger_snapshot') as batch_op:
+        batch_op.create_index('idx_ledger_snapshot_account_as_of', ['account_id', 'as_of'])
+
+    # Opening checkpoint so balance-as-of queries cover history that predates the journal
+    op.execute(
+        "INSERT INTO ledger_snapshot (id, account_id, sequence, balance_minor, as_of) "
+        "SELECT id, id, 0, balance_minor, CURRENT_TIMESTAMP FROM account"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('ledger_snapshot') as batch_op:
+        batch_op.drop_index('idx_ledger_snapshot_account_as_of')
+
+    with op.batch_alter_table('ledger_entry') as batch_op:
+        batch_op.drop_index('idx_ledger_entry_journal')
+        batch_op.drop_index('idx_ledger_entry_account_created')
+
+    op.drop_table('ledger_snapshot')
+    op.drop_table('ledger_entry')
+
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.drop_column('ledger_sequence')
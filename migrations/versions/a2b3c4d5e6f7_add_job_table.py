@@ -0,0 +1,51 @@
+"""Add job table for background jobs
+
+Revision ID: a2b3c4d5e6f7
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2b3c4d5e6f7'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('user_id', GUID(), nullable=True),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('succeeded', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE')
+    )
+
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.create_index('idx_job_user_created', ['user_id', 'created_at'])
+        batch_op.create_index('idx_job_status', ['status'])
+
+
+def downgrade():
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.drop_index('idx_job_status')
+        batch_op.drop_index('idx_job_user_created')
+
+    op.drop_table('job')
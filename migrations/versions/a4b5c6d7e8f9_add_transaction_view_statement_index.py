@@ -0,0 +1,31 @@
+"""Replace the transaction_view account index with a covering statement index
+
+Revision ID: a4b5c6d7e8f9
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4b5c6d7e8f9'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transaction_view', schema=None) as batch_op:
+        batch_op.create_index(
+            'idx_transaction_view_account_statement',
+            ['account_id', 'created_at', 'id', 'transaction_id', 'view_type'],
+            unique=False
+        )
+        batch_op.drop_index('idx_transaction_view_account_created')
+
+
+def downgrade():
+    with op.batch_alter_table('transaction_view', schema=None) as batch_op:
+        batch_op.create_index('idx_transaction_view_account_created', ['account_id', 'created_at'], unique=False)
+        batch_op.drop_index('idx_transaction_view_account_statement')
@@ -0,0 +1,49 @@
+"""Add outbound_email outbox table
+
+Revision ID: b3c4d5e6f7a8
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3c4d5e6f7a8'
+down_revision = 'a2b3c4d5e6f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbound_email',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('recipients', sa.JSON(), nullable=False),
+        sa.Column('sender', sa.String(length=255), nullable=True),
+        sa.Column('subject', sa.String(length=512), nullable=False),
+        sa.Column('html', sa.Text(), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('claim_token', sa.String(length=32), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('outbound_email') as batch_op:
+        batch_op.create_index('idx_outbound_email_due', ['status', 'next_attempt_at'])
+        batch_op.create_index('idx_outbound_email_claim', ['claim_token'])
+
+
+def downgrade():
+    with op.batch_alter_table('outbound_email') as batch_op:
+        batch_op.drop_index('idx_outbound_email_claim')
+        batch_op.drop_index('idx_outbound_email_due')
+
+    op.drop_table('outbound_email')
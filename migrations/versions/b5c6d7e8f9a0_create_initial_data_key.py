@@ -0,0 +1,43 @@
+"""Create the initial data encryption key
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from app.utils.keyring import keyring
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5c6d7e8f9a0'
+down_revision = 'a4b5c6d7e8f9'
+branch_labels = None
+depends_on = None
+
+
+encryption_keys = sa.table(
+    'encryption_keys',
+    sa.column('id', sa.String),
+    sa.column('wrapped_key', sa.LargeBinary),
+    sa.column('master_key_id', sa.String),
+    sa.column('status', sa.String),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def upgrade():
+    # The key ring no longer creates a DEK on first use, which would happen mid-request
+    bind = op.get_bind()
+    active = bind.execute(
+        sa.select(encryption_keys.c.id).where(encryption_keys.c.status == 'active').limit(1)
+    ).first()
+    if active is None:
+        op.execute(encryption_keys.insert().values(**keyring.new_key_row(), created_at=datetime.utcnow()))
+
+
+def downgrade():
+    # The key may already protect stored data; it is left in place
+    pass
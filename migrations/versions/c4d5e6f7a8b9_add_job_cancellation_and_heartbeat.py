@@ -0,0 +1,32 @@
+"""Add cancellation flag and heartbeat to job
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d5e6f7a8b9'
+down_revision = 'b3c4d5e6f7a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('idx_job_status_created', ['status', 'created_at'], unique=False)
+        batch_op.drop_index('idx_job_status')
+
+
+def downgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.create_index('idx_job_status', ['status'], unique=False)
+        batch_op.drop_index('idx_job_status_created')
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('cancel_requested')
@@ -0,0 +1,46 @@
+"""Add idempotency_keys table
+
+Revision ID: c4d8e1f2a3b5
+Revises: 9b2e4d6f8a10
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8e1f2a3b5'
+down_revision = '9b2e4d6f8a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('idempotency_keys',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('user_id', GUID(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+        sa.Column('endpoint', sa.String(length=255), nullable=False),
+        sa.Column('request_fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='processing'),
+        sa.Column('response_status', sa.Integer(), nullable=True),
+        sa.Column('response_body', sa.JSON(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_idempotency_user_key')
+    )
+
+    with op.batch_alter_table('idempotency_keys') as batch_op:
+        batch_op.create_index('idx_idempotency_expires_at', ['expires_at'])
+
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys') as batch_op:
+        batch_op.drop_index('idx_idempotency_expires_at')
+
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,36 @@
+"""Store card and payment intent timestamps with microseconds on SQLite
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d7e8f9a0b1'
+down_revision = 'b5c6d7e8f9a0'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['virtual_card', 'payment_intents']
+
+
+def upgrade():
+    # CURRENT_TIMESTAMP has no fractional seconds, but cursor values are bound as
+    # 'YYYY-MM-DD HH:MM:SS.ffffff'; as text, rows of the cursor's second would
+    # compare below it and keyset pages would repeat. PostgreSQL stores timestamps natively.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(
+            f"UPDATE {table} SET created_at = created_at || '.000000' "
+            "WHERE created_at IS NOT NULL AND length(created_at) = 19"
+        )
+
+
+def downgrade():
+    # Padded values are equal timestamps; nothing to undo
+    pass
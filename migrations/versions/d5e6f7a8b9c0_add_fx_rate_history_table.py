@@ -0,0 +1,33 @@
+"""Add fx_rate_history table
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d8e1f2a3b5
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e6f7a8b9c0'
+down_revision = 'c4d8e1f2a3b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('fx_rate_history',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('base_currency', sa.String(length=3), nullable=False),
+        sa.Column('rates', sa.JSON(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('base_currency', 'day', name='uq_fx_rate_history_base_day')
+    )
+
+
+def downgrade():
+    op.drop_table('fx_rate_history')
@@ -0,0 +1,40 @@
+"""Add notification_counter table with per-user notification counts
+
+Revision ID: d6e7f8a9b0c1
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid_utils import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6e7f8a9b0c1'
+down_revision = 'c4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_counter',
+        sa.Column('user_id', GUID(), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'category')
+    )
+
+    # Backfill from the existing notifications
+    op.execute(
+        "INSERT INTO notification_counter (user_id, category, total, unread, updated_at) "
+        "SELECT user_id, category, COUNT(*), SUM(CASE WHEN is_read THEN 0 ELSE 1 END), CURRENT_TIMESTAMP "
+        "FROM notification GROUP BY user_id, category"
+    )
+
+
+def downgrade():
+    op.drop_table('notification_counter')
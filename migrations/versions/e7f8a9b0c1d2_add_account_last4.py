@@ -0,0 +1,27 @@
+"""Add non-secret last4 column to account
+
+Revision ID: e7f8a9b0c1d2
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd5e6f7a8b9c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are backfilled with `flask accounts backfill-last4` (needs the encryption key)
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last4', sa.String(length=4), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.drop_column('last4')
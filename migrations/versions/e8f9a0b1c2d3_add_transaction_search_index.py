@@ -0,0 +1,48 @@
+"""Add full-text search index for transactions
+
+PostgreSQL: generated tsvector column with a GIN index (filled by the database).
+SQLite: FTS5 table, backfilled here and kept in sync by the application.
+
+Revision ID: e8f9a0b1c2d3
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8f9a0b1c2d3'
+down_revision = 'd6e7f8a9b0c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE \"transaction\" ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+            "(to_tsvector('simple'::regconfig, coalesce(description, '') || ' ' || type || ' ' || status "
+            "|| ' ' || currency_code)) STORED"
+        )
+        op.execute("CREATE INDEX idx_transaction_search ON \"transaction\" USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE transaction_search "
+            "USING fts5(transaction_id UNINDEXED, user_id UNINDEXED, document)"
+        )
+        op.execute(
+            "INSERT INTO transaction_search (transaction_id, user_id, document) "
+            "SELECT id, user_id, trim(coalesce(description, '') || ' ' || type || ' ' || status "
+            "|| ' ' || currency_code) FROM \"transaction\""
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_transaction_search")
+        op.execute("ALTER TABLE \"transaction\" DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS transaction_search")
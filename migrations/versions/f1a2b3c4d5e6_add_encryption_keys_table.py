@@ -0,0 +1,32 @@
+"""Add encryption_keys table for versioned data keys
+
+Revision ID: f1a2b3c4d5e6
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'e7f8a9b0c1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing ciphertexts stay readable via ACCOUNT_ENCRYPTION_KEY; move them with `flask keys reencrypt`
+    op.create_table('encryption_keys',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('wrapped_key', sa.LargeBinary(), nullable=False),
+        sa.Column('master_key_id', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('encryption_keys')
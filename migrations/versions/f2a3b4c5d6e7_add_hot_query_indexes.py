@@ -0,0 +1,58 @@
+"""Add composite indexes for the hot query shapes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e8f9a0b1c2d3'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    'transaction': [
+        ('idx_transaction_user_created', ['user_id', 'created_at']),
+        ('idx_transaction_user_type_status', ['user_id', 'type', 'status']),
+    ],
+    'transaction_view': [
+        ('idx_transaction_view_account_created', ['account_id', 'created_at']),
+    ],
+    'account': [
+        ('idx_account_user_default', ['user_id', 'is_default']),
+        ('idx_account_user_currency', ['user_id', 'currency_code']),
+    ],
+    'payment_intents': [
+        ('idx_payment_intent_user_card_created', ['user_id', 'virtual_card_id', 'created_at']),
+        ('idx_payment_intent_invoice_created', ['invoice_id', 'created_at']),
+        ('idx_payment_intent_client_secret', ['client_secret']),
+    ],
+    'invoice': [
+        ('idx_invoice_user_status_due', ['user_id', 'status', 'due_date']),
+    ],
+    'user': [
+        ('idx_user_email_verification_token', ['email_verification_token']),
+    ],
+    'two_factor_attempts': [
+        ('idx_two_factor_attempt_user_success_created', ['user_id', 'success', 'created_at']),
+    ],
+}
+
+
+def upgrade():
+    for table_name, indexes in INDEXES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for index_name, columns in indexes:
+                batch_op.create_index(index_name, columns, unique=False)
+
+
+def downgrade():
+    for table_name, indexes in INDEXES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for index_name, _ in indexes:
+                batch_op.drop_index(index_name)
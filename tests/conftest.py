@@ -0,0 +1,56 @@
+import os
+import pytest
+
+# Config is read at import time: a private in-memory database per app, no background threads
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['FX_RATE_STORE_BACKEND'] = 'memory'
+os.environ['FX_RATE_BACKGROUND_REFRESH'] = 'false'
+os.environ['EMAIL_OUTBOX_BACKGROUND'] = 'false'
+os.environ['JOB_WORKERS'] = '0'
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.user_model import User
+from app.models.account_model import Account
+from app.utils.keyring import keyring
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        # The schema was created with a fresh data key
+        keyring.reload()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def user(app):
+    user = User(email='ann@example.com', name='Ann Lee', phone='5550100', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def account(user):
+    account = Account.create_account(
+        user_id=str(user.id), bank_code='2025', currency='USD', currency_code='USD',
+        account_holder='Ann Lee', bank_name='Swipe', accountType='checking', is_default=True, balance=100
+    )
+    db.session.commit()
+    return account
+
+
+@pytest.fixture
+def client(app, user):
+    """Test client authenticated as ``user``"""
+    client = app.test_client()
+    token = create_access_token(identity=str(user.id), additional_claims={'role': user.role})
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
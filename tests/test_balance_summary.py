@@ -0,0 +1,27 @@
+import uuid
+from app.services.balance_summary_service import BalanceSummaryService
+
+
+def test_summary_leaves_no_per_user_state_behind(account, user):
+    summary = BalanceSummaryService.get_summary(user.id)
+
+    assert summary['currency'] == 'USD'
+    assert BalanceSummaryService._flights == {}
+    # Invalidating users that never read a summary keeps nothing either
+    BalanceSummaryService.invalidate(*[uuid.uuid4() for _ in range(100)])
+    assert BalanceSummaryService._flights == {}
+
+
+def test_summary_computed_across_an_invalidation_is_not_cached(account, user, monkeypatch):
+    BalanceSummaryService.invalidate(user.id)
+    compute = BalanceSummaryService._compute
+
+    def compute_during_write(user_id):
+        summary = compute(user_id)
+        BalanceSummaryService.invalidate(user_id)
+        return summary
+
+    monkeypatch.setattr(BalanceSummaryService, '_compute', staticmethod(compute_during_write))
+    assert BalanceSummaryService.get_summary(user.id) is not None
+
+    assert BalanceSummaryService._cache.get(str(user.id)) is None
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+from app.extensions import db
+from app.models.payment_intent_model import PaymentIntent
+from app.models.virtual_cards_model import VirtualCard
+
+
+def walk(client, url, size):
+    """Ids of every item returned while following next_cursor from the first page"""
+    ids = []
+    cursor = ''
+    for _ in range(100):
+        response = client.get(url, query_string={'cursor': cursor, 'size': size})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        # Some endpoints nest the page under data, as {'transactions': [...], 'pagination': {...}}
+        data = body['data']
+        if isinstance(data, dict):
+            items, pagination = data['transactions'], data['pagination']
+        else:
+            items, pagination = data, body['pagination']
+        ids.extend(item.get('id') or item.get('transaction_id') for item in items)
+        cursor = pagination['next_cursor']
+        if not pagination['has_next']:
+            return ids
+    raise AssertionError(f"Cursor paging of {url} did not terminate")
+
+
+def issue_cards(user, account, count):
+    return VirtualCard.issue_cards([{
+        'user_id': user.id, 'account_id': account.id, 'card_type': 'debit', 'card_holder': 'Ann Lee'
+    } for _ in range(count)])
+
+
+def test_card_cursor_visits_each_card_once(client, user, account):
+    issued = issue_cards(user, account, 23)
+    db.session.commit()
+
+    ids = walk(client, '/api/cards', size=5)
+
+    assert sorted(ids) == sorted(str(card['id']) for card in issued)
+
+
+def test_cards_created_in_python_keep_microseconds(user, account):
+    issue_cards(user, account, 1)
+    db.session.commit()
+
+    stored = db.session.execute(db.text('SELECT created_at FROM virtual_card')).scalar()
+    assert len(stored) == len('2026-01-01 12:00:00.000000')
+
+
+def test_card_payment_cursor_visits_each_intent_once(client, user, account):
+    card = db.session.get(VirtualCard, issue_cards(user, account, 1)[0]['id'])
+    # One shared timestamp without fractional seconds: paging relies on the id tie-breaker
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    intents = [
+        PaymentIntent(
+            user_id=user.id, virtual_card_id=card.id, account_id=account.id,
+            gateway_intent_id=f'pi_{uuid.uuid4().hex}', amount=10, currency='USD',
+            intent_type='card_topup', created_at=created_at
+        )
+        for _ in range(11)
+    ]
+    db.session.add_all(intents)
+    db.session.commit()
+
+    ids = walk(client, f'/api/cards/{card.id}/transactions', size=4)
+
+    assert sorted(ids) == sorted(str(intent.id) for intent in intents)
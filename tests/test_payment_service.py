@@ -0,0 +1,93 @@
+import pytest
+from app.extensions import db
+from app.models.account_model import Account
+from app.models.ledger_model import LedgerEntry
+from app.services.payment_service import PaymentService
+
+
+@pytest.fixture
+def savings(user):
+    account = Account.create_account(
+        user_id=str(user.id), bank_code='2025', currency='USD', currency_code='USD',
+        account_holder='Ann Lee', bank_name='Swipe', accountType='savings', is_default=False, balance=0
+    )
+    db.session.commit()
+    return account
+
+
+def test_transfer_checks_the_minor_unit_balance(user, account, savings):
+    # The float column drifts with repeated additions; balance_minor holds exactly 100.00
+    account.balance = 99.99999999999
+    db.session.commit()
+
+    PaymentService.create_internal_transfer(user.id, account.id, savings.id, 100, 'USD')
+    db.session.commit()
+
+    db.session.refresh(account)
+    assert account.balance_minor == 0
+
+
+def test_transfer_above_the_balance_is_rejected(user, account, savings):
+    with pytest.raises(Exception, match='Insufficient balance'):
+        PaymentService.create_internal_transfer(user.id, account.id, savings.id, 100.01, 'USD')
+
+
+def test_bulk_transfer_atomic_must_be_a_boolean(client, account, savings):
+    response = client.post('/api/wallets/transfers/bulk', json={
+        'atomic': 'false',
+        'transfers': [{'transfer_type': 'internal', 'amount': 1, 'currency': 'USD', 'target_account_id': str(savings.id)}]
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'atomic must be a boolean'
+
+
+def internal(target, amount):
+    return {'transfer_type': 'internal', 'amount': amount, 'currency': 'USD', 'target_account_id': str(target.id)}
+
+
+def test_bulk_transfer_overdraft_fails_only_its_item(user, account, savings):
+    batch = PaymentService.create_bulk_transfer(
+        str(user.id), [internal(savings, 60), internal(savings, 50), internal(savings, 40)]
+    )
+
+    assert [result['status'] for result in batch['results']] == ['completed', 'failed', 'completed']
+    assert batch['results'][1]['message'] == 'Insufficient balance for transfer'
+    db.session.refresh(account)
+    db.session.refresh(savings)
+    assert (account.balance_minor, savings.balance_minor) == (0, 10000)
+
+
+def test_atomic_bulk_transfer_rejects_the_whole_batch(user, account, savings):
+    batch = PaymentService.create_bulk_transfer(
+        str(user.id), [internal(savings, 60), internal(savings, 50)], atomic=True
+    )
+
+    assert batch['batch_id'] is None
+    assert [result['status'] for result in batch['results']] == ['rejected', 'failed']
+    db.session.refresh(account)
+    assert account.balance_minor == 10000
+    assert LedgerEntry.query.filter_by(account_id=savings.id).count() == 0
+
+
+def test_bulk_transfer_posts_sequenced_running_balances(user, account, savings):
+    start = account.ledger_sequence
+    PaymentService.create_bulk_transfer(str(user.id), [
+        internal(savings, 30),
+        {'transfer_type': 'external', 'amount': 20, 'currency': 'USD', 'target_account_number': '0123456789',
+         'target_routing_number': '021000021', 'target_bank_name': 'Other Bank', 'target_account_holder': 'Bo Park'},
+        internal(savings, 10)
+    ])
+
+    def postings(account_id):
+        entries = LedgerEntry.query.filter_by(account_id=account_id).order_by(LedgerEntry.sequence).all()
+        return [(entry.sequence, entry.amount_minor, entry.balance_after_minor) for entry in entries]
+
+    source = [posting for posting in postings(account.id) if posting[0] > start]
+    assert source == [(start + 1, -3000, 7000), (start + 2, -2000, 5000), (start + 3, -1000, 4000)]
+    assert postings(savings.id) == [(1, 3000, 3000), (2, 1000, 4000)]
+    # The external leg is booked to the contra account, without a sequence or running balance
+    external = LedgerEntry.query.filter_by(account_id=None, amount_minor=2000).one()
+    assert (external.sequence, external.balance_after_minor) == (None, None)
+    db.session.refresh(account)
+    assert (account.ledger_sequence, account.balance_minor) == (start + 3, 4000)
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.extensions import db
+from app.models.account_model import Account
+from app.models.beneficiaries_model import Beneficiaries
+from app.models.virtual_cards_model import VirtualCard
+from app.services.transaction_service import TransactionService
+from app.utils.query_counter import StatementCounter, assert_max_statements, _count_statement
+
+
+@pytest.fixture
+def history(user, account):
+    """A few rows of everything the list endpoints nest, so a lazy load per row would show"""
+    savings = Account.create_account(
+        user_id=str(user.id), bank_code='2025', currency='USD', currency_code='USD',
+        account_holder='Ann Lee', bank_name='Swipe', accountType='savings', is_default=False, balance=0
+    )
+    beneficiaries = [
+        Beneficiaries.create_beneficiary(
+            user.id, account.id, 'Other Bank', f'00012345{index}', '021000021', f'Payee {chr(65 + index)}'
+        )
+        for index in range(3)
+    ]
+    db.session.add_all(beneficiaries)
+    db.session.flush()
+    for index, beneficiary in enumerate(beneficiaries):
+        TransactionService.create_transaction(
+            user_id=user.id, txn_type='transfer', status='succeeded', amount=10 + index, currency_code='USD',
+            debit_account_id=account.id, credit_account_id=savings.id, beneficiary_id=beneficiary.id
+        )
+    VirtualCard.issue_cards([{
+        'user_id': user.id, 'account_id': account.id, 'card_type': 'debit', 'card_holder': 'Ann Lee'
+    } for _ in range(3)])
+    db.session.commit()
+    ids = {'user': user.id, 'account': account.id}
+    # Nothing stays in the identity map, as in a fresh request
+    db.session.expunge_all()
+    return ids
+
+
+@pytest.mark.parametrize('path, limit', [
+    ('/api/transactions', 2),
+    ('/api/transactions?cursor=', 1),
+    ('/api/accounts', 1),
+    ('/api/user/{user}/beneficiaries', 2),
+    ('/api/user/{user}/beneficiaries?cursor=', 1),
+    ('/api/cards', 2),
+    ('/api/cards?cursor=', 1),
+    ('/api/accounts/{account}/transactions', 2),
+])
+def test_list_endpoint_statement_count(client, history, path, limit):
+    url = path.format(**history)
+
+    with assert_max_statements(limit):
+        response = client.get(url)
+
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['data']
+
+
+def test_counting_listener_is_only_attached_while_counting(app):
+    assert not event.contains(Engine, 'before_cursor_execute', _count_statement)
+
+    with StatementCounter() as counter:
+        assert event.contains(Engine, 'before_cursor_execute', _count_statement)
+        db.session.execute(db.text('SELECT 1'))
+
+    assert counter.count == 1
+    assert not event.contains(Engine, 'before_cursor_execute', _count_statement)
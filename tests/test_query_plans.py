@@ -0,0 +1,9 @@
+from app.services.query_plan_service import QueryPlanService
+
+
+def test_hot_queries_use_their_indexes(app):
+    results = QueryPlanService.check()
+
+    assert results
+    missing = {result['name']: result['plan'] for result in results if not result['uses_index']}
+    assert not missing, f"Queries not served by their index: {missing}"
@@ -0,0 +1,47 @@
+import json
+import time
+import pytest
+from app.utils.rate_store import rate_store
+from app.utils.xconverter import rate_table
+
+
+def save_rates(fetched_at, **rates):
+    rate_store.backend.save({'base': 'USD', 'fetched_at': fetched_at, 'rates': {'USD': 1.0, **rates}})
+
+
+def prices(base_currency):
+    body = json.loads(rate_table.response_body(base_currency))
+    return {entry['currency']: entry for entry in body['data']['rates']}
+
+
+@pytest.fixture
+def rates(app):
+    save_rates(time.time() - 60, EUR=0.5, GBP=0.25, ZAR=20.0)
+
+
+def test_prices_are_derived_from_the_snapshot(rates):
+    usd = prices('USD')
+
+    assert set(usd) == {'EUR', 'GBP'}
+    # 1 EUR costs 2 USD, less the buy margin
+    assert usd['EUR']['buyPrice'] == f"{2 * (1 - 0.0158):,.2f}"
+
+
+def test_base_outside_the_currency_list_is_priced(rates):
+    zar = prices('ZAR')
+
+    assert zar['USD']['sellPrice'] == f"{20 * (1 + 0.0106):,.2f}"
+    assert rate_table.margins('zar') == list(zar.values())
+
+
+def test_new_snapshot_replaces_rendered_bodies(rates):
+    old_state = rate_table._current('USD')
+    before = prices('USD')
+
+    save_rates(time.time(), EUR=0.25, GBP=0.25, ZAR=20.0)
+    after = prices('USD')
+
+    assert after['EUR'] != before['EUR']
+    assert after['EUR']['buyPrice'] == f"{4 * (1 - 0.0158):,.2f}"
+    # A reader still holding the previous state keeps rendering its own prices
+    assert old_state.prices('USD', rate_table.target_currencies)[0] == before['EUR']